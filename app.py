@@ -1,8 +1,7 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from predict import StudentPerformancePredictor
+
+import metrics
+from model_registry import artifact_version, default_engine, get_cached_predictor, get_predictor
 
 # Set page configuration with a custom theme
 st.set_page_config(
@@ -175,9 +174,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# Load predictor
-predictor = StudentPerformancePredictor()
-
 # Sidebar with improved styling
 with st.sidebar:
     st.image("https://images.unsplash.com/photo-1501504905252-473c47e087f8?ixlib=rb-4.0.3&auto=format&fit=crop&w=1074&q=80", use_container_width=True)
@@ -213,6 +209,15 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+    st.markdown("---")
+
+    # Process-wide switch; the summary panel is drawn at the end of the script
+    if st.toggle("⏱️ Collect pipeline timings", value=metrics.enabled,
+                 help="Time each prediction stage and count scored rows for this server process"):
+        metrics.enable()
+    else:
+        metrics.disable()
+
 # Header Section with animation
 st.markdown("""
 <div style="position: relative; overflow: hidden; border-radius: 10px; margin-bottom: 30px;">
@@ -259,6 +264,10 @@ with tab1:
 
     # Prediction Output with improved styling
     if submitted:
+        # Imported on demand so a plain page load doesn't pay for them
+        import pandas as pd
+        import plotly.graph_objects as go
+
         input_data = {
             "Hours_Studied": hours,
             "Attendance": attendance,
@@ -270,7 +279,7 @@ with tab1:
         }
 
         with st.spinner("⏳ Analyzing student data..."):
-            result = predictor.predict([input_data])[0]
+            result = get_cached_predictor(default_engine()).predict([input_data])[0]
 
         score = round(result["predicted_exam_score"], 2)
 
@@ -312,6 +321,25 @@ with tab1:
             </div>
             """, unsafe_allow_html=True)
 
+            if result["at_risk"]:
+                # Smallest change in the actionable inputs that clears the threshold
+                from counterfactuals import describe, search
+
+                # Scores in the plan are the model's own, from the same engine
+                # as the search, so they start from its score for this student
+                plan = search(get_predictor("numpy"), [input_data]).iloc[0]
+                if plan["Found"]:
+                    what_if = (f"{describe(plan)} would lift the predicted score from "
+                               f"{plan['Predicted_Score']:.1f} to {plan['Counterfactual_Score']:.1f}.")
+                else:
+                    what_if = "No change within the search budgets lifts the predicted score above 60."
+                st.markdown(f"""
+                <div class="recommendation-box">
+                    <h4 style="margin-top: 0;">🎯 What Would Change the Outcome</h4>
+                    <p style="margin-bottom: 0;">{what_if}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
         with col2:
             # Enhanced gauge chart
             fig = go.Figure(go.Indicator(
@@ -343,57 +371,84 @@ with tab1:
 
         # Feature contribution visualization
         st.markdown("<h3>📈 Key Factors Analysis</h3>", unsafe_allow_html=True)
-        
-        # Prepare data for visualization
-        display_df = pd.DataFrame({
-            "Factor": ["Hours Studied", "Attendance (%)", "Previous Score", "Tutoring Sessions"],
-            "Value": [hours, attendance * 100, previous, tutoring],
-            "Benchmark": [25, 85, 70, 3]  # Example benchmarks
-        })
-        
-        # Create a more informative bar chart
-        fig = go.Figure()
-        
-        # Add student values
-        fig.add_trace(go.Bar(
-            x=display_df["Factor"],
-            y=display_df["Value"],
-            name="Student",
-            marker_color='#6C63FF',
-            text=display_df["Value"],
-            textposition='outside'
-        ))
-        
-        # Add benchmark values
-        fig.add_trace(go.Bar(
-            x=display_df["Factor"],
-            y=display_df["Benchmark"],
-            name="Class Average",
-            marker_color='rgba(108, 99, 255, 0.3)',
-            text=display_df["Benchmark"],
+
+        # How far each input moved this prediction away from the model's
+        # average output (tree-path attributions). They add up to the exact
+        # model score, which the title quotes: the score shown above may come
+        # from the lookup table, rounded to its grid.
+        from attributions import explain
+        from predict import FEATURE_COLUMNS
+
+        explained = explain(get_predictor("numpy"), [input_data]).iloc[0]
+        factors = pd.DataFrame({
+            "Factor": [col.replace("_", " ") for col in FEATURE_COLUMNS],
+            "Contribution": [explained[col] for col in FEATURE_COLUMNS],
+        }).sort_values("Contribution")
+
+        fig = go.Figure(go.Bar(
+            x=factors["Contribution"],
+            y=factors["Factor"],
+            orientation="h",
+            marker_color=['#FF6584' if value < 0 else '#6C63FF' for value in factors["Contribution"]],
+            text=[f"{value:+.2f}" for value in factors["Contribution"]],
             textposition='outside'
         ))
-        
+
         fig.update_layout(
-            barmode='group',
             title={
-                'text': "Student Performance vs. Class Average",
+                'text': f"What moved the score from the average of {explained['Bias']:.1f} "
+                        f"to {explained['Predicted_Score']:.2f}",
                 'y':0.9,
                 'x':0.5,
                 'xanchor': 'center',
                 'yanchor': 'top',
                 'font': {'size': 18, 'color': '#333333'}
             },
-            xaxis_title="Factor",
-            yaxis_title="Value",
-            legend_title="Legend",
+            xaxis_title="Points added to the predicted score",
+            yaxis_title="Factor",
             template="plotly_white",
             height=400,
             margin=dict(l=20, r=20, t=80, b=20)
         )
-        
+
         st.plotly_chart(fig, use_container_width=True)
-        
+
+        # Sensitivity curves: the score as each slider sweeps its range with
+        # everything else held fixed, all scored in one batch
+        st.markdown("<h3>🎚️ Sensitivity Analysis</h3>", unsafe_allow_html=True)
+        from plotly.subplots import make_subplots
+        from sensitivity import cached_curves
+
+        slider_labels = {
+            "Hours_Studied": ("Hours Studied Weekly", hours),
+            "Attendance": ("Attendance Rate", attendance),
+            "Previous_Scores": ("CA Scores", previous),
+            "Tutoring_Sessions": ("Tutoring Sessions Monthly", tutoring),
+        }
+        sweeps = cached_curves(input_data, default_engine())
+        fig = make_subplots(rows=2, cols=2, subplot_titles=[label for label, _ in slider_labels.values()])
+        for i, (col, (label, current)) in enumerate(slider_labels.items()):
+            values, scores = sweeps[col]
+            row, column = i // 2 + 1, i % 2 + 1
+            fig.add_trace(go.Scatter(
+                x=values, y=scores, mode="lines", line=dict(color='#6C63FF'), name=label,
+                hovertemplate=f"{label}: %{{x}}<br>Predicted score: %{{y:.2f}}<extra></extra>"
+            ), row=row, col=column)
+            fig.add_trace(go.Scatter(
+                x=[current], y=[score], mode="markers", marker=dict(color='#FF6584', size=10), name="Current"
+            ), row=row, col=column)
+            fig.add_hline(y=60, line_dash="dash", line_color="red", row=row, col=column)
+
+        fig.update_layout(
+            showlegend=False,
+            template="plotly_white",
+            height=550,
+            margin=dict(l=20, r=20, t=60, b=20)
+        )
+        fig.update_yaxes(title_text="Predicted Score")
+
+        st.plotly_chart(fig, use_container_width=True)
+
         st.markdown("</div>", unsafe_allow_html=True)
 
 with tab2:
@@ -409,9 +464,65 @@ with tab2:
                                     help="CSV should include columns: Hours_Studied, Attendance, Previous_Scores, Motivation_Level, Tutoring_Sessions, Parental_Involvement, Access_to_Resources")
 
     if uploaded_file:
+        import hashlib
+        import os
+        import tempfile
+
+        import numpy as np
+        import pandas as pd
+        import plotly.express as px
+        import plotly.graph_objects as go
+        from batch_scoring import DEFAULT_CHUNKSIZE, BatchSummary, stream_predictions
+        from search_index import SearchIndex
+
+        # Results table page sizes; the full results are only on disk
+        PAGE_SIZES = [25, 100, 500, 1000]
+
         try:
-            df = pd.read_csv(uploaded_file)
-            record_count = len(df)
+            # Results are memoized per session, keyed by the file's contents
+            # and the model version, so reruns only touch the display layer
+            digest = hashlib.sha256()
+            for block in iter(lambda: uploaded_file.read(1 << 20), b""):
+                digest.update(block)
+            uploaded_file.seek(0)
+            batch_key = (digest.hexdigest(), artifact_version())
+
+            cached = st.session_state.get("batch_results")
+            if cached is None or cached["key"] != batch_key:
+                # Score chunk by chunk into a temp file so only the running
+                # summary is held in memory; drop the previous run's file first
+                st.session_state.pop("batch_results", None)
+                if cached is not None:
+                    for path in (cached["path"], cached["rejected_path"]):
+                        if os.path.exists(path):
+                            os.remove(path)
+
+                # Rows failing the input checks are set aside with their
+                # reasons instead of failing the upload
+                summary = BatchSummary()
+                with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="") as results_file, \
+                        tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="") as rejected_file:
+                    results_path, rejected_path = results_file.name, rejected_file.name
+                    progress = st.progress(0.0, text="⏳ Running batch prediction...")
+                    for summary in stream_predictions(uploaded_file, get_predictor(), results_file,
+                                                      chunksize=DEFAULT_CHUNKSIZE, summary=summary,
+                                                      rejected=rejected_file):
+                        progress.progress(min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0),
+                                          text=f"⏳ Scored {summary.count:,} student records...")
+                    progress.empty()
+                search_index = SearchIndex.from_csv(results_path, chunksize=DEFAULT_CHUNKSIZE)
+                st.session_state["batch_results"] = {
+                    "key": batch_key, "path": results_path, "rejected_path": rejected_path,
+                    "summary": summary, "index": search_index,
+                }
+            else:
+                results_path, rejected_path = cached["path"], cached["rejected_path"]
+                summary, search_index = cached["summary"], cached["index"]
+            record_count = summary.count
+
+            if record_count == 0:
+                reasons = "; ".join(f"{reason} ({count:,} rows)" for reason, count in summary.rejection_counts.most_common(5))
+                raise ValueError(f"No valid student records to score. {reasons}")
 
             st.markdown("""
                 <div style="background-color: #d9ead3; border-radius: 5px; padding: 10px; display: flex; align-items: center; margin-bottom: 20px;">
@@ -420,256 +531,285 @@ with tab2:
                     </div>
                     <div>
                         <h4 style="margin: 0; color: #388e3c;">File uploaded successfully!</h4>
-                        <p style="margin: 0; font-size: 14px;">Processing {record_count} student records...</p>
+                        <p style="margin: 0; font-size: 14px;">Processed {record_count} student records.</p>
                     </div>
                 </div>
             """.format(record_count=record_count), unsafe_allow_html=True)
 
-
-            with st.spinner("⏳ Running batch prediction..."):
-                results = predictor.predict(df.to_dict(orient="records"))
-
-            results_df = df.copy()
-            results_df["Predicted_Score"] = [round(r["predicted_exam_score"], 2) for r in results]
-            results_df["At_Risk"] = ["Yes" if r["at_risk"] else "No" for r in results]
-            results_df["Recommendation"] = [r["recommendation"] for r in results]
-
-            # Summary statistics
-            st.markdown("<div class='stCard'>", unsafe_allow_html=True)
-            st.markdown("<h3 style='margin-top: 0;'>📊 Class Overview</h3>", unsafe_allow_html=True)
-            
-            avg_score = results_df["Predicted_Score"].mean()
-            at_risk_count = results_df["At_Risk"].value_counts().get("Yes", 0)
-            at_risk_percent = (at_risk_count / len(results_df)) * 100
+            if summary.rejected_count:
+                with st.expander(f"⚠️ {summary.rejected_count:,} rows skipped because of invalid inputs", expanded=True):
+                    st.dataframe(
+                        pd.DataFrame(summary.rejection_counts.most_common(), columns=["Problem", "Rows"]),
+                        use_container_width=True, hide_index=True
+                    )
+                    st.dataframe(pd.read_csv(rejected_path, nrows=100), use_container_width=True, hide_index=True)
+                    with open(rejected_path, "rb") as csv:
+                        st.download_button(
+                            label="📥 Download Skipped Rows",
+                            data=csv,
+                            file_name="rejected_students.csv",
+                            mime="text/csv",
+                            help="Every skipped row with its row number and the reasons it was rejected"
+                        )
+
+
+            avg_score = summary.mean_score
+            at_risk_count = summary.at_risk_count
+            at_risk_percent = summary.at_risk_percent
+
+            # Each section is a fragment: its widgets (e.g. the search box)
+            # rerun only that section instead of the whole script
+
+            @st.fragment
+            def show_class_overview():
+                # Summary statistics
+                st.markdown("<div class='stCard'>", unsafe_allow_html=True)
+                st.markdown("<h3 style='margin-top: 0;'>📊 Class Overview</h3>", unsafe_allow_html=True)
             
-            col1, col2, col3 = st.columns(3)
+                col1, col2, col3 = st.columns(3)
             
-            with col1:
-                st.markdown(f"""
-                <div class="metric-container">
-                    <div class="metric-value">{avg_score:.1f}</div>
-                    <div class="metric-label">Average Predicted Score</div>
-                </div>
-                """, unsafe_allow_html=True)
+                with col1:
+                    st.markdown(f"""
+                    <div class="metric-container">
+                        <div class="metric-value">{avg_score:.1f}</div>
+                        <div class="metric-label">Average Predicted Score</div>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-            with col2:
-                st.markdown(f"""
-                <div class="metric-container">
-                    <div class="metric-value">{at_risk_count}</div>
-                    <div class="metric-label">Students At Risk</div>
-                </div>
-                """, unsafe_allow_html=True)
+                with col2:
+                    st.markdown(f"""
+                    <div class="metric-container">
+                        <div class="metric-value">{at_risk_count}</div>
+                        <div class="metric-label">Students At Risk</div>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-            with col3:
-                st.markdown(f"""
-                <div class="metric-container">
-                    <div class="metric-value">{at_risk_percent:.1f}%</div>
-                    <div class="metric-label">Percentage At Risk</div>
-                </div>
-                """, unsafe_allow_html=True)
+                with col3:
+                    st.markdown(f"""
+                    <div class="metric-container">
+                        <div class="metric-value">{at_risk_percent:.1f}%</div>
+                        <div class="metric-label">Percentage At Risk</div>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-            st.markdown("</div>", unsafe_allow_html=True)
+                st.markdown("</div>", unsafe_allow_html=True)
 
-            # Score distribution
-            st.markdown("<div class='stCard'>", unsafe_allow_html=True)
-            st.markdown("<h3 style='margin-top: 0;'>📊 Score Distribution</h3>", unsafe_allow_html=True)
+                # Score distribution
+                st.markdown("<div class='stCard'>", unsafe_allow_html=True)
+                st.markdown("<h3 style='margin-top: 0;'>📊 Score Distribution</h3>", unsafe_allow_html=True)
             
-            fig = px.histogram(
-                results_df, 
-                x="Predicted_Score",
-                nbins=20,
-                color_discrete_sequence=['#6C63FF'],
-                marginal="box",
-                opacity=0.7,
-                labels={"Predicted_Score": "Predicted Score"}
-            )
+                # Bars from the pre-binned counts; the raw scores never reach the browser
+                edges = summary.histogram_edges
+                fig = go.Figure(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=summary.histogram,
+                    width=edges[1] - edges[0],
+                    marker_color='#6C63FF',
+                    opacity=0.7
+                ))
             
-            fig.update_layout(
-                xaxis_title="Predicted Score",
-                yaxis_title="Number of Students",
-                template="plotly_white",
-                height=400,
-                margin=dict(l=20, r=20, t=20, b=20)
-            )
+                fig.update_layout(
+                    xaxis_title="Predicted Score",
+                    yaxis_title="Number of Students",
+                    template="plotly_white",
+                    height=400,
+                    margin=dict(l=20, r=20, t=20, b=20)
+                )
             
-            # Add a vertical line for the average score
-            fig.add_vline(x=avg_score, line_dash="dash", line_color="#FF6584", annotation_text=f"Avg: {avg_score:.1f}")
+                # Add a vertical line for the average score
+                fig.add_vline(x=avg_score, line_dash="dash", line_color="#FF6584", annotation_text=f"Avg: {avg_score:.1f}")
             
-            st.plotly_chart(fig, use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True)
+                st.plotly_chart(fig, use_container_width=True)
+                st.markdown("</div>", unsafe_allow_html=True)
+
+            show_class_overview()
 
-            # Display table with improved styling
-            st.markdown("<div class='stCard'>", unsafe_allow_html=True)
-            st.markdown("<h3 style='margin-top: 0;'>🔍 Detailed Results</h3>", unsafe_allow_html=True)
+            @st.fragment
+            def show_detailed_results():
+                # Display table with improved styling
+                st.markdown("<div class='stCard'>", unsafe_allow_html=True)
+                st.markdown("<h3 style='margin-top: 0;'>🔍 Detailed Results</h3>", unsafe_allow_html=True)
             
-            # Add a search/filter option
-            search = st.text_input("🔍 Search by any column", "")
+                # Add a search/filter option
+                search = st.text_input("🔍 Search by any column", "",
+                                       help='Words match any column; narrow with column:value, prefix*, '
+                                            'score<60 style comparisons and "quoted phrases"')
             
-            # Filter the dataframe if search term is provided
-            if search:
-                filtered_df = results_df[results_df.astype(str).apply(lambda row: row.str.contains(search, case=False).any(), axis=1)]
-                st.dataframe(filtered_df, use_container_width=True, height=400)
-                st.markdown(f"<p style='color: #666; font-size: 14px;'>Showing {len(filtered_df)} of {len(results_df)} records</p>", unsafe_allow_html=True)
-            else:
-                st.dataframe(results_df, use_container_width=True, height=400)
+                # Rows matching the search (None: all rows); only the current
+                # page is materialized and sent to the browser
+                rows = None
+                if search:
+                    try:
+                        rows = np.flatnonzero(search_index.search(search))
+                    except ValueError as e:
+                        st.warning(f"Invalid search: {e}")
+                        rows = np.empty(0, dtype=np.intp)
+                total = record_count if rows is None else len(rows)
+
+                page_col, size_col = st.columns([3, 1])
+                page_size = size_col.selectbox("Rows per page", PAGE_SIZES, index=1)
+                page_count = max(1, -(-total // page_size))
+                # Keyed on what decides the pages, so a new search, page size
+                # or upload starts again from page 1
+                page = page_col.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1,
+                                             key=f"page:{results_path}:{page_size}:{search}")
+                first = (page - 1) * page_size
+                last = min(first + page_size, total)
+                positions = np.arange(first, last) if rows is None else rows[first:last]
+                st.dataframe(search_index.take(positions), use_container_width=True, height=400)
+                matching = f"of {total} matching records ({record_count} total)" if search else f"of {record_count} records"
+                st.markdown(f"<p style='color: #666; font-size: 14px;'>Showing {first + 1 if last else 0}–{last} {matching}</p>", unsafe_allow_html=True)
             
-            # Downloadable CSV with styled button
-            csv = results_df.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                label="📥 Download Complete Results",
-                data=csv,
-                file_name="student_predictions.csv",
-                mime="text/csv",
-                help="Download the complete prediction results as a CSV file"
-            )
-            st.markdown("</div>", unsafe_allow_html=True)
+                # Downloadable CSV with styled button, served from the results file
+                with open(results_path, "rb") as csv:
+                    st.download_button(
+                        label="📥 Download Complete Results",
+                        data=csv,
+                        file_name="student_predictions.csv",
+                        mime="text/csv",
+                        help="Download the complete prediction results as a CSV file"
+                    )
+                st.markdown("</div>", unsafe_allow_html=True)
 
-            # Correlation Heatmap with improved styling
-            st.markdown("<div class='stCard'>", unsafe_allow_html=True)
-            st.markdown("<h3 style='margin-top: 0;'>🧠 Factor Correlation Analysis</h3>", unsafe_allow_html=True)
+            show_detailed_results()
+
+            @st.fragment
+            def show_correlations():
+                # Correlation Heatmap with improved styling
+                st.markdown("<div class='stCard'>", unsafe_allow_html=True)
+                st.markdown("<h3 style='margin-top: 0;'>🧠 Factor Correlation Analysis</h3>", unsafe_allow_html=True)
             
-            numeric_cols = results_df.select_dtypes(include=["float64", "int64"])
-            if "Predicted_Score" in numeric_cols.columns and len(numeric_cols.columns) > 1:
-                corr = numeric_cols.corr()
+                corr = summary.correlation()
+                if "Predicted_Score" in corr.columns and len(corr.columns) > 1:
                 
-                fig_heatmap = px.imshow(
-                    corr,
-                    text_auto=True,
-                    color_continuous_scale='RdBu_r',
-                    aspect="auto",
-                    labels={"color": "Correlation"}
-                )
+                    fig_heatmap = px.imshow(
+                        corr,
+                        text_auto=True,
+                        color_continuous_scale='RdBu_r',
+                        aspect="auto",
+                        labels={"color": "Correlation"}
+                    )
                 
-                fig_heatmap.update_layout(
-                    height=500,
-                    margin=dict(l=20, r=20, t=20, b=20),
-                    coloraxis_colorbar=dict(
-                        title="Correlation",
-                        thicknessmode="pixels", thickness=20,
-                        lenmode="pixels", len=300,
-                        tickvals=[-1, 0, 1],
-                        ticktext=["Negative", "Neutral", "Positive"]
+                    fig_heatmap.update_layout(
+                        height=500,
+                        margin=dict(l=20, r=20, t=20, b=20),
+                        coloraxis_colorbar=dict(
+                            title="Correlation",
+                            thicknessmode="pixels", thickness=20,
+                            lenmode="pixels", len=300,
+                            tickvals=[-1, 0, 1],
+                            ticktext=["Negative", "Neutral", "Positive"]
+                        )
                     )
-                )
                 
-                st.plotly_chart(fig_heatmap, use_container_width=True)
+                    st.plotly_chart(fig_heatmap, use_container_width=True)
                 
-                # Add explanation
-                st.markdown("""
-                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-top: 10px;">
-                    <h4 style="margin-top: 0; color: #6C63FF;">📝 Interpretation Guide</h4>
-                    <p>This heatmap shows how different factors correlate with predicted scores:</p>
-                    <ul>
-                        <li><strong>Positive values (blue):</strong> As one factor increases, the other tends to increase as well.</li>
-                        <li><strong>Negative values (red):</strong> As one factor increases, the other tends to decrease.</li>
-                        <li><strong>Values close to 0 (white):</strong> Little to no relationship between factors.</li>
-                    </ul>
-                    <p>Focus on factors with strong correlations to predicted scores to improve student performance.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.warning("⚠️ Not enough numeric data to generate correlation heatmap.")
-            
-            st.markdown("</div>", unsafe_allow_html=True)
+                    # Add explanation
+                    st.markdown("""
+                    <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-top: 10px;">
+                        <h4 style="margin-top: 0; color: #6C63FF;">📝 Interpretation Guide</h4>
+                        <p>This heatmap shows how different factors correlate with predicted scores:</p>
+                        <ul>
+                            <li><strong>Positive values (blue):</strong> As one factor increases, the other tends to increase as well.</li>
+                            <li><strong>Negative values (red):</strong> As one factor increases, the other tends to decrease.</li>
+                            <li><strong>Values close to 0 (white):</strong> Little to no relationship between factors.</li>
+                        </ul>
+                        <p>Focus on factors with strong correlations to predicted scores to improve student performance.</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    st.warning("⚠️ Not enough numeric data to generate correlation heatmap.")
             
-            # At-risk students analysis
-            if at_risk_count > 0:
-                st.markdown("<div class='stCard'>", unsafe_allow_html=True)
-                st.markdown("<h3 style='margin-top: 0;'>⚠️ At-Risk Students Analysis</h3>", unsafe_allow_html=True)
-                
-                at_risk_df = results_df[results_df["At_Risk"] == "Yes"]
-                
-                # Common factors visualization
-                factors = ["Hours_Studied", "Attendance", "Previous_Scores", "Tutoring_Sessions"]
-                factor_avgs = {
-                    "Factor": [],
-                    "At-Risk Average": [],
-                    "Class Average": []
-                }
-                
-                for factor in factors:
-                    if factor in at_risk_df.columns:
-                        factor_avgs["Factor"].append(factor.replace("_", " "))
-                        factor_avgs["At-Risk Average"].append(at_risk_df[factor].mean())
-                        factor_avgs["Class Average"].append(results_df[factor].mean())
+                st.markdown("</div>", unsafe_allow_html=True)
+
+            show_correlations()
+
+            @st.fragment
+            def show_at_risk_analysis():
+                # At-risk students analysis
+                if at_risk_count > 0:
+                    st.markdown("<div class='stCard'>", unsafe_allow_html=True)
+                    st.markdown("<h3 style='margin-top: 0;'>⚠️ At-Risk Students Analysis</h3>", unsafe_allow_html=True)
                 
-                factor_df = pd.DataFrame(factor_avgs)
+                    # Common factors visualization
+                    factor_df = summary.factor_means()
                 
-                fig = go.Figure()
+                    fig = go.Figure()
                 
-                fig.add_trace(go.Bar(
-                    x=factor_df["Factor"],
-                    y=factor_df["At-Risk Average"],
-                    name="At-Risk Students",
-                    marker_color='#FF6584',
-                    text=[f"{x:.2f}" for x in factor_df["At-Risk Average"]],
-                    textposition='outside'
-                ))
+                    fig.add_trace(go.Bar(
+                        x=factor_df["Factor"],
+                        y=factor_df["At-Risk Average"],
+                        name="At-Risk Students",
+                        marker_color='#FF6584',
+                        text=[f"{x:.2f}" for x in factor_df["At-Risk Average"]],
+                        textposition='outside'
+                    ))
                 
-                fig.add_trace(go.Bar(
-                    x=factor_df["Factor"],
-                    y=factor_df["Class Average"],
-                    name="Class Average",
-                    marker_color='#6C63FF',
-                    text=[f"{x:.2f}" for x in factor_df["Class Average"]],
-                    textposition='outside'
-                ))
-                
-                fig.update_layout(
-                    barmode='group',
-                    title="At-Risk Students vs. Class Average",
-                    xaxis_title="Factor",
-                    yaxis_title="Average Value",
-                    template="plotly_white",
-                    height=400,
-                    margin=dict(l=20, r=20, t=50, b=20)
-                )
+                    fig.add_trace(go.Bar(
+                        x=factor_df["Factor"],
+                        y=factor_df["Class Average"],
+                        name="Class Average",
+                        marker_color='#6C63FF',
+                        text=[f"{x:.2f}" for x in factor_df["Class Average"]],
+                        textposition='outside'
+                    ))
                 
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Recommendations summary
-                st.markdown("<h4>📋 Common Recommendations</h4>", unsafe_allow_html=True)
-                
-                # Extract common phrases from recommendations
-                from collections import Counter
-                import re
+                    fig.update_layout(
+                        barmode='group',
+                        title="At-Risk Students vs. Class Average",
+                        xaxis_title="Factor",
+                        yaxis_title="Average Value",
+                        template="plotly_white",
+                        height=400,
+                        margin=dict(l=20, r=20, t=50, b=20)
+                    )
                 
-                all_recommendations = " ".join(at_risk_df["Recommendation"].tolist())
-                words = re.findall(r'\b\w+\b', all_recommendations.lower())
-                common_words = Counter(words).most_common(20)
+                    st.plotly_chart(fig, use_container_width=True)
                 
-                # Filter out common stop words
-                stop_words = ["the", "to", "and", "a", "of", "for", "in", "is", "that", "with", "be", "on", "are", "this", "as", "an"]
-                filtered_words = [(word, count) for word, count in common_words if word not in stop_words and len(word) > 3]
+                    # Recommendations summary
+                    st.markdown("<h4>📋 Common Recommendations</h4>", unsafe_allow_html=True)
                 
-                # Create word cloud-like visualization
-                word_df = pd.DataFrame(filtered_words[:10], columns=["Word", "Count"])
+                    # Counted per recommendation code while scoring
+                    rec_df = summary.recommendation_summary()
                 
-                fig = px.bar(
-                      columns=["Word", "Count"])
+                    fig = px.bar(
+                        rec_df,
+                        x="Count",
+                        y="Recommendation",
+                        orientation="h",
+                        color="Count",
+                        color_continuous_scale="Viridis",
+                        labels={"Count": "At-Risk Students"},
+                        text="Count"
+                    )
                 
-                fig = px.bar(
-                    word_df,
-                    x="Word",
-                    y="Count",
-                    color="Count",
-                    color_continuous_scale="Viridis",
-                    labels={"Count": "Frequency"},
-                    text="Count"
-                )
+                    fig.update_layout(
+                        title="Recommendations for At-Risk Students",
+                        xaxis_title="Students",
+                        yaxis_title="",
+                        yaxis=dict(autorange="reversed"),
+                        template="plotly_white",
+                        height=350,
+                        margin=dict(l=20, r=20, t=50, b=20)
+                    )
                 
-                fig.update_layout(
-                    title="Common Terms in Recommendations",
-                    xaxis_title="",
-                    yaxis_title="Frequency",
-                    template="plotly_white",
-                    height=350,
-                    margin=dict(l=20, r=20, t=50, b=20)
-                )
+                    st.plotly_chart(fig, use_container_width=True)
                 
-                st.plotly_chart(fig, use_container_width=True)
+                    # Score tiers of the whole upload
+                    tier_df = summary.tier_summary()
+                    tier_cols = st.columns(len(tier_df))
+                    for col, (tier, count) in zip(tier_cols, tier_df.itertuples(index=False)):
+                        with col:
+                            st.markdown(f"""
+                            <div class="metric-container">
+                                <div class="metric-value">{count:,}</div>
+                                <div class="metric-label">{tier}</div>
+                            </div>
+                            """, unsafe_allow_html=True)
                 
-                st.markdown("</div>", unsafe_allow_html=True)
+                    st.markdown("</div>", unsafe_allow_html=True)
+
+            show_at_risk_analysis()
 
         except Exception as e:
             st.markdown(f"""
@@ -717,6 +857,21 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# Pipeline metrics panel, after this run's predictions have been recorded
+if metrics.enabled:
+    with st.sidebar:
+        with st.expander("⏱️ Pipeline Metrics", expanded=True):
+            counters = metrics.REGISTRY.counters
+            st.markdown(f"**{counters['rows']:,}** rows in **{counters['batches']:,}** batches · "
+                        f"{counters['errors']:,} errors · {metrics.at_risk_ratio():.1%} at risk")
+            stage_rows = [
+                {key: round(value, 3) if isinstance(value, float) else value for key, value in row.items()}
+                for row in metrics.summary()
+            ]
+            if stage_rows:
+                st.dataframe(stage_rows, hide_index=True, use_container_width=True)
+            st.button("Reset metrics", on_click=metrics.REGISTRY.reset)
+
 # Footer with improved styling
 st.markdown("""
 <div class="footer">
@@ -0,0 +1,88 @@
+"""Per-prediction feature attributions for the gradient boosting model.
+
+Every prediction is split into a bias (the model's average output) plus
+one contribution per input, using tree-path attributions: each split on a
+row's path credits the change in node value to the feature it tested, so
+bias + the contributions is exactly the predicted score. The work is one
+tree traversal of the whole batch on the compiled ensemble (see
+CompiledEnsemble.contributions), so explaining a batch costs about as much
+as scoring it.
+
+Contributions of the engineered features are split between their parents
+(Hours_Motivation between Hours_Studied and Motivation_Level,
+Attendance_Impact between Attendance and Previous_Scores), so the result is
+in terms of the 7 raw inputs.
+
+    python attributions.py roster.csv explained.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from predict import FEATURE_COLUMNS, MODEL_COLUMNS
+
+ENGINEERED_PARENTS = {
+    "Hours_Motivation": ("Hours_Studied", "Motivation_Level"),
+    "Attendance_Impact": ("Attendance", "Previous_Scores"),
+}
+
+
+def raw_mapping():
+    # (9 model columns) x (7 raw inputs): raw inputs keep their own column and
+    # take an equal share of each engineered feature built from them
+    mapping = np.zeros((len(MODEL_COLUMNS), len(FEATURE_COLUMNS)))
+    for row, col in enumerate(MODEL_COLUMNS):
+        parents = ENGINEERED_PARENTS.get(col, (col,))
+        for parent in parents:
+            mapping[row, FEATURE_COLUMNS.index(parent)] = 1 / len(parents)
+    return mapping
+
+
+RAW_MAPPING = raw_mapping()
+
+
+def compiled_ensemble(predictor):
+    # The predictor's trees in flattened form; compiled once per predictor
+    if predictor.engine in ("numpy", "bundle"):
+        return predictor.model
+    if predictor.engine == "sklearn":
+        if getattr(predictor, "_compiled", None) is None:
+            from compiled_model import CompiledEnsemble
+            predictor._compiled = CompiledEnsemble.from_sklearn(predictor.model)
+        return predictor._compiled
+    raise ValueError(f"Attributions need a gradient boosting engine, not {predictor.engine!r}")
+
+
+def explain_arrays(predictor, instances):
+    # (bias, contributions) with contributions of shape (rows, 7) in
+    # FEATURE_COLUMNS order; bias + row sum is the predicted score
+    bias, contributions = compiled_ensemble(predictor).contributions(predictor.feature_matrix(instances))
+    return bias, contributions @ RAW_MAPPING
+
+
+def explain(predictor, instances):
+    # One row per instance: the bias, a contribution column per raw input and
+    # the predicted score they add up to
+    bias, contributions = explain_arrays(predictor, instances)
+    frame = pd.DataFrame(contributions, columns=FEATURE_COLUMNS)
+    frame.insert(0, "Bias", bias)
+    frame["Predicted_Score"] = bias + contributions.sum(axis=1)
+    return frame
+
+
+def main():
+    from predict import StudentPerformancePredictor
+
+    parser = argparse.ArgumentParser(description="Write per-student feature contributions for a CSV of records")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--engine", choices=["sklearn", "numpy", "bundle"], default="numpy")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input, usecols=FEATURE_COLUMNS)
+    explain(StudentPerformancePredictor(engine=args.engine), df).to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
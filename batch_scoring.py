@@ -0,0 +1,225 @@
+"""Streaming batch prediction for large CSV uploads.
+
+The CSV is read in chunks, each chunk is scored with one vectorized predict
+call and appended to an output file, and a BatchSummary accumulates
+everything the Batch Analysis tab charts (mean score, at-risk count,
+histogram bins, factor means, correlations) without keeping the scored rows
+in memory.
+
+Each chunk is checked against the input schema (validation.py) before it
+is scored: valid rows go on to the model, rejected rows are counted by
+reason and optionally written to a separate file, so one bad row no
+longer fails the whole upload.
+
+Scored frames are compact: the fixed-vocabulary string columns (At_Risk,
+Recommendation, low-cardinality inputs) are categoricals, integer columns
+are downcast to the smallest type that holds them and scores are float32.
+CSV/Parquet/Arrow writers and st.dataframe render them as plain strings and
+numbers; expand_results converts back where object strings are needed.
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from predict import RECOMMENDATIONS
+from rules import DEFAULT_RULES
+from validation import Schema
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# 20 equal-width bins over the score range; out-of-range scores fall into
+# the outermost bins
+HISTOGRAM_EDGES = np.linspace(0, 100, 21)
+
+FACTOR_COLUMNS = ["Hours_Studied", "Attendance", "Previous_Scores", "Tutoring_Sessions"]
+
+# Predicted scores are rounded to this many decimals, which float32 holds exactly
+SCORE_DECIMALS = 2
+
+AT_RISK_DTYPE = pd.CategoricalDtype(["No", "Yes"])
+RECOMMENDATION_DTYPE = pd.CategoricalDtype(RECOMMENDATIONS)
+
+# String columns with at most this share of distinct values become categoricals
+MAX_CATEGORY_RATIO = 0.5
+
+
+def score_frame(predictor, df):
+    return format_results(df, *predictor.predict_arrays(df))
+
+
+def format_results(df, predicted_scores, at_risk, recommendations):
+    # Input columns plus the three columns the UI shows and exports
+    return compact_frame(df).assign(
+        Predicted_Score=np.round(predicted_scores, SCORE_DECIMALS).astype(np.float32),
+        At_Risk=pd.Categorical.from_codes(np.asarray(at_risk, dtype=np.int8), dtype=AT_RISK_DTYPE),
+        Recommendation=pd.Categorical(recommendations, dtype=RECOMMENDATION_DTYPE),
+    )
+
+
+def compact_frame(df):
+    # Lossless downcast: integers to the smallest (unsigned if possible) type,
+    # repetitive strings to categoricals. Floats keep their precision.
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_integer_dtype(values.dtype) and not pd.api.types.is_extension_array_dtype(values.dtype):
+            values = pd.to_numeric(values, downcast="unsigned" if len(values) and values.min() >= 0 else "integer")
+        elif pd.api.types.is_string_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+            if values.nunique(dropna=False) <= max(len(values) * MAX_CATEGORY_RATIO, 1):
+                values = values.astype("category")
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def expand_results(df):
+    # Plain object strings and 64-bit numbers, as format_results used to return
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(values.cat.categories.dtype)
+        elif col == "Predicted_Score":
+            # Widening alone would give 65.16999816894531 for 65.17
+            values = np.round(values.astype(np.float64), SCORE_DECIMALS)
+        elif pd.api.types.is_float_dtype(values.dtype):
+            values = values.astype(np.float64)
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            values = values.astype(np.int64)
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+class BatchSummary:
+    def __init__(self, histogram_edges=HISTOGRAM_EDGES, rules=DEFAULT_RULES):
+        self.histogram_edges = histogram_edges
+        self.rules = rules
+        self.histogram = np.zeros(len(histogram_edges) - 1, dtype=np.int64)
+        self.count = 0
+        self.score_sum = 0.0
+        self.at_risk_count = 0
+
+        # Rows the schema turned away, per kind of failed check
+        self.rejected_count = 0
+        self.rejection_counts = Counter()
+        # Per-code counts: recommendations of at-risk rows, tiers of all rows
+        self.recommendation_counts = np.zeros(len(RECOMMENDATIONS), dtype=np.int64)
+        self.tier_counts = np.zeros(len(rules.tier_names), dtype=np.int64)
+
+        # NaN-aware sums for the factor comparison chart
+        self.factor_sums = {"all": np.zeros(len(FACTOR_COLUMNS)), "at_risk": np.zeros(len(FACTOR_COLUMNS))}
+        self.factor_counts = {"all": np.zeros(len(FACTOR_COLUMNS)), "at_risk": np.zeros(len(FACTOR_COLUMNS))}
+
+        # Pairwise-complete moment sums for the correlation matrix; the
+        # numeric columns are fixed by the first chunk
+        self.numeric_columns = None
+        self._pair_n = None
+        self._pair_sum = None
+        self._pair_sumsq = None
+        self._pair_cross = None
+
+    def update_rejected(self, rejected, counts):
+        self.rejected_count += len(rejected)
+        self.rejection_counts.update(counts)
+
+    def update(self, scored):
+        scores = scored["Predicted_Score"].to_numpy(dtype=float)
+        at_risk = scored["At_Risk"].to_numpy() == "Yes"
+
+        self.count += len(scored)
+        self.score_sum += scores.sum()
+        self.at_risk_count += int(at_risk.sum())
+        clipped = np.clip(scores, self.histogram_edges[0], self.histogram_edges[-1])
+        self.histogram += np.histogram(clipped, bins=self.histogram_edges)[0]
+        codes = scored["Recommendation"].cat.codes.to_numpy()[at_risk]
+        self.recommendation_counts += np.bincount(codes, minlength=len(RECOMMENDATIONS))
+        self.tier_counts += self.rules.tier_counts(self.rules.tiers(scores))
+
+        present = [col for col in FACTOR_COLUMNS if col in scored.columns]
+        if present:
+            factors = scored.reindex(columns=FACTOR_COLUMNS).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+            for group, rows in (("all", slice(None)), ("at_risk", at_risk)):
+                values = factors[rows]
+                self.factor_sums[group] += np.nansum(values, axis=0)
+                self.factor_counts[group] += (~np.isnan(values)).sum(axis=0)
+
+        self._update_moments(scored)
+
+    def _update_moments(self, scored):
+        if self.numeric_columns is None:
+            self.numeric_columns = list(scored.select_dtypes(include="number").columns)
+            size = len(self.numeric_columns)
+            self._pair_n = np.zeros((size, size))
+            self._pair_sum = np.zeros((size, size))
+            self._pair_sumsq = np.zeros((size, size))
+            self._pair_cross = np.zeros((size, size))
+
+        values = scored.reindex(columns=self.numeric_columns).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        present = (~np.isnan(values)).astype(float)
+        filled = np.where(present > 0, values, 0.0)
+        # [i, j] entries only count rows where both column i and j are present
+        self._pair_n += present.T @ present
+        self._pair_sum += filled.T @ present
+        self._pair_sumsq += (filled ** 2).T @ present
+        self._pair_cross += filled.T @ filled
+
+    @property
+    def mean_score(self):
+        return self.score_sum / self.count if self.count else float("nan")
+
+    @property
+    def at_risk_percent(self):
+        return self.at_risk_count / self.count * 100 if self.count else 0.0
+
+    def recommendation_summary(self):
+        # At-risk rows per recommendation, most common first
+        order = np.argsort(-self.recommendation_counts, kind="stable")
+        order = order[self.recommendation_counts[order] > 0]
+        return pd.DataFrame({"Recommendation": RECOMMENDATIONS[order], "Count": self.recommendation_counts[order]})
+
+    def tier_summary(self):
+        return pd.DataFrame({
+            "Tier": [name.replace("_", " ").title() for name in self.rules.tier_names],
+            "Count": self.tier_counts,
+        })
+
+    def factor_means(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            at_risk = self.factor_sums["at_risk"] / self.factor_counts["at_risk"]
+            overall = self.factor_sums["all"] / self.factor_counts["all"]
+        return pd.DataFrame({
+            "Factor": [col.replace("_", " ") for col in FACTOR_COLUMNS],
+            "At-Risk Average": at_risk,
+            "Class Average": overall,
+        })[self.factor_counts["all"] > 0]
+
+    def correlation(self):
+        # Pearson correlation from the pairwise sums, as DataFrame.corr() gives
+        n, sum_x, sum_xx = self._pair_n, self._pair_sum, self._pair_sumsq
+        sum_y, sum_yy = sum_x.T, sum_xx.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = (n * self._pair_cross - sum_x * sum_y) / np.sqrt(
+                (n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2)
+            )
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.numeric_columns, columns=self.numeric_columns)
+
+
+def stream_predictions(source, predictor, output, chunksize=DEFAULT_CHUNKSIZE, summary=None, rejected=None,
+                       schema=None):
+    # Scores `source` (path or file object) chunk by chunk, appending rows to
+    # the open text file `output`. Rows failing the input schema are left out
+    # and, if `rejected` is an open text file, written there with their
+    # 1-based row number and reasons. Yields the running summary after each chunk.
+    summary = BatchSummary() if summary is None else summary
+    schema = Schema.from_predictor(predictor) if schema is None else schema
+    for index, chunk in enumerate(pd.read_csv(source, chunksize=chunksize)):
+        valid, bad, counts = schema.split(chunk)
+        scored = score_frame(predictor, valid)
+        scored.to_csv(output, header=index == 0, index=False)
+        summary.update(scored)
+        if len(bad):
+            if rejected is not None:
+                bad.insert(0, "Row", bad.index + 1)
+                bad.to_csv(rejected, header=summary.rejected_count == 0, index=False)
+            summary.update_rejected(bad, counts)
+        yield summary
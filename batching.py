@@ -0,0 +1,131 @@
+"""Micro-batching for concurrent prediction requests.
+
+Many callers each asking for one student pay the per-call model overhead
+once per request. MicroBatcher queues requests, gathers them for up to
+`max_batch_size` instances or `max_wait_ms` milliseconds (whichever comes
+first), scores the whole batch with one vectorized predict call and hands
+each caller back its own slice of the results.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+
+# Recent batches/requests kept for percentile metrics
+METRICS_WINDOW = 10_000
+
+
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, workers=1):
+        # predict_fn: list of instances -> list of results (e.g. predictor.predict)
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = deque(maxlen=METRICS_WINDOW)
+        self._queue_delays = deque(maxlen=METRICS_WINDOW)
+        self.batches = 0
+        self.requests = 0
+        self.instances = 0
+        self._threads = [
+            threading.Thread(target=self._run, name=f"micro-batcher-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, instances):
+        # Returns a Future resolving to the results for `instances`, in order
+        future = Future()
+        self._queue.put((list(instances), future, time.perf_counter()))
+        return future
+
+    def predict(self, instances, **kwargs):
+        # Blocking drop-in for StudentPerformancePredictor.predict
+        return self.submit(instances).result()
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch, size = [first], len(first[0])
+        deadline = first[2] + self.max_wait
+        while size < self.max_batch_size:
+            # Past the deadline, still drain what is already queued so a
+            # backlog is worked off in full batches rather than one by one
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown: finish this batch, then let the next loop exit
+                self._queue.put(None)
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            instances = [instance for request, _, _ in batch for instance in request]
+            try:
+                results = self.predict_fn(instances)
+            except Exception:
+                # One bad request must not fail its neighbours: retry each
+                # request on its own so only the offender gets the error
+                self._run_individually(batch)
+            else:
+                offset = 0
+                for request, future, _ in batch:
+                    future.set_result(results[offset:offset + len(request)])
+                    offset += len(request)
+            self._record(batch, started, len(instances))
+
+    def _run_individually(self, batch):
+        for request, future, _ in batch:
+            try:
+                future.set_result(self.predict_fn(request))
+            except Exception as error:
+                future.set_exception(error)
+
+    def _record(self, batch, started, size):
+        with self._lock:
+            self.batches += 1
+            self.requests += len(batch)
+            self.instances += size
+            self._batch_sizes.append(size)
+            self._queue_delays.extend(started - enqueued for _, _, enqueued in batch)
+
+    def stats(self):
+        with self._lock:
+            sizes = np.array(self._batch_sizes)
+            delays = np.array(self._queue_delays) * 1000
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "instances": self.instances,
+                "mean_batch_size": float(sizes.mean()) if len(sizes) else 0.0,
+                "max_batch_size": int(sizes.max()) if len(sizes) else 0,
+                "queue_delay_ms_p50": float(np.percentile(delays, 50)) if len(delays) else 0.0,
+                "queue_delay_ms_p99": float(np.percentile(delays, 99)) if len(delays) else 0.0,
+                "queue_delay_ms_max": float(delays.max()) if len(delays) else 0.0,
+            }
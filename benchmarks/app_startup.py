@@ -0,0 +1,52 @@
+"""Cold vs warm Streamlit script runs for app.py.
+
+Each measurement drives app.py headlessly with Streamlit's AppTest. The cold
+numbers come from a fresh interpreter (nothing imported, no model loaded);
+warm numbers are reruns inside the same process, which is what every widget
+interaction costs once the server is up.
+
+Run from the repository root:
+    python -m benchmarks.app_startup
+"""
+import json
+import subprocess
+import sys
+
+WARM_RUNS = 5
+
+RUN_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+timings = {{"import": time.perf_counter() - start}}
+
+def measure(name, step):
+    start = time.perf_counter()
+    result = step()
+    timings.setdefault(name, []).append(time.perf_counter() - start)
+    assert not result.exception, result.exception
+
+for _ in range({runs}):
+    measure("page load", at.run)
+    measure("form submit", lambda: at.button[0].click().run())
+print(json.dumps(timings))
+"""
+
+
+def main():
+    output = subprocess.run(
+        [sys.executable, "-c", RUN_SCRIPT.format(runs=WARM_RUNS + 1)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+
+    print(f"streamlit import: {timings.pop('import') * 1000:.0f} ms\n")
+    print(f"{'run':>12} {'cold ms':>9} {'warm ms':>9}")
+    for name, runs in timings.items():
+        warm = sorted(runs[1:])[len(runs[1:]) // 2]
+        print(f"{name:>12} {runs[0] * 1000:>9.0f} {warm * 1000:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
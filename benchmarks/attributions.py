@@ -0,0 +1,39 @@
+"""Throughput of per-row feature attributions vs plain scoring.
+
+Times predict_arrays and attributions.explain_arrays on the same synthetic
+batches for each engine, and checks that bias + contributions reproduces
+the predicted scores.
+
+Run from the repository root:
+    python -m benchmarks.attributions
+"""
+import numpy as np
+
+from attributions import compiled_ensemble, explain_arrays
+from benchmarks.common import synthetic_frame, timed
+from predict import StudentPerformancePredictor
+
+SIZES = [100, 1_000, 10_000, 100_000]
+ENGINES = ["sklearn", "numpy"]
+
+
+def main():
+    print(f"{'engine':<8} {'rows':>8} {'predict rows/s':>15} {'explain rows/s':>15} {'ratio':>6} {'max |error|':>12}")
+    for engine in ENGINES:
+        predictor = StudentPerformancePredictor(engine=engine)
+        # Compile outside the timings; it happens once per predictor
+        compiled_ensemble(predictor).path_contributions()
+        for size in SIZES:
+            df = synthetic_frame(size, seed=size)
+            repeat = 5 if size <= 10_000 else 2
+            predict_seconds, (scores, _, _) = timed(predictor.predict_arrays, df, repeat=repeat)
+            explain_seconds, (bias, contributions) = timed(explain_arrays, predictor, df, repeat=repeat)
+            error = np.abs(bias + contributions.sum(axis=1) - scores).max()
+            print(
+                f"{engine:<8} {size:>8,} {size / predict_seconds:>15,.0f} {size / explain_seconds:>15,.0f}"
+                f" {explain_seconds / predict_seconds:>6.2f} {error:>12.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Gradient boosting vs histogram gradient boosting, side by side.
+
+Fits both backends once on the same prepared train/test split from
+train.py: GradientBoostingRegressor on the encoded, scaled and engineered
+matrix with the shipped model's parameters, HistGradientBoostingRegressor on
+the raw inputs with native categoricals. Reports fit time, predict
+throughput on a synthetic batch (the hist model at 1 thread and at every
+core), artifact size and cold load time, and MAE overall and per segment.
+Nothing in the working directory is overwritten.
+
+Run from the repository root:
+    python -m benchmarks.backends [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+from threadpoolctl import threadpool_limits
+
+from benchmarks.common import synthetic_frame, timed
+from predict import CATEGORICAL_COLUMNS, StudentPerformancePredictor, native_frame
+from train import DATA_PATH, SEED, SEGMENTS, prepare
+
+DEFAULT_ROWS = 200_000
+
+GRADIENT_BOOSTING_PARAMS = {
+    "n_estimators": 150, "learning_rate": 0.1, "max_depth": 3, "min_samples_split": 10, "subsample": 0.8,
+}
+HIST_PARAMS = {"max_iter": 150, "learning_rate": 0.1, "max_leaf_nodes": 8, "min_samples_leaf": 20}
+
+
+def segment_mae(y_true, y_pred):
+    errors = {"overall": abs(y_true - y_pred).mean()}
+    for name, (lower, upper) in SEGMENTS.items():
+        mask = (y_true >= lower) & (y_true < upper)
+        if mask.any():
+            errors[name] = abs(y_true[mask] - y_pred[mask]).mean()
+    return errors
+
+
+def artifacts(directory, files):
+    # Total bytes on disk and cold-ish load time of `files` (name -> object)
+    paths = []
+    for name, artifact in files.items():
+        paths.append(os.path.join(directory, name))
+        joblib.dump(artifact, paths[-1])
+    size = sum(os.path.getsize(path) for path in paths)
+    start = time.perf_counter()
+    for path in paths:
+        joblib.load(path)
+    return size, time.perf_counter() - start
+
+
+def main(rows):
+    from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+
+    stat = os.stat(DATA_PATH)
+    X_train, X_test, y_train, y_test, raw_train, raw_test, scaler, label_encoders = prepare(
+        DATA_PATH, SEED, (stat.st_mtime_ns, stat.st_size)
+    )
+    y_true = y_test.to_numpy()
+
+    gradient_boosting = GradientBoostingRegressor(random_state=SEED, **GRADIENT_BOOSTING_PARAMS)
+    hist = HistGradientBoostingRegressor(categorical_features=CATEGORICAL_COLUMNS, random_state=SEED, **HIST_PARAMS)
+    gb_fit, _ = timed(gradient_boosting.fit, X_train, y_train)
+    hist_fit, _ = timed(hist.fit, raw_train, y_train)
+
+    # Both backends score the same synthetic batch, already in the form each
+    # model takes, so only the model's own predict is timed
+    batch = synthetic_frame(rows)
+    gb_batch = StudentPerformancePredictor().preprocess_batch(batch)
+    hist_batch = native_frame(batch)
+    gb_predict, _ = timed(gradient_boosting.predict, gb_batch, repeat=3)
+    with threadpool_limits(limits=1, user_api="openmp"):
+        hist_predict_one, _ = timed(hist.predict, hist_batch, repeat=3)
+    hist_predict, _ = timed(hist.predict, hist_batch, repeat=3)
+
+    with tempfile.TemporaryDirectory() as directory:
+        gb_size, gb_load = artifacts(directory, {
+            "final_gradient_boosting_model.pkl": gradient_boosting,
+            "final_scaler.pkl": scaler,
+            "final_label_encoders.pkl": label_encoders,
+        })
+        hist_size, hist_load = artifacts(directory, {
+            "final_hist_gradient_boosting_model.pkl": hist,
+            "final_scaler.pkl": scaler,
+        })
+
+    gb_errors = segment_mae(y_true, gradient_boosting.predict(X_test))
+    hist_errors = segment_mae(y_true, hist.predict(raw_test))
+
+    print(f"{len(y_train):,} training rows, {len(y_true):,} test rows, {rows:,} batch rows, {os.cpu_count()} CPU(s)")
+    print(f"{'':<26} {'gradient_boosting':>18} {'hist':>12}")
+    print(f"{'fit (s)':<26} {gb_fit:>18.3f} {hist_fit:>12.3f}")
+    print(f"{'predict, 1 thread (rows/s)':<26} {rows / gb_predict:>18,.0f} {rows / hist_predict_one:>12,.0f}")
+    print(f"{'predict, all (rows/s)':<26} {rows / gb_predict:>18,.0f} {rows / hist_predict:>12,.0f}")
+    print(f"{'artifacts (KB)':<26} {gb_size / 1e3:>18.1f} {hist_size / 1e3:>12.1f}")
+    print(f"{'artifact load (ms)':<26} {gb_load * 1000:>18.1f} {hist_load * 1000:>12.1f}")
+    for name in gb_errors:
+        print(f"{'MAE ' + name:<26} {gb_errors[name]:>18.2f} {hist_errors.get(name, float('nan')):>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS)
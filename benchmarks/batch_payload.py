@@ -0,0 +1,83 @@
+"""Browser payload and script time of the Batch Analysis tab.
+
+Uploads a synthetic CSV to app.py through Streamlit's AppTest and totals the
+serialized size of every message the run sends to the browser, split by
+element type, along with the script run time. Pass --rev to measure app.py
+as of another commit for a before/after comparison.
+
+Run from the repository root:
+    python -m benchmarks.batch_payload --rows 50000
+    python -m benchmarks.batch_payload --rows 50000 --rev <commit>
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from collections import Counter
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import local_script_runner
+
+from benchmarks.common import synthetic_frame
+
+APP_PATH = "app.py"
+
+
+def record_payload(sizes):
+    # Wrap AppTest's message parser to tally each run's outgoing messages
+    parse = local_script_runner.parse_tree_from_messages
+
+    def parse_and_record(messages):
+        sizes.clear()
+        for message in messages:
+            if message.HasField("delta") and message.delta.HasField("new_element"):
+                kind = message.delta.new_element.WhichOneof("type")
+            else:
+                kind = message.WhichOneof("type")
+            sizes[kind] += message.ByteSize()
+        return parse(messages)
+
+    local_script_runner.parse_tree_from_messages = parse_and_record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--rev", help="Measure app.py from this git revision instead of the working tree")
+    args = parser.parse_args()
+
+    app_path = APP_PATH
+    if args.rev:
+        source = subprocess.run(["git", "show", f"{args.rev}:app.py"], capture_output=True, check=True).stdout
+        # Kept in the repository root so the app's imports resolve
+        handle, app_path = tempfile.mkstemp(suffix=".py", prefix="_app_", dir=".")
+        with os.fdopen(handle, "wb") as f:
+            f.write(source)
+
+    sizes = Counter()
+    record_payload(sizes)
+    upload = synthetic_frame(args.rows).to_csv(index=False).encode()
+    try:
+        at = AppTest.from_file(os.path.abspath(app_path), default_timeout=600)
+        at.run()
+        start = time.perf_counter()
+        at.file_uploader[0].upload("students.csv", upload, "text/csv").run()
+        upload_seconds = time.perf_counter() - start
+        upload_sizes = Counter(sizes)
+        start = time.perf_counter()
+        at.run()
+        rerun_seconds = time.perf_counter() - start
+    finally:
+        if app_path != APP_PATH:
+            os.remove(app_path)
+
+    print(f"{args.rev or 'working tree'}: {args.rows:,} uploaded rows")
+    print(f"  upload run: {upload_seconds:.2f}s, rerun: {rerun_seconds:.2f}s")
+    print(f"  payload per run: {sum(upload_sizes.values()) / 1e6:.2f} MB")
+    for kind, size in upload_sizes.most_common(5):
+        print(f"    {kind:<20} {size / 1e6:8.3f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Rows/sec of the vectorized batch path vs the original per-row path.
+
+Run from the repository root:
+    python -m benchmarks.batch_throughput [sizes...]
+"""
+import sys
+
+from predict import StudentPerformancePredictor
+from benchmarks.common import synthetic_instances, timed
+
+DEFAULT_SIZES = [1, 100, 10_000, 1_000_000]
+# The per-row path is far too slow to run at full size; it is measured on a
+# capped sample and used to verify the batch output matches it exactly
+ROWWISE_LIMIT = 1_000
+
+
+def predict_rowwise(predictor, instances):
+    return [predictor.predict([instance])[0] for instance in instances]
+
+
+def main(sizes):
+    predictor = StudentPerformancePredictor()
+    print(f"{'rows':>10} {'batch rows/s':>14} {'per-row rows/s':>16} {'speedup':>9}  identical")
+    for n in sizes:
+        instances = synthetic_instances(n)
+        batch_time, batch_results = timed(predictor.predict, instances, repeat=3 if n <= 10_000 else 1)
+
+        sample = instances[:ROWWISE_LIMIT]
+        row_time, row_results = timed(predict_rowwise, predictor, sample)
+        identical = row_results == batch_results[:len(sample)]
+
+        batch_rate = n / batch_time
+        row_rate = len(sample) / row_time
+        print(f"{n:>10} {batch_rate:>14,.0f} {row_rate:>16,.0f} {batch_rate / row_rate:>8.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,33 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from predict import FEATURE_COLUMNS
+
+DATA_PATH = "student_performance.csv"
+
+
+def synthetic_frame(n, seed=0, columns=FEATURE_COLUMNS):
+    # Resample the training CSV column-by-column so large batches follow the
+    # same marginal distributions as the real data; columns=None keeps all 20
+    source = pd.read_csv(DATA_PATH, usecols=columns)
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        col: source[col].to_numpy()[rng.integers(0, len(source), size=n)]
+        for col in source.columns
+    })
+
+
+def synthetic_instances(n, seed=0):
+    return synthetic_frame(n, seed).to_dict(orient="records")
+
+
+def timed(fn, *args, repeat=1, **kwargs):
+    # Best-of-N wall time in seconds, plus the last result
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
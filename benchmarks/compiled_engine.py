@@ -0,0 +1,51 @@
+"""sklearn vs pure-NumPy engine: accuracy, latency and import footprint.
+
+Run from the repository root (after `python compiled_model.py`):
+    python -m benchmarks.compiled_engine
+"""
+import subprocess
+import sys
+
+import numpy as np
+
+from predict import StudentPerformancePredictor
+from benchmarks.common import synthetic_instances, timed
+
+BATCH_SIZES = [1, 100, 10_000, 100_000]
+
+# Loads a predictor in a fresh interpreter and reports what that cost
+FOOTPRINT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from predict import StudentPerformancePredictor
+StudentPerformancePredictor(engine={engine!r})
+elapsed = time.perf_counter() - start
+print(elapsed, len(sys.modules), int(any(name.startswith("sklearn") for name in sys.modules)))
+"""
+
+
+def main():
+    engines = {name: StudentPerformancePredictor(engine=name) for name in ["sklearn", "numpy"]}
+
+    instances = synthetic_instances(100_000)
+    expected = engines["sklearn"].predict_arrays(instances)[0]
+    actual = engines["numpy"].predict_arrays(instances)[0]
+    print(f"Max abs score difference over {len(instances):,} rows: {np.abs(expected - actual).max():.3e}\n")
+
+    print(f"{'rows':>8} " + " ".join(f"{name + ' ms':>12}" for name in engines))
+    for n in BATCH_SIZES:
+        batch = instances[:n]
+        times = [timed(engine.predict, batch, repeat=20 if n == 1 else 3)[0] for engine in engines.values()]
+        print(f"{n:>8} " + " ".join(f"{t * 1000:>12.3f}" for t in times))
+
+    print(f"\n{'engine':>8} {'load s':>8} {'modules':>8} {'sklearn':>8}")
+    for name in engines:
+        output = subprocess.run(
+            [sys.executable, "-c", FOOTPRINT_SCRIPT.format(engine=name)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        print(f"{name:>8} {float(output[0]):>8.3f} {output[1]:>8} {'yes' if output[2] == '1' else 'no':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Whole-roster counterfactual search: batched vs per-candidate calls.
+
+Runs counterfactuals.search over synthetic rosters (attendance on the
+form's 0-1 scale) and reports the time per roster. "single tier" is the same batched search with every candidate in
+one tier, so no student drops out early. "per-candidate" is the search done
+with one predict call per candidate, timed on a few students and
+extrapolated to the roster's at-risk count.
+
+Run from the repository root:
+    python -m benchmarks.counterfactuals
+"""
+import time
+
+import numpy as np
+
+from benchmarks.common import synthetic_frame, timed
+from counterfactuals import candidate_grid, cost_tiers, search
+from predict import StudentPerformancePredictor
+
+ROSTER_SIZES = [1_000, 10_000, 100_000]
+SAMPLE = 3
+
+
+def roster(size):
+    df = synthetic_frame(size, seed=size)
+    df["Attendance"] = df["Attendance"] / 100
+    return df
+
+
+def per_candidate(predictor, df, rows):
+    # One predict call per candidate of each student
+    deltas, _ = candidate_grid()
+    columns = ["Hours_Studied", "Attendance", "Tutoring_Sessions"]
+    for row in rows:
+        base = df.iloc[row].to_dict()
+        for delta in deltas:
+            instance = dict(base)
+            for col, change in zip(columns, delta):
+                instance[col] += change
+            predictor.predict([instance])
+
+
+def main():
+    predictor = StudentPerformancePredictor(engine="numpy")
+    deltas, costs = candidate_grid()
+    print(f"{len(deltas)} candidates per at-risk student, in {len(cost_tiers(costs))} cost tiers")
+    print(f"{'students':>9} {'at risk':>8} {'plans':>7} {'tiered s':>9} {'single tier s':>14} {'per-candidate s':>16}")
+    for size in ROSTER_SIZES:
+        df = roster(size)
+        seconds, result = timed(search, predictor, df)
+        single_tier, _ = timed(search, predictor, df, tier_size=len(deltas))
+        at_risk = np.flatnonzero(result["At_Risk"].to_numpy() == 1)
+        plans = int(result["Found"].to_numpy()[at_risk].sum())
+        start = time.perf_counter()
+        per_candidate(predictor, df, at_risk[:SAMPLE])
+        looped = (time.perf_counter() - start) / SAMPLE * len(at_risk)
+        print(f"{size:>9,} {len(at_risk):>8,} {plans:>7,} {seconds:>9.2f} {single_tier:>14.2f} {looped:>15.0f}*")
+    print(f"* extrapolated from {SAMPLE} students")
+
+
+if __name__ == "__main__":
+    main()
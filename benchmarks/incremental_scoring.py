@@ -0,0 +1,61 @@
+"""Full rescoring vs the prediction store's incremental rescoring.
+
+Builds a synthetic roster with student IDs, scores it once into a fresh
+SQLite store, then changes one feature for a fraction of the students and
+rescores the next day's roster. Compares the time of that second run with
+calling predict_arrays on the whole roster, for each engine.
+
+Run from the repository root:
+    python -m benchmarks.incremental_scoring [rows] [changed_fraction]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import synthetic_frame, timed
+from predict import StudentPerformancePredictor
+from prediction_store import PredictionStore
+
+DEFAULT_ROWS = 200_000
+DEFAULT_CHANGED = 0.05
+
+
+def rosters(rows, changed, seed=0):
+    first = synthetic_frame(rows, seed=seed)
+    first.insert(0, "Student_ID", [f"S{i:07d}" for i in range(rows)])
+    first["Cohort"] = np.where(np.arange(rows) % 2, "A", "B")
+    second = first.copy()
+    mask = np.random.default_rng(seed).random(rows) < changed
+    second.loc[mask, "Hours_Studied"] += 1
+    return first, second
+
+
+def main(rows, changed):
+    first, second = rosters(rows, changed)
+    print(f"{rows:,} students, {changed:.0%} changed on day 2")
+    print(f"{'engine':<8} {'full rescore':>13} {'store day 1':>12} {'store day 2':>12} {'rescored':>9} {'reused':>9}")
+    for engine in ["sklearn", "numpy"]:
+        predictor = StudentPerformancePredictor(engine=engine)
+        full, _ = timed(predictor.predict_arrays, second, repeat=3)
+        with tempfile.TemporaryDirectory() as directory:
+            with PredictionStore(os.path.join(directory, "predictions.sqlite")) as store:
+                start = time.perf_counter()
+                store.score(predictor, first, cohort_column="Cohort", run_date="2025-01-01")
+                day_one = time.perf_counter() - start
+            # A new store object, as the next day's job would open
+            with PredictionStore(os.path.join(directory, "predictions.sqlite")) as store:
+                start = time.perf_counter()
+                store.score(predictor, second, cohort_column="Cohort", run_date="2025-01-02")
+                day_two = time.perf_counter() - start
+                print(f"{engine:<8} {full:>12.3f}s {day_one:>11.3f}s {day_two:>11.3f}s"
+                      f" {store.scored:>9,} {store.reused:>9,}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS,
+        float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHANGED,
+    )
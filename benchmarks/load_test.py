@@ -0,0 +1,110 @@
+"""Load test for server.py: p50/p99 latency and requests/sec.
+
+Starts a server in a subprocess (unless --url is given) and drives it with
+asyncio clients that each hold one keep-alive connection.
+
+Run from the repository root:
+    python -m benchmarks.load_test [--concurrency 1 4 16 64] [--batch-size 1]
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+from benchmarks.common import synthetic_instances
+
+
+async def client(host, port, body, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (
+        f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            if not head.startswith(b"HTTP/1.1 200"):
+                raise RuntimeError(head.decode("latin-1"))
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, body, concurrency, duration):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, body, deadline, latencies) for _ in range(concurrency)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+async def wait_until_ready(host, port, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def main(args):
+    url = urlparse(args.url)
+    await wait_until_ready(url.hostname, url.port)
+    body = json.dumps({"instances": synthetic_instances(args.batch_size)}, default=str).encode("utf-8")
+
+    print(f"batch size {args.batch_size}, {args.duration:.0f}s per level")
+    print(f"{'concurrency':>11} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        latencies, elapsed = await run_level(url.hostname, url.port, body, concurrency, args.duration)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f"{concurrency:>11} {len(latencies):>9} {len(latencies) / elapsed:>9.0f} {p50:>8.2f} {p99:>8.2f}")
+
+    health = await fetch_health(url.hostname, url.port)
+    if "batching" in health:
+        print(f"server batching stats: {health['batching']}")
+
+
+async def fetch_health(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /healthz HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Existing server to test (default: start one locally)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--batch-size", type=int, default=1, help="Instances per request")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per concurrency level")
+    parser.add_argument("--engine", choices=["sklearn", "numpy"], default="sklearn")
+    parser.add_argument("--micro-batch", action="store_true", help="Start the server with micro-batching")
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        args.url = "http://127.0.0.1:8765"
+        command = [sys.executable, "server.py", "--port", "8765", "--engine", args.engine]
+        if args.micro_batch:
+            command.append("--micro-batch")
+        server = subprocess.Popen(command)
+    try:
+        asyncio.run(main(args))
+    finally:
+        if server is not None:
+            server.terminate()
@@ -0,0 +1,41 @@
+"""Cost of the pipeline metrics hooks, disabled vs enabled.
+
+Times single-record and batch predict calls with collection off and on, and
+the bare cost of one disabled stage() hook.
+
+Run from the repository root:
+    python -m benchmarks.metrics_overhead
+"""
+import timeit
+
+import metrics
+from benchmarks.common import synthetic_instances
+from predict import StudentPerformancePredictor
+
+CALLS = {1: 2000, 10_000: 20}
+
+
+def best_per_call(fn, number, repeat=5):
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main():
+    predictor = StudentPerformancePredictor(engine="numpy")
+    metrics.disable()
+    hook = best_per_call(lambda: metrics.stage("encode").__enter__(), 100_000)
+    print(f"disabled stage() hook: {hook * 1e9:.0f} ns")
+
+    print(f"{'rows':>8} {'disabled us':>12} {'enabled us':>11} {'overhead':>9}")
+    for rows, number in CALLS.items():
+        instances = synthetic_instances(rows)
+        timings = {}
+        for state in ("disabled", "enabled"):
+            metrics.enable() if state == "enabled" else metrics.disable()
+            timings[state] = best_per_call(lambda: predictor.predict(instances), number)
+        metrics.disable()
+        overhead = timings["enabled"] / timings["disabled"] - 1
+        print(f"{rows:>8} {timings['disabled'] * 1e6:>12.1f} {timings['enabled'] * 1e6:>11.1f} {overhead:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Concurrent single-student callers: direct predict vs MicroBatcher.
+
+Each caller thread repeatedly scores one student, as concurrent form
+submissions do. Reports throughput, achieved batch size and the queueing
+delay the batcher adds.
+
+Run from the repository root:
+    python -m benchmarks.micro_batching
+"""
+import threading
+import time
+
+from batching import MicroBatcher
+from predict import StudentPerformancePredictor
+from benchmarks.common import synthetic_instances
+
+CALLERS = [1, 8, 32, 128]
+DURATION = 3.0
+
+
+def drive(predict, callers, instances):
+    counts = [0] * callers
+    deadline = time.perf_counter() + DURATION
+
+    def caller(index):
+        while time.perf_counter() < deadline:
+            predict([instances[(index + counts[index]) % len(instances)]])
+            counts[index] += 1
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    predictor = StudentPerformancePredictor()
+    instances = synthetic_instances(1000)
+    print(f"{'callers':>7} {'direct req/s':>13} {'batched req/s':>14} {'mean batch':>11} {'delay p50 ms':>13} {'delay p99 ms':>13}")
+    for callers in CALLERS:
+        direct = drive(predictor.predict, callers, instances)
+        batcher = MicroBatcher(predictor.predict, max_batch_size=64, max_wait_ms=5)
+        batched = drive(batcher.predict, callers, instances)
+        stats = batcher.stats()
+        batcher.close()
+        print(f"{callers:>7} {direct:>13.0f} {batched:>14.0f} {stats['mean_batch_size']:>11.1f} "
+              f"{stats['queue_delay_ms_p50']:>13.2f} {stats['queue_delay_ms_p99']:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Load time and per-worker memory: three pickles vs the mapped bundle.
+
+For each way of loading the model (the sklearn engine's three .pkl files,
+the numpy engine's .npz and the bundle engine's memory-mapped file), starts
+fresh worker processes that each construct a StudentPerformancePredictor
+and score one batch, and reports:
+
+    import      time to import the engine's modules (sklearn or just NumPy)
+    load        time to construct the predictor from its artifacts
+    RSS         resident set per worker
+    PSS         proportional set per worker; pages shared by several
+                workers (such as a mapped bundle) are split between them
+    private     memory only this worker holds (Private_Clean + Private_Dirty)
+
+Memory figures come from /proc/self/smaps_rollup, so they need Linux.
+
+Run from the repository root:
+    python -m benchmarks.model_bundle [workers]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+ENGINES = ["sklearn", "numpy", "bundle"]
+DEFAULT_WORKERS = 4
+
+WORKER_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+if %(engine)r == "sklearn":
+    import sklearn.ensemble
+import predict
+imported = time.perf_counter()
+predictor = predict.StudentPerformancePredictor(engine=%(engine)r)
+loaded = time.perf_counter()
+predictor.predict([{
+    "Hours_Studied": 5, "Attendance": 0.8, "Previous_Scores": 70, "Motivation_Level": "Medium",
+    "Tutoring_Sessions": 2, "Parental_Involvement": "High", "Access_to_Resources": "Low",
+}])
+memory = {}
+with open("/proc/self/smaps_rollup") as f:
+    for line in f:
+        name, _, rest = line.partition(":")
+        if rest.strip().endswith("kB"):
+            memory[name] = int(rest.split()[0])
+print(json.dumps({"import": imported - start, "load": loaded - imported, "memory": memory}))
+# Stay alive until told to exit, so every worker is mapped at once
+sys.stdin.read()
+"""
+
+
+def run_workers(engine, workers):
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER_SCRIPT % {"engine": engine}],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        for _ in range(workers)
+    ]
+    results = [json.loads(process.stdout.readline()) for process in processes]
+    # PSS is only meaningful once all workers are resident; re-read it now
+    for process, result in zip(processes, results):
+        with open(f"/proc/{process.pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    result["memory"]["Pss"] = int(line.split()[1])
+    for process in processes:
+        process.communicate("")
+    return results
+
+
+def median_of(results, key):
+    return statistics.median(key(result) for result in results)
+
+
+def main(workers):
+    print(f"{workers} workers per engine")
+    print(f"{'engine':<10} {'import ms':>10} {'load ms':>10} {'RSS MB':>8} {'PSS MB':>8} {'private MB':>11}")
+    for engine in ENGINES:
+        results = run_workers(engine, workers)
+        import_ms = median_of(results, lambda r: r["import"]) * 1000
+        load_ms = median_of(results, lambda r: r["load"]) * 1000
+        rss, pss = (median_of(results, lambda r: r["memory"][key]) / 1024 for key in ("Rss", "Pss"))
+        private = median_of(results, lambda r: r["memory"]["Private_Clean"] + r["memory"]["Private_Dirty"]) / 1024
+        print(f"{engine:<10} {import_ms:>10.1f} {load_ms:>10.2f} {rss:>8.1f} {pss:>8.1f} {private:>11.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_WORKERS)
@@ -0,0 +1,30 @@
+"""Scaling of predict_parallel across 1/2/4/8 worker processes.
+
+Run from the repository root:
+    python -m benchmarks.parallel_scaling [rows]
+"""
+import os
+import sys
+
+from parallel import predict_parallel
+from predict import StudentPerformancePredictor
+from benchmarks.common import synthetic_frame, timed
+
+WORKERS = [1, 2, 4, 8]
+
+
+def main(n):
+    predictor = StudentPerformancePredictor()
+    df = synthetic_frame(n)
+    print(f"{n:,} rows, {os.cpu_count()} CPUs available")
+
+    baseline, expected = timed(predictor.predict_arrays, df)
+    print(f"{'in-process':>10} {n / baseline:>12,.0f} rows/s")
+    for workers in WORKERS:
+        elapsed, results = timed(predict_parallel, df, workers=workers, predictor=predictor)
+        same = all((a == b).all() for a, b in zip(expected, results))
+        print(f"{workers:>7} wk {n / elapsed:>12,.0f} rows/s  {baseline / elapsed:>5.2f}x  identical={same}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
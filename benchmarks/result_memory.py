@@ -0,0 +1,48 @@
+"""Memory per scored student: compact vs expanded result frames.
+
+Scores a synthetic batch carrying all 20 CSV columns and reports the deep
+memory footprint of the compact frame format_results returns, the plain
+object-string/64-bit frame it used to return (expand_results), and the
+codes the Batch Analysis search index keeps per row. Seconds are the time to
+build each one (the expanded frame from the compact one).
+
+Run from the repository root:
+    python -m benchmarks.result_memory [rows]
+"""
+import sys
+
+from batch_scoring import expand_results, format_results
+from benchmarks.common import synthetic_frame, timed
+from predict import StudentPerformancePredictor
+from search_index import SearchIndex
+
+DEFAULT_ROWS = 1_000_000
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def main(rows):
+    df = synthetic_frame(rows, columns=None)
+    results = StudentPerformancePredictor(engine="numpy").predict_arrays(df)
+
+    format_time, compact = timed(format_results, df, *results)
+    expand_time, expanded = timed(expand_results, compact)
+    index = SearchIndex()
+    index_time, _ = timed(index.update, compact)
+    index_bytes = sum(index.codes(col).nbytes for col in index.columns)
+
+    print(f"{rows:,} scored rows, {len(compact.columns)} columns")
+    print(f"{'representation':<20} {'bytes/row':>10} {'total MB':>10} {'seconds':>8}")
+    for name, size, seconds in [
+        ("expanded", frame_bytes(expanded), expand_time),
+        ("compact", frame_bytes(compact), format_time),
+        ("search index codes", index_bytes, index_time),
+    ]:
+        print(f"{name:<20} {size / rows:>10.1f} {size / 1e6:>10.1f} {seconds:>8.2f}")
+    print(f"compact is {frame_bytes(expanded) / frame_bytes(compact):.1f}x smaller than expanded")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS)
@@ -0,0 +1,55 @@
+"""Rule evaluation and summary counting: rule table vs per-row branching.
+
+Times the compiled rule table (rules.RuleSet.evaluate) against the original
+per-row if/elif chain on random model matrices (the chain lives in
+tests/test_rules.py, which asserts the two agree, cut points included),
+and compares summarising at-risk recommendations with a bincount of
+the codes against regex-tokenizing and Counter-ing the recommendation text.
+
+Run from the repository root:
+    python -m benchmarks.rules
+"""
+import re
+from collections import Counter
+
+import numpy as np
+
+from benchmarks.common import timed
+from predict import COLUMN_INDEX, MODEL_COLUMNS, RECOMMENDATIONS
+from rules import DEFAULT_RULES
+from tests.test_rules import per_row
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def text_summary(recommendations, at_risk):
+    words = Counter()
+    for recommendation, count in Counter(recommendations[at_risk].tolist()).items():
+        for word in re.findall(r"\b\w+\b", recommendation.lower()):
+            words[word] += count
+    return words
+
+
+def code_summary(codes, at_risk):
+    return np.bincount(codes[at_risk], minlength=len(RECOMMENDATIONS))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'per-row ms':>11} {'rules ms':>9} {'text summary ms':>16} {'bincount ms':>12} {'same':>5}")
+    for size in SIZES:
+        X = rng.normal(size=(size, len(MODEL_COLUMNS)))
+        scores = rng.normal(67, 5, size)
+        looped, expected = timed(per_row, X, scores)
+        vectorized, (_, at_risk, codes) = timed(DEFAULT_RULES.evaluate, X, scores, COLUMN_INDEX, repeat=5)
+        mask = at_risk == 1
+        text, _ = timed(text_summary, RECOMMENDATIONS[codes], mask)
+        counted, _ = timed(code_summary, codes, mask, repeat=5)
+        print(
+            f"{size:>10,} {looped * 1000:>11.1f} {vectorized * 1000:>9.2f} {text * 1000:>16.2f}"
+            f" {counted * 1000:>12.3f} {str(bool((codes == expected).all())):>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Sensitivity curves: one batched call vs one predict per sweep point.
+
+Times sensitivity.curves (every sweep point of the four sliders in one
+predict_arrays call) against predicting the same points one at a time, and
+a repeated submission served from the curve cache.
+
+Run from the repository root:
+    python -m benchmarks.sensitivity
+"""
+from benchmarks.common import synthetic_instances, timed
+from model_registry import get_predictor
+from sensitivity import cached_curves, clear_cache, curves, sweep_batch
+
+ENGINES = ["sklearn", "numpy"]
+
+
+def per_point(predictor, instance):
+    batch, _ = sweep_batch(instance)
+    for i in range(len(next(iter(batch.values())))):
+        predictor.predict([{col: values[i] for col, values in batch.items()}])
+
+
+def main():
+    instance = synthetic_instances(1, seed=3)[0]
+    instance["Attendance"] /= 100
+    points = len(next(iter(sweep_batch(instance)[0].values())))
+    print(f"{points} sweep points per submission")
+    print(f"{'engine':<8} {'per point ms':>13} {'batched ms':>11} {'cached ms':>10}")
+    for engine in ENGINES:
+        predictor = get_predictor(engine)
+        looped, _ = timed(per_point, predictor, instance, repeat=3)
+        batched, _ = timed(curves, predictor, instance, repeat=20)
+        clear_cache()
+        cached_curves(instance, engine)
+        cached, _ = timed(cached_curves, instance, engine, repeat=20)
+        print(f"{engine:<8} {looped * 1000:>13.1f} {batched * 1000:>11.2f} {cached * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Reproducible performance suite for predict.py and app.py.
+
+Measures single-record latency, batch throughput across sizes, cold load
+time of the three .pkl artifacts, peak memory of streaming batch scoring and
+Streamlit script run times for both tabs (headless, via AppTest). Inputs
+are seeded synthetic batches drawn from student_performance.csv.
+
+Results are written as JSON; passing a previous run as --baseline flags
+every metric that got worse by more than --tolerance and exits non-zero.
+
+Run from the repository root:
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json --output current.json
+    python -m benchmarks.suite --quick      # smaller sizes, fewer repeats
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.common import synthetic_frame, synthetic_instances, timed
+
+ARTIFACTS = ["final_gradient_boosting_model.pkl", "final_scaler.pkl", "final_label_encoders.pkl"]
+
+LOAD_SCRIPT = """
+import json, time
+import joblib
+start = time.perf_counter()
+import sklearn.ensemble
+timings = {"sklearn import": time.perf_counter() - start}
+for path in %r:
+    start = time.perf_counter()
+    joblib.load(path)
+    timings[path] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+class Results:
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, value, unit, better="lower"):
+        self.metrics[name] = {"value": float(value), "unit": unit, "better": better}
+        print(f"  {name:<44} {value:>12,.3f} {unit}", flush=True)
+
+
+def single_latency(results, engine, calls):
+    from predict import StudentPerformancePredictor
+
+    predictor = StudentPerformancePredictor(engine=engine)
+    instances = synthetic_instances(calls, seed=1)
+    for instance in instances[:20]:
+        predictor.predict([instance])
+    latencies = []
+    for instance in instances:
+        start = time.perf_counter()
+        predictor.predict([instance])
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    results.add(f"single/{engine}/p50", np.percentile(latencies, 50), "ms")
+    results.add(f"single/{engine}/p99", np.percentile(latencies, 99), "ms")
+
+
+def batch_throughput(results, engine, sizes, repeat):
+    from predict import StudentPerformancePredictor
+
+    predictor = StudentPerformancePredictor(engine=engine)
+    for size in sizes:
+        df = synthetic_frame(size)
+        seconds, _ = timed(predictor.predict_arrays, df, repeat=repeat)
+        results.add(f"batch/{engine}/{size}", size / seconds, "rows/s", better="higher")
+
+
+def model_load(results, repeat):
+    # Fresh interpreter per run so nothing is imported or cached in-process
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", LOAD_SCRIPT % (ARTIFACTS,)], capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(output.stdout))
+    for name in runs[0]:
+        results.add(f"load/{name}", min(run[name] for run in runs) * 1000, "ms")
+
+
+def batch_memory(results, rows):
+    from batch_scoring import stream_predictions
+    from predict import StudentPerformancePredictor
+
+    predictor = StudentPerformancePredictor()
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as source:
+        synthetic_frame(rows, columns=None).to_csv(source, index=False)
+    try:
+        with open(os.devnull, "w") as sink:
+            tracemalloc.start()
+            for _ in stream_predictions(source.name, predictor, sink):
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        os.remove(source.name)
+    results.add(f"memory/stream_scoring/{rows}", peak / 1e6, "MB")
+
+
+def app_runs(results, rows, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    upload = synthetic_frame(rows, columns=None).to_csv(index=False).encode()
+
+    def new_session():
+        session = AppTest.from_file(os.path.abspath("app.py"), default_timeout=600)
+        session.run()
+        return session
+
+    def measure(name, step, setup=None):
+        samples = []
+        for _ in range(repeat):
+            target = setup() if setup else None
+            start = time.perf_counter()
+            at = step(target) if setup else step()
+            samples.append(time.perf_counter() - start)
+            assert not at.exception, at.exception
+        results.add(f"app/{name}", statistics.median(samples) * 1000, "ms")
+
+    at = new_session()
+    measure("page load", at.run)
+    measure("tab1 form submit", lambda: at.button[0].click().run())
+    # A fresh session per upload, so each one scores the file from scratch
+    measure(f"tab2 upload/{rows}", lambda session: session.file_uploader[0].upload("students.csv", upload, "text/csv").run(),
+            setup=new_session)
+    at.file_uploader[0].upload("students.csv", upload, "text/csv").run()
+    measure(f"tab2 rerun/{rows}", at.run)
+
+
+def environment():
+    import sklearn
+    import streamlit
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "streamlit": streamlit.__version__,
+        "cpus": os.cpu_count(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(metrics, baseline, tolerance):
+    # Metrics worse than the baseline by more than `tolerance` (a fraction)
+    regressions = []
+    print(f"\nAgainst baseline (tolerance {tolerance:.0%}):")
+    for name, current in metrics.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = current["value"] / previous["value"] - 1 if previous["value"] else 0.0
+        worse = change > tolerance if current["better"] == "lower" else change < -tolerance
+        flag = "REGRESSION" if worse else ""
+        print(f"  {name:<44} {previous['value']:>12,.3f} -> {current['value']:>12,.3f} {change:>+8.1%} {flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Results JSON from a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (default 0.25)")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes and fewer repeats")
+    args = parser.parse_args()
+
+    sizes = [1_000, 10_000] if args.quick else [1_000, 10_000, 100_000]
+    repeat = 1 if args.quick else 3
+    results = Results()
+
+    print("Single-record latency")
+    for engine in ["sklearn", "numpy"]:
+        single_latency(results, engine, calls=100 if args.quick else 500)
+    print("Batch throughput")
+    for engine in ["sklearn", "numpy"]:
+        batch_throughput(results, engine, sizes, repeat)
+    print("Model load (cold)")
+    model_load(results, repeat)
+    print("Peak memory")
+    batch_memory(results, rows=50_000 if args.quick else 200_000)
+    print("Streamlit script runs")
+    app_runs(results, rows=5_000 if args.quick else 50_000, repeat=repeat)
+
+    report = {"environment": environment(), "quick": args.quick, "metrics": results.metrics}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("quick") != args.quick:
+            print("Warning: baseline and this run differ in --quick; only shared metrics are compared")
+        regressions = compare(results.metrics, baseline["metrics"], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
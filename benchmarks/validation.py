@@ -0,0 +1,53 @@
+"""Cost of input validation relative to scoring.
+
+Times validation.Schema.split on synthetic files, clean and with 1% of rows
+corrupted (unparseable numbers, out-of-range attendance, unseen categories,
+missing values), against scoring the valid rows with predict_arrays.
+
+Run from the repository root:
+    python -m benchmarks.validation
+"""
+import numpy as np
+
+from benchmarks.common import synthetic_frame, timed
+from predict import StudentPerformancePredictor
+from validation import Schema
+
+SIZES = [10_000, 100_000, 1_000_000]
+ENGINES = ["sklearn", "numpy"]
+BAD_SHARE = 0.01
+
+
+def corrupt(df, share=BAD_SHARE, seed=0):
+    # A copy with `share` of the rows broken in one of four ways
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    rows = rng.choice(len(df), int(len(df) * share), replace=False)
+    kinds = np.array_split(rows, 4)
+    df["Attendance"] = df["Attendance"].astype(object)
+    df.loc[kinds[0], "Attendance"] = "n/a"
+    df.loc[kinds[1], "Attendance"] = 140.0
+    df.loc[kinds[2], "Motivation_Level"] = "Very High"
+    df.loc[kinds[3], "Hours_Studied"] = np.nan
+    return df
+
+
+def main():
+    predictors = {engine: StudentPerformancePredictor(engine=engine) for engine in ENGINES}
+    schema = Schema.from_predictor(predictors["sklearn"])
+    print(f"{'rows':>10} {'file':<6} {'rejected':>9} {'validate ms':>12} "
+          + " ".join(f"{engine + ' score ms':>17} {'share':>6}" for engine in ENGINES))
+    for size in SIZES:
+        clean = synthetic_frame(size, seed=size)
+        for label, df in (("clean", clean), ("1% bad", corrupt(clean))):
+            repeat = 3 if size < 1_000_000 else 1
+            validate, (valid, rejected, _) = timed(schema.split, df, repeat=repeat)
+            line = f"{size:>10,} {label:<6} {len(rejected):>9,} {validate * 1000:>12.1f}"
+            for engine, predictor in predictors.items():
+                score, _ = timed(predictor.predict_arrays, valid, repeat=repeat)
+                line += f" {score * 1000:>17.1f} {validate / (validate + score):>6.1%}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Pure-NumPy inference for the trained gradient boosting model.
+
+`export_model` flattens every tree of the fitted GradientBoostingRegressor
+into contiguous node arrays (feature, threshold, children, value) and stores
+them together with the scaler statistics and label encoder vocabularies in a
+single .npz file. `load_compiled` returns drop-in replacements for the model,
+scaler and label encoders used by StudentPerformancePredictor, so serving
+never has to import scikit-learn.
+
+Run `python compiled_model.py` to (re)export from the .pkl artifacts.
+"""
+import numpy as np
+
+COMPILED_MODEL_PATH = "final_gradient_boosting_model.npz"
+
+# Rows evaluated per step; keeps the (rows x trees) node-index scratch array
+# small enough to stay in cache
+CHUNK_SIZE = 2048
+
+
+def check_finite(X):
+    # sklearn's tree models reject NaN and infinite inputs; do the same
+    # rather than route them down one side of every split
+    finite = np.isfinite(X).all(axis=1)
+    if not finite.all():
+        rows = np.flatnonzero(~finite)
+        raise ValueError(f"Input X contains NaN or infinity in {len(rows)} row(s), first at row {rows[0]}")
+
+
+class CompiledEnsemble:
+    def __init__(self, feature, threshold, left, right, value, roots, depth, init, feature_names, children=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.depth = int(depth)
+        self.init = float(init)
+        self.feature_names = list(feature_names)
+        self._path_contributions = None
+        # Interleaved [left, right] pairs so the next node is one gather;
+        # a prebuilt (e.g. memory-mapped) array is used as-is
+        if children is None:
+            children = np.stack([left, right], axis=1).ravel()
+        self.children = children
+        self.left = children[0::2]
+        self.right = children[1::2]
+
+    @classmethod
+    def from_sklearn(cls, model):
+        # Only single-output regression (one tree per stage) is supported
+        trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        feature, threshold, left, right, value = [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            # Leaves point at themselves so every row can take exactly
+            # `depth` steps regardless of where its path ends
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            # Fold the learning rate in, as sklearn applies it per stage
+            value.append(model.learning_rate * tree.value[:, 0, 0])
+
+        return cls(
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.intp),
+            right=np.concatenate(right).astype(np.intp),
+            value=np.concatenate(value).astype(np.float64),
+            roots=offsets.astype(np.intp),
+            depth=max(tree.max_depth for tree in trees),
+            init=model.init_.constant_.ravel()[0],
+            feature_names=model.feature_names_in_,
+        )
+
+    def apply(self, X):
+        # Leaf index of every row in every tree, shape (n_rows, n_trees)
+        X = np.ascontiguousarray(X)
+        check_finite(X)
+        flat = X.ravel()
+        row_offsets = (np.arange(X.shape[0]) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.shape[0])).copy()
+        for _ in range(self.depth):
+            go_right = ~(flat.take(row_offsets + self.feature.take(nodes)) <= self.threshold.take(nodes))
+            nodes = self.children.take(nodes * 2 + go_right)
+        return nodes
+
+    def path_contributions(self):
+        # (n_features, n_nodes): what the path from its tree's root to each
+        # node credits to every feature. Each split a row passes through
+        # credits the change in node value to the split's feature (Saabas).
+        if self._path_contributions is None:
+            table = np.zeros((len(self.value), len(self.feature_names)))
+            frontier = self.roots
+            for _ in range(self.depth):
+                children = self.children.take(frontier * 2 + np.array([[0], [1]])).ravel()
+                parents = np.tile(frontier, 2)
+                # Leaves point at themselves and have nothing below them
+                split = children != parents
+                parents, children = parents[split], children[split]
+                table[children] = table[parents]
+                table[children, self.feature.take(parents)] += self.value.take(children) - self.value.take(parents)
+                frontier = children
+            self._path_contributions = np.ascontiguousarray(table.T)
+        return self._path_contributions
+
+    def contributions(self, X):
+        # Returns (bias, contributions) with bias + contributions.sum(axis=1)
+        # equal to predict(X); contributions has one column per feature. A
+        # row's contribution is the sum of its leaves' path contributions,
+        # so this costs one apply() plus a gather per feature.
+        if hasattr(X, "columns"):
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=np.float32)
+        table = self.path_contributions()
+        # Features the trees never split on always contribute 0
+        used = np.flatnonzero(np.abs(table).sum(axis=1))
+        out = np.zeros((X.shape[0], len(self.feature_names)))
+        for start in range(0, X.shape[0], CHUNK_SIZE):
+            leaves = self.apply(X[start:start + CHUNK_SIZE])
+            for feature in used:
+                out[start:start + CHUNK_SIZE, feature] = table[feature].take(leaves).sum(axis=1)
+        return self.init + self.value.take(self.roots).sum(), out
+
+    def predict(self, X):
+        if hasattr(X, "columns"):
+            X = X[self.feature_names]
+        # sklearn evaluates splits on float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], CHUNK_SIZE):
+            chunk = X[start:start + CHUNK_SIZE]
+            out[start:start + CHUNK_SIZE] = self.init + self.value.take(self.apply(chunk)).sum(axis=1)
+        return out
+
+
+class CompiledScaler:
+    def __init__(self, mean, scale):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X):
+        # Same operation order as StandardScaler.transform
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+
+class CompiledLabelEncoder:
+    def __init__(self, classes):
+        self.classes_ = classes
+
+    def transform(self, y):
+        y = np.asarray(y).astype(str)
+        codes = np.searchsorted(self.classes_, y)
+        found = self.classes_[np.minimum(codes, len(self.classes_) - 1)] == y
+        if not found.all():
+            raise ValueError(f"y contains previously unseen labels: {sorted(set(y[~found]))}")
+        return codes
+
+
+def export_model(model, scaler, label_encoders, path=COMPILED_MODEL_PATH):
+    ensemble = CompiledEnsemble.from_sklearn(model)
+    arrays = {
+        "feature": ensemble.feature,
+        "threshold": ensemble.threshold,
+        "left": ensemble.left,
+        "right": ensemble.right,
+        "value": ensemble.value,
+        "roots": ensemble.roots,
+        "depth": np.array(ensemble.depth),
+        "init": np.array(ensemble.init),
+        "feature_names": np.array(ensemble.feature_names),
+        "scaler_mean": scaler.mean_,
+        "scaler_scale": scaler.scale_,
+        "categorical_columns": np.array(list(label_encoders)),
+    }
+    for col, encoder in label_encoders.items():
+        arrays[f"classes_{col}"] = np.asarray(encoder.classes_).astype(str)
+    np.savez(path, **arrays)
+    return ensemble
+
+
+def load_compiled(path=COMPILED_MODEL_PATH):
+    # Returns (model, scaler, label_encoders) with the sklearn call signatures
+    with np.load(path) as data:
+        model = CompiledEnsemble(
+            feature=data["feature"],
+            threshold=data["threshold"],
+            left=data["left"],
+            right=data["right"],
+            value=data["value"],
+            roots=data["roots"],
+            depth=data["depth"],
+            init=data["init"],
+            feature_names=data["feature_names"],
+        )
+        scaler = CompiledScaler(data["scaler_mean"], data["scaler_scale"])
+        label_encoders = {
+            col: CompiledLabelEncoder(data[f"classes_{col}"])
+            for col in data["categorical_columns"].tolist()
+        }
+    return model, scaler, label_encoders
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    from predict import StudentPerformancePredictor
+
+    predictor = StudentPerformancePredictor()
+    ensemble = export_model(predictor.model, predictor.scaler, predictor.label_encoders)
+
+    # Verify against sklearn on the bundled dataset
+    processed = predictor.preprocess_batch(pd.read_csv("student_performance.csv"))
+    expected = predictor.model.predict(processed)
+    actual = ensemble.predict(processed)
+    print(f"Exported {len(ensemble.roots)} trees / {len(ensemble.value)} nodes to {COMPILED_MODEL_PATH}")
+    print(f"Max abs difference vs sklearn: {np.abs(expected - actual).max():.3e}")
@@ -0,0 +1,175 @@
+"""Counterfactual "what-if" search for at-risk students.
+
+For every student predicted below the at-risk threshold, finds the
+smallest increase in the actionable inputs (hours studied, attendance,
+tutoring sessions) that lifts the predicted score to the threshold. Each
+input moves in fixed steps up to a budget and an upper bound; a
+candidate's cost is the weighted number of steps it takes. Of the
+candidates that clear the threshold, the cheapest wins, then the highest
+score.
+
+Candidates are scored for many students at once: the students' encoded
+rows are repeated once per candidate, shifted by the candidate's deltas
+and sent through one transform + predict. Candidates go in tiers of
+increasing cost and students drop out once a tier clears them, so a whole
+roster takes a few dozen large vectorized calls.
+
+    python counterfactuals.py roster.csv plans.csv --hours-step 2 --hours-budget 12
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from predict import AT_RISK_THRESHOLD, FEATURE_COLUMNS
+
+# Actionable inputs: step size, largest total increase, upper bound of the
+# input's range (as the form enters them) and the cost of one step. For a
+# "percentage" input, rows whose value is above 1 are on the CSV's 0-100
+# scale rather than the form's 0-1 rate, and get step, budget and upper
+# bound multiplied by 100.
+ACTIONS = {
+    "Hours_Studied": {"step": 1, "budget": 10, "upper": 40, "weight": 1.0},
+    "Attendance": {"step": 0.05, "budget": 0.3, "upper": 1.0, "weight": 1.0, "percentage": True},
+    "Tutoring_Sessions": {"step": 1, "budget": 4, "upper": 10, "weight": 1.0},
+}
+
+# Rows (students x candidates) scored per predict call
+ROWS_PER_CALL = 200_000
+
+# Candidates per cost tier; students resolved in a tier skip the rest
+TIER_SIZE = 32
+
+
+def candidate_grid(actions=ACTIONS, max_cost=None):
+    # (deltas, costs): every combination of whole steps within the budgets,
+    # cheapest first; deltas has one column per action, in raw units
+    steps = [np.arange(int(round(spec["budget"] / spec["step"])) + 1) for spec in actions.values()]
+    counts = np.stack([grid.ravel() for grid in np.meshgrid(*steps, indexing="ij")], axis=1)
+    costs = counts @ np.array([spec["weight"] for spec in actions.values()], dtype=float)
+    keep = costs <= max_cost if max_cost is not None else np.ones(len(costs), dtype=bool)
+    order = np.argsort(costs[keep], kind="stable")
+    deltas = counts[keep][order] * np.array([spec["step"] for spec in actions.values()], dtype=float)
+    return deltas, costs[keep][order]
+
+
+def cost_tiers(costs, min_size=TIER_SIZE):
+    # Slices of the cost-sorted candidates, each at least min_size long and
+    # never splitting candidates of equal cost
+    tiers, start = [], 0
+    while start < len(costs):
+        stop = min(start + min_size, len(costs))
+        while stop < len(costs) and costs[stop] == costs[stop - 1]:
+            stop += 1
+        tiers.append(slice(start, stop))
+        start = stop
+    return tiers
+
+
+def action_scales(encoded, columns, actions=ACTIONS):
+    # (rows, actions) multipliers from an action's form units to each row's
+    # units: 100 for percentage inputs recorded on the 0-100 scale, else 1
+    scales = np.ones((len(encoded), len(actions)))
+    for i, spec in enumerate(actions.values()):
+        if spec.get("percentage"):
+            scales[:, i] = np.where(encoded[:, columns[i]] > 1, 100.0, 1.0)
+    return scales
+
+
+def search(predictor, instances, actions=ACTIONS, max_cost=None, threshold=AT_RISK_THRESHOLD,
+           rows_per_call=ROWS_PER_CALL, tier_size=TIER_SIZE):
+    # One row per instance: its predicted score and, for at-risk students, the
+    # cheapest change found (Found is False when none clears the threshold
+    # within the budgets). Students already above the threshold get no change.
+    # Changes are in each row's own units (percentage points for attendance
+    # recorded on the 0-100 scale).
+    encoded = predictor.encode(instances)
+    scores = predictor.score_encoded(encoded)
+    deltas, costs = candidate_grid(actions, max_cost)
+    columns = [FEATURE_COLUMNS.index(col) for col in actions]
+    upper = np.array([spec["upper"] for spec in actions.values()], dtype=float)
+    scales = action_scales(encoded, columns, actions)
+
+    best_delta = np.zeros((len(scores), len(actions)))
+    best_score = scores.copy()
+    best_cost = np.zeros(len(scores))
+    found = scores >= threshold
+
+    # Cheap candidates first: a student whose plan turns up in one tier is
+    # done, since every later tier costs more
+    for tier in cost_tiers(costs, tier_size):
+        tier_deltas, tier_costs = deltas[tier], costs[tier]
+        remaining = np.flatnonzero(~found)
+        per_call = max(1, rows_per_call // len(tier_deltas))
+        for start in range(0, len(remaining), per_call):
+            rows = remaining[start:start + per_call]
+            # (students, candidates, inputs) expanded to one encoded row per pair
+            current = encoded[rows][:, columns]
+            row_scales = scales[rows][:, None, :]
+            # Rounded so 3 x 0.05 x 100 is 15, not 15.000000000000002
+            row_deltas = np.round(tier_deltas[None, :, :] * row_scales, 10)
+            shifted = current[:, None, :] + row_deltas
+            candidates = np.repeat(encoded[rows], len(tier_deltas), axis=0)
+            candidates[:, columns] = shifted.reshape(-1, len(actions))
+            candidate_scores = predictor.score_encoded(candidates).reshape(len(rows), -1)
+
+            # A step may not push an input past its range, unless it already was
+            valid = (shifted <= np.maximum(upper * row_scales, current[:, None, :]) + 1e-9).all(axis=2)
+            clears = valid & (candidate_scores >= threshold)
+            # Cheapest clearing candidate; among equal costs the highest score
+            any_clears = clears.any(axis=1)
+            cheapest = np.where(clears, tier_costs[None, :], np.inf).min(axis=1)
+            ranked = np.where(clears & (tier_costs[None, :] == cheapest[:, None]), candidate_scores, -np.inf)
+            chosen = ranked.argmax(axis=1)[any_clears]
+
+            hit = rows[any_clears]
+            found[hit] = True
+            best_delta[hit] = row_deltas[any_clears, chosen]
+            best_score[hit] = candidate_scores[any_clears, chosen]
+            best_cost[hit] = tier_costs[chosen]
+
+    result = pd.DataFrame({"Predicted_Score": scores, "At_Risk": (scores < threshold).astype(int), "Found": found})
+    for i, col in enumerate(actions):
+        result[f"{col}_Change"] = best_delta[:, i]
+    result["Counterfactual_Score"] = best_score
+    result["Cost"] = np.where(found, best_cost, np.nan)
+    return result
+
+
+def describe(row, actions=ACTIONS):
+    # One-line plan for a search() row, e.g. "+3 hours studied, +1 tutoring sessions"
+    changes = [
+        f"+{row[f'{col}_Change']:g} {col.replace('_', ' ').lower()}"
+        for col in actions if row[f"{col}_Change"] > 0
+    ]
+    return ", ".join(changes)
+
+
+def main():
+    from predict import StudentPerformancePredictor
+
+    parser = argparse.ArgumentParser(description="Find the smallest changes that lift at-risk students above the threshold")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--engine", choices=["sklearn", "numpy", "bundle"], default="numpy")
+    parser.add_argument("--max-cost", type=float, help="Skip candidates costing more than this many weighted steps")
+    for col, spec in ACTIONS.items():
+        flag = col.split("_")[0].lower()
+        parser.add_argument(f"--{flag}-step", type=float, default=spec["step"])
+        parser.add_argument(f"--{flag}-budget", type=float, default=spec["budget"], help=f"Largest increase in {col}")
+        parser.add_argument(f"--{flag}-weight", type=float, default=spec["weight"], help="Cost of one step")
+    args = parser.parse_args()
+
+    actions = {
+        col: dict(spec, **{key: getattr(args, f"{col.split('_')[0].lower()}_{key}") for key in ("step", "budget", "weight")})
+        for col, spec in ACTIONS.items()
+    }
+    df = pd.read_csv(args.input)
+    result = search(StudentPerformancePredictor(engine=args.engine), df[FEATURE_COLUMNS], actions, args.max_cost)
+    pd.concat([df.reset_index(drop=True), result], axis=1).to_csv(args.output, index=False)
+    at_risk = result["At_Risk"] == 1
+    print(f"{at_risk.sum():,} at-risk students, {(result['Found'] & at_risk).sum():,} with a plan within budget")
+
+
+if __name__ == "__main__":
+    main()
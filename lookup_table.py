@@ -0,0 +1,223 @@
+"""Precomputed prediction table for the form's discrete input grid.
+
+The individual-prediction form only produces a small, enumerable set of
+inputs: whole hours, attendance in 0.01 steps, whole prior scores, whole
+tutoring sessions and 27 categorical combinations. `build` scores every grid
+point once and stores the quantized scores in a memory-mapped .npy array;
+LookupTablePredictor answers on-grid requests by direct indexing and falls
+back to the model for everything else.
+
+    python lookup_table.py --dtype uint8
+    python lookup_table.py --attendance 0:1:0.05 --scores 0:100:5   # coarser grid
+
+Scores read from the table differ from the model by at most the reported
+worst-case error. Cells that close to the at-risk threshold are always
+re-scored by the model, so at-risk flags and recommendations are exact.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import time
+
+import numpy as np
+
+import metrics
+from predict import (
+    AT_RISK_THRESHOLD, CATEGORICAL_COLUMNS, FEATURE_COLUMNS, RECOMMENDATIONS,
+    StudentPerformancePredictor, classify, to_records,
+)
+
+TABLE_PATH = "prediction_table.npy"
+METADATA_PATH = "prediction_table.json"
+
+# (start, stop, step) per numeric input, both ends inclusive; matches the form
+DEFAULT_GRID = {
+    "Hours_Studied": (0, 40, 1),
+    "Attendance": (0.0, 1.0, 0.01),
+    "Previous_Scores": (0, 100, 1),
+    "Tutoring_Sessions": (0, 10, 1),
+}
+GRID_COLUMNS = list(DEFAULT_GRID)
+
+MODEL_ARTIFACTS = ["final_gradient_boosting_model.pkl", "final_scaler.pkl", "final_label_encoders.pkl"]
+
+
+def grid_values(start, stop, step):
+    # Rounded so that form values like 0.9 compare equal to their grid point
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + np.arange(count) * step, 10)
+
+
+def model_fingerprint():
+    digest = hashlib.sha256()
+    for path in MODEL_ARTIFACTS:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def is_current(metadata_path=METADATA_PATH):
+    # Whether the table was built for the model artifacts now on disk
+    with open(metadata_path) as f:
+        return json.load(f)["model_sha256"] == model_fingerprint()
+
+
+def score_bounds(model):
+    # Exact range of the ensemble's output: init plus each tree's extreme leaves
+    low = high = float(model.init_.constant_.ravel()[0])
+    for estimator in model.estimators_[:, 0]:
+        tree = estimator.tree_
+        leaves = tree.value[tree.children_left == -1, 0, 0] * model.learning_rate
+        low += leaves.min()
+        high += leaves.max()
+    return low, high
+
+
+def build(grid=None, dtype="uint8", table_path=TABLE_PATH, metadata_path=METADATA_PATH):
+    grid = grid or DEFAULT_GRID
+    start_time = time.perf_counter()
+    predictor = StudentPerformancePredictor()
+    values = {col: grid_values(*grid[col]) for col in GRID_COLUMNS}
+    classes = {col: len(predictor.label_encoders[col].classes_) for col in CATEGORICAL_COLUMNS}
+    combos = list(itertools.product(*(range(classes[col]) for col in CATEGORICAL_COLUMNS)))
+    shape = (len(combos), *(len(values[col]) for col in GRID_COLUMNS))
+
+    if dtype == "uint8":
+        low, high = score_bounds(predictor.model)
+        scale = (high - low) / 255
+    else:
+        low, scale = 0.0, 1.0
+
+    table = np.lib.format.open_memmap(table_path, mode="w+", dtype=dtype, shape=shape)
+    # One block per (combo, hours) pair: every attendance x score x tutoring point
+    rest = np.meshgrid(*(values[col] for col in GRID_COLUMNS[1:]), indexing="ij")
+    block = np.empty((rest[0].size, len(FEATURE_COLUMNS)))
+    for col, grid_column in zip(GRID_COLUMNS[1:], rest):
+        block[:, FEATURE_COLUMNS.index(col)] = grid_column.ravel()
+
+    max_error = 0.0
+    for combo_index, combo in enumerate(combos):
+        for col, code in zip(CATEGORICAL_COLUMNS, combo):
+            block[:, FEATURE_COLUMNS.index(col)] = code
+        for hours_index, hours in enumerate(values["Hours_Studied"]):
+            block[:, FEATURE_COLUMNS.index("Hours_Studied")] = hours
+            scores = predictor.score_encoded(block)
+            if dtype == "uint8":
+                stored = np.clip(np.rint((scores - low) / scale), 0, 255).astype(np.uint8)
+            else:
+                stored = scores.astype(dtype)
+            max_error = max(max_error, float(np.abs(stored * scale + low - scores).max()))
+            table[combo_index, hours_index] = stored.reshape(shape[2:])
+    table.flush()
+
+    metadata = {
+        "grid": {col: list(grid[col]) for col in GRID_COLUMNS},
+        "categorical_columns": CATEGORICAL_COLUMNS,
+        "dtype": dtype,
+        "offset": low,
+        "scale": scale,
+        "max_error": max_error,
+        "model_sha256": model_fingerprint(),
+        "build_seconds": time.perf_counter() - start_time,
+    }
+    with open(metadata_path, "w") as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+
+class LookupTablePredictor:
+    """StudentPerformancePredictor interface backed by the precomputed table."""
+
+    def __init__(self, predictor=None, table_path=TABLE_PATH, metadata_path=METADATA_PATH):
+        self.predictor = predictor or StudentPerformancePredictor()
+        with open(metadata_path) as f:
+            self.metadata = json.load(f)
+        if self.metadata["model_sha256"] != model_fingerprint():
+            raise ValueError(f"{table_path} was built for a different model; rebuild it with lookup_table.py")
+        self.table = np.load(table_path, mmap_mode="r")
+        self.grid = {col: grid_values(*self.metadata["grid"][col]) for col in GRID_COLUMNS}
+        self.offset = self.metadata["offset"]
+        self.scale = self.metadata["scale"]
+        self.max_error = self.metadata["max_error"]
+        # Mixed-radix weights turning the categorical codes into a combo index
+        sizes = [len(self.predictor.label_encoders[col].classes_) for col in CATEGORICAL_COLUMNS]
+        self.combo_weights = np.cumprod([1] + sizes[:0:-1])[::-1]
+        self.hits = 0
+        self.fallbacks = 0
+
+    def locate(self, encoded):
+        # Table index per row plus a mask of rows that sit exactly on the grid
+        on_grid = np.ones(encoded.shape[0], dtype=bool)
+        index = [sum(encoded[:, FEATURE_COLUMNS.index(col)].astype(np.intp) * weight
+                     for col, weight in zip(CATEGORICAL_COLUMNS, self.combo_weights))]
+        for col in GRID_COLUMNS:
+            values = encoded[:, FEATURE_COLUMNS.index(col)]
+            start, _, step = self.metadata["grid"][col]
+            with np.errstate(invalid="ignore"):
+                position = np.rint((values - start) / step)
+            position = np.clip(np.nan_to_num(position), 0, len(self.grid[col]) - 1).astype(np.intp)
+            on_grid &= self.grid[col][position] == values
+            index.append(position)
+        return tuple(index), on_grid
+
+    def predict_arrays(self, instances):
+        if len(instances) == 0:
+            return self.predictor.predict_arrays(instances)
+        try:
+            encoded = self.predictor.encode(instances)
+            X = self.predictor.transform_encoded(encoded)
+
+            with metrics.stage("lookup"):
+                index, on_grid = self.locate(encoded)
+                scores = self.table[index].astype(np.float64) * self.scale + self.offset
+                # Off-grid rows, and rows whose quantized score can't settle the
+                # at-risk flag, go to the model
+                fallback = ~on_grid | (np.abs(scores - AT_RISK_THRESHOLD) <= self.max_error)
+            if fallback.any():
+                scores[fallback] = self.predictor.score_encoded(encoded[fallback])
+            self.fallbacks += int(fallback.sum())
+            self.hits += int((~fallback).sum())
+
+            with metrics.stage("recommend"):
+                at_risk, codes = classify(X, scores)
+        except Exception:
+            metrics.record_error()
+            raise
+        metrics.record_batch(at_risk)
+        return scores, at_risk, RECOMMENDATIONS[codes]
+
+    def predict(self, instances, **kwargs):
+        scored = self.predict_arrays(instances)
+        with metrics.stage("records"):
+            return to_records(*scored)
+
+
+def parse_range(text):
+    start, stop, step = (float(part) for part in text.split(":"))
+    return start, stop, step
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute predictions over the form's input grid")
+    parser.add_argument("--hours", type=parse_range, help="start:stop:step (default 0:40:1)")
+    parser.add_argument("--attendance", type=parse_range, help="start:stop:step (default 0:1:0.01)")
+    parser.add_argument("--scores", type=parse_range, help="start:stop:step for Previous_Scores (default 0:100:1)")
+    parser.add_argument("--tutoring", type=parse_range, help="start:stop:step (default 0:10:1)")
+    parser.add_argument("--dtype", choices=["uint8", "float16"], default="uint8")
+    args = parser.parse_args()
+
+    grid = dict(DEFAULT_GRID)
+    for col, override in zip(GRID_COLUMNS, [args.hours, args.attendance, args.scores, args.tutoring]):
+        if override is not None:
+            grid[col] = override
+
+    metadata = build(grid, dtype=args.dtype)
+    table = np.load(TABLE_PATH, mmap_mode="r")
+    print(f"Table {table.shape} {table.dtype}: {table.size:,} cells, {table.nbytes / 1e6:.1f} MB")
+    print(f"Worst-case score error: {metadata['max_error']:.4f}")
+    print(f"Built in {metadata['build_seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Per-stage timings and counters for the prediction pipeline.
+
+Collection is off by default and costs one flag check per stage when off.
+Turn it on with STUDENT_METRICS=1, `server.py --metrics`, the app's sidebar
+toggle, or enable(). Timings are aggregated into fixed-bucket histograms and
+exported in the Prometheus text format by `exposition()` (served at
+GET /metrics by server.py); `summary()` gives the same data as rows for
+display.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Pipeline stages, in execution order
+STAGES = ["columns", "encode", "scale", "features", "frame", "inference", "lookup", "recommend", "records"]
+
+# Histogram upper bounds in seconds (10us .. 10s); +Inf is implicit
+BUCKETS = [
+    1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+    1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+]
+
+COUNTERS = {
+    "rows": "Student records scored",
+    "batches": "Predict calls",
+    "errors": "Predict calls that raised",
+    "at_risk_rows": "Records predicted below the at-risk threshold",
+}
+
+enabled = os.environ.get("STUDENT_METRICS", "") not in ("", "0")
+
+_NOT_TIMED = nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return float("nan")
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + [float("inf")], self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self.counters[name] += amount
+
+
+REGISTRY = Registry()
+
+
+class _Timer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        REGISTRY.observe(self.stage, time.perf_counter() - self.start)
+
+
+def stage(name):
+    # Context manager timing one pipeline stage; a shared no-op when disabled
+    return _Timer(name) if enabled else _NOT_TIMED
+
+
+def record_batch(at_risk):
+    # at_risk: the batch's 0/1 at-risk flags
+    if enabled:
+        REGISTRY.increment(rows=len(at_risk), batches=1, at_risk_rows=int(at_risk.sum()))
+
+
+def record_error():
+    if enabled:
+        REGISTRY.increment(batches=1, errors=1)
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def _ordered_stages():
+    known = [name for name in STAGES if name in REGISTRY.stages]
+    return known + sorted(set(REGISTRY.stages) - set(STAGES))
+
+
+def exposition():
+    # Prometheus text format (version 0.0.4)
+    lines = [
+        "# HELP student_predict_stage_seconds Time spent in each prediction pipeline stage",
+        "# TYPE student_predict_stage_seconds histogram",
+    ]
+    with REGISTRY._lock:
+        for name in _ordered_stages():
+            histogram = REGISTRY.stages[name]
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + ["+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f'student_predict_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'student_predict_stage_seconds_sum{{stage="{name}"}} {histogram.total!r}')
+            lines.append(f'student_predict_stage_seconds_count{{stage="{name}"}} {histogram.count}')
+        counters = dict(REGISTRY.counters)
+    for name, help_text in COUNTERS.items():
+        lines.append(f"# HELP student_predict_{name}_total {help_text}")
+        lines.append(f"# TYPE student_predict_{name}_total counter")
+        lines.append(f"student_predict_{name}_total {counters[name]}")
+    lines.append("# HELP student_predict_at_risk_ratio Share of scored records flagged at risk")
+    lines.append("# TYPE student_predict_at_risk_ratio gauge")
+    lines.append(f"student_predict_at_risk_ratio {at_risk_ratio(counters)!r}")
+    return "\n".join(lines) + "\n"
+
+
+def at_risk_ratio(counters=None):
+    counters = counters or REGISTRY.counters
+    return counters["at_risk_rows"] / counters["rows"] if counters["rows"] else 0.0
+
+
+def summary():
+    # One dict per stage: calls, total/mean time and bucket-resolution p50/p99
+    with REGISTRY._lock:
+        return [
+            {
+                "stage": name,
+                "calls": histogram.count,
+                "total_ms": histogram.total * 1000,
+                "mean_ms": histogram.total / histogram.count * 1000,
+                "p50_ms": histogram.quantile(0.5) * 1000,
+                "p99_ms": histogram.quantile(0.99) * 1000,
+            }
+            for name, histogram in ((name, REGISTRY.stages[name]) for name in _ordered_stages())
+        ]
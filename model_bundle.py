@@ -0,0 +1,167 @@
+"""Single-file, memory-mappable model bundle.
+
+One file replaces the three .pkl artifacts: the flattened trees of the
+gradient boosting model (see compiled_model.py), the scaler statistics, the
+label encoder vocabularies, the model's feature order and a SHA-256 checksum
+of the array payload. Layout:
+
+    8 bytes   magic b"STUDBNDL"
+    8 bytes   header length (little-endian uint64)
+    header    UTF-8 JSON: format and model version, feature order,
+              vocabularies, scalars, and dtype/shape/offset per array
+    payload   raw little-endian arrays, each aligned to 64 bytes
+
+`load_bundle` maps the file read-only and the arrays are views into the
+mapping, so worker processes loading the same bundle share one copy of the
+model in the page cache instead of each unpickling its own. Writes go to a
+temporary file that is renamed into place, so workers that already mapped
+the old bundle keep reading it intact.
+
+    python model_bundle.py                       # export from the .pkl artifacts
+    python model_bundle.py --output-dir models   # ... into another directory
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from compiled_model import CompiledEnsemble, CompiledLabelEncoder, CompiledScaler
+
+BUNDLE_PATH = "final_gradient_boosting_model.bundle"
+MAGIC = b"STUDBNDL"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Arrays stored in the payload; everything else lives in the JSON header
+ARRAY_NAMES = ["feature", "threshold", "children", "value", "roots", "scaler_mean", "scaler_scale"]
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_bundle(model, scaler, label_encoders, path=BUNDLE_PATH):
+    # model: fitted GradientBoostingRegressor; returns the bundle header
+    ensemble = CompiledEnsemble.from_sklearn(model)
+    arrays = {
+        "feature": ensemble.feature.astype("<i8"),
+        "threshold": ensemble.threshold.astype("<f8"),
+        "children": ensemble.children.astype("<i8"),
+        "value": ensemble.value.astype("<f8"),
+        "roots": ensemble.roots.astype("<i8"),
+        "scaler_mean": np.asarray(scaler.mean_, dtype="<f8"),
+        "scaler_scale": np.asarray(scaler.scale_, dtype="<f8"),
+    }
+    layout, offset = {}, 0
+    for name in ARRAY_NAMES:
+        offset = _aligned(offset)
+        layout[name] = {"dtype": arrays[name].dtype.str, "shape": list(arrays[name].shape), "offset": offset}
+        offset += arrays[name].nbytes
+    payload = bytearray(offset)
+    for name in ARRAY_NAMES:
+        start = layout[name]["offset"]
+        payload[start:start + arrays[name].nbytes] = arrays[name].tobytes()
+    checksum = hashlib.sha256(payload).hexdigest()
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        # Content-addressed, so identical models get identical versions
+        "model_version": checksum[:16],
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "feature_names": list(ensemble.feature_names),
+        "depth": ensemble.depth,
+        "init": ensemble.init,
+        "encoders": {col: np.asarray(encoder.classes_).astype(str).tolist() for col, encoder in label_encoders.items()},
+        "arrays": layout,
+        "checksum": checksum,
+    }
+    encoded = json.dumps(header).encode()
+    # Pad the header so the payload (and every array in it) starts aligned
+    start = _aligned(len(MAGIC) + 8 + len(encoded))
+    encoded += b" " * (start - len(MAGIC) - 8 - len(encoded))
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(encoded)) + encoded)
+        f.write(payload)
+    os.replace(temporary, path)
+    return header
+
+
+def read_header(buffer):
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a model bundle (bad magic bytes)")
+    (length,) = struct.unpack("<Q", buffer[len(MAGIC):len(MAGIC) + 8])
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[start:start + length]))
+    if header["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format version {header['format_version']} (expected {FORMAT_VERSION})")
+    return header, start + length
+
+
+def load_bundle(path=BUNDLE_PATH, verify=True):
+    # Returns (model, scaler, label_encoders, header); the model and scaler
+    # arrays are read-only views into a shared mapping of the file
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header, payload_start = read_header(buffer)
+    if verify:
+        digest = hashlib.sha256(memoryview(buffer)[payload_start:]).hexdigest()
+        if digest != header["checksum"]:
+            raise ValueError(f"{path} is corrupt: checksum mismatch")
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arrays[name] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=payload_start + spec["offset"]
+        ).reshape(spec["shape"])
+
+    model = CompiledEnsemble(
+        feature=arrays["feature"],
+        threshold=arrays["threshold"],
+        left=None,
+        right=None,
+        value=arrays["value"],
+        roots=arrays["roots"],
+        depth=header["depth"],
+        init=header["init"],
+        feature_names=header["feature_names"],
+        children=arrays["children"],
+    )
+    scaler = CompiledScaler(arrays["scaler_mean"], arrays["scaler_scale"])
+    label_encoders = {
+        col: CompiledLabelEncoder(np.array(classes)) for col, classes in header["encoders"].items()
+    }
+    return model, scaler, label_encoders, header
+
+
+def export_from_pickles(model_dir=".", output_dir=None):
+    import joblib
+
+    output_dir = output_dir or model_dir
+    model = joblib.load(os.path.join(model_dir, "final_gradient_boosting_model.pkl"))
+    scaler = joblib.load(os.path.join(model_dir, "final_scaler.pkl"))
+    label_encoders = joblib.load(os.path.join(model_dir, "final_label_encoders.pkl"))
+    return write_bundle(model, scaler, label_encoders, os.path.join(output_dir, BUNDLE_PATH))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the .pkl artifacts as one memory-mappable bundle")
+    parser.add_argument("--model-dir", default=".", help="Directory holding the .pkl artifacts")
+    parser.add_argument("--output-dir", help="Where to write the bundle (default: --model-dir)")
+    args = parser.parse_args()
+
+    header = export_from_pickles(args.model_dir, args.output_dir)
+    path = os.path.join(args.output_dir or args.model_dir, BUNDLE_PATH)
+    print(f"Wrote {path} ({os.path.getsize(path) / 1e3:.1f} KB), model version {header['model_version']}")
+
+
+if __name__ == "__main__":
+    main()
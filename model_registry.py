@@ -0,0 +1,113 @@
+"""Process-wide registry of loaded predictors.
+
+Streamlit re-executes app.py on every widget interaction, but imported
+modules survive between reruns, so a predictor kept here is loaded once per
+process and shared by every session. Entries are keyed by engine and are
+reloaded automatically when any of the model artifacts on disk is replaced.
+
+This module deliberately imports nothing heavy; pandas, joblib and the model
+itself are only pulled in the first time a predictor is requested.
+"""
+import os
+import threading
+import warnings
+
+# Files each engine loads; their mtimes act as the model version
+ARTIFACT_PATHS = {
+    "sklearn": (
+        "final_gradient_boosting_model.pkl",
+        "final_scaler.pkl",
+        "final_label_encoders.pkl",
+    ),
+    "numpy": ("final_gradient_boosting_model.npz",),
+    "bundle": ("final_gradient_boosting_model.bundle",),
+    "hist": (
+        "final_hist_gradient_boosting_model.pkl",
+        "final_hist_gradient_boosting_categories.json",
+        "final_scaler.pkl",
+    ),
+    "lookup": (
+        "final_gradient_boosting_model.pkl",
+        "final_scaler.pkl",
+        "final_label_encoders.pkl",
+        "prediction_table.npy",
+        "prediction_table.json",
+    ),
+}
+
+_lock = threading.Lock()
+_predictors = {}
+_cached_predictors = {}
+_batchers = {}
+# Whether the lookup table matches the model, per lookup artifact version
+_lookup_current = {}
+
+
+def default_engine():
+    # The precomputed table answers form inputs in O(1) once it has been
+    # built with lookup_table.py for the current model; otherwise score with
+    # the model directly. The model is fingerprinted once per artifact version.
+    if all(os.path.exists(path) for path in ARTIFACT_PATHS["lookup"]):
+        version = artifact_version("lookup")
+        if version not in _lookup_current:
+            from lookup_table import METADATA_PATH, is_current
+            _lookup_current.clear()
+            _lookup_current[version] = is_current()
+            if not _lookup_current[version]:
+                warnings.warn(f"{METADATA_PATH} was built for a different model; scoring with the model "
+                              "until the table is rebuilt with lookup_table.py")
+        if _lookup_current[version]:
+            return "lookup"
+    return "sklearn"
+
+
+def artifact_version(engine="sklearn"):
+    return tuple(os.stat(path).st_mtime_ns for path in ARTIFACT_PATHS[engine])
+
+
+def get_predictor(engine="sklearn"):
+    version = artifact_version(engine)
+    with _lock:
+        cached = _predictors.get(engine)
+        if cached is None or cached[0] != version:
+            if engine == "lookup":
+                from lookup_table import LookupTablePredictor
+                predictor = LookupTablePredictor()
+            else:
+                from predict import StudentPerformancePredictor
+                predictor = StudentPerformancePredictor(engine=engine)
+            cached = (version, predictor)
+            _predictors[engine] = cached
+        return cached[1]
+
+
+def get_cached_predictor(engine="sklearn", **cache_options):
+    # Shared LRU-backed predictor; cache_options (maxsize, ttl) only apply
+    # when the first caller creates it
+    with _lock:
+        if engine not in _cached_predictors:
+            from prediction_cache import CachedPredictor
+            _cached_predictors[engine] = CachedPredictor(engine=engine, **cache_options)
+        return _cached_predictors[engine]
+
+
+def get_batcher(engine="sklearn", **batch_options):
+    # Shared micro-batcher that coalesces concurrent callers into one
+    # predict call; batch_options (max_batch_size, max_wait_ms, workers)
+    # only apply when the first caller creates it
+    with _lock:
+        if engine not in _batchers:
+            from batching import MicroBatcher
+            # Resolved per batch so a reloaded model is picked up
+            _batchers[engine] = MicroBatcher(lambda instances: get_predictor(engine).predict(instances), **batch_options)
+        return _batchers[engine]
+
+
+def invalidate(engine=None):
+    # Drop one engine's predictor (or all of them); the next request reloads.
+    # Cached predictors notice the new artifact version on their own
+    with _lock:
+        if engine is None:
+            _predictors.clear()
+        else:
+            _predictors.pop(engine, None)
@@ -0,0 +1,113 @@
+"""Multi-core batch scoring with a process pool.
+
+The parent encodes the input once into a float matrix and places it in
+shared memory; each worker loads the model artifacts once (pool
+initializer), attaches to the same buffers without copying, scores its
+shard and writes scores, at-risk flags and recommendation codes straight
+into shared output arrays. Shards are written in place, so results come
+back in input order.
+
+    python parallel.py student_performance.csv scored.csv --workers 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from predict import FEATURE_COLUMNS, RECOMMENDATIONS, StudentPerformancePredictor
+
+DEFAULT_SHARD_SIZE = 65536
+
+# Per-process state set up by the pool initializer
+_worker = {}
+
+
+def _init_worker(engine, model_dir, specs):
+    _worker["predictor"] = StudentPerformancePredictor(engine=engine, model_dir=model_dir)
+    # Keep the segments referenced so their buffers stay mapped; the parent
+    # owns them and unlinks them when scoring is done
+    _worker["segments"] = []
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _worker["segments"].append(shm)
+        _worker[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _score_shard(bounds):
+    start, stop = bounds
+    predictor = _worker["predictor"]
+    scores, at_risk, codes = predictor.predict_encoded(_worker["encoded"][start:stop])
+    _worker["scores"][start:stop] = scores
+    _worker["at_risk"][start:stop] = at_risk
+    _worker["codes"][start:stop] = codes
+    return stop - start
+
+
+def predict_parallel(instances, workers=None, engine="sklearn", shard_size=DEFAULT_SHARD_SIZE, predictor=None):
+    # Same return value as StudentPerformancePredictor.predict_arrays. Given
+    # a predictor, the workers load its engine and artifacts, not `engine`'s
+    predictor = predictor or StudentPerformancePredictor(engine=engine)
+    encoded = predictor.encode(instances)
+    n = encoded.shape[0]
+    if n == 0:
+        return predictor.predict_arrays(instances)
+
+    arrays = {
+        "encoded": ((n, len(FEATURE_COLUMNS)), np.float64),
+        "scores": ((n,), np.float64),
+        "at_risk": ((n,), np.int64),
+        "codes": ((n,), np.int64),
+    }
+    segments, views, specs = [], {}, {}
+    try:
+        for key, (shape, dtype) in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            segments.append(shm)
+            views[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            specs[key] = (shm.name, shape, dtype)
+        views["encoded"][:] = encoded
+        del encoded
+
+        shards = [(start, min(start + shard_size, n)) for start in range(0, n, shard_size)]
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_init_worker, initargs=(predictor.engine, predictor.model_dir, specs)) as pool:
+            for _ in pool.map(_score_shard, shards):
+                pass
+
+        return (
+            views["scores"].copy(),
+            views["at_risk"].copy(),
+            RECOMMENDATIONS[views["codes"]],
+        )
+    finally:
+        views.clear()
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+
+def main():
+    from batch_scoring import format_results
+
+    parser = argparse.ArgumentParser(description="Score a student CSV on all cores")
+    parser.add_argument("input", help="CSV with the 7 model input columns")
+    parser.add_argument("output", help="Where to write the scored CSV")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--engine", choices=["sklearn", "numpy", "bundle", "hist"], default="sklearn")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = pd.read_csv(args.input)
+    results = predict_parallel(df, workers=args.workers, engine=args.engine, shard_size=args.shard_size)
+    format_results(df, *results).to_csv(args.output, index=False)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {len(df):,} rows in {elapsed:.2f}s ({len(df) / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
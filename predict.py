@@ -1,81 +1,308 @@
-import joblib
-import pandas as pd
+import os
+
 import numpy as np
 
+import metrics
+from rules import AT_RISK_THRESHOLD, DEFAULT_RULES
+
+# Raw model inputs, in the order the scaler and model were trained on
+FEATURE_COLUMNS = [
+    "Hours_Studied", "Attendance", "Previous_Scores",
+    "Motivation_Level", "Tutoring_Sessions",
+    "Parental_Involvement", "Access_to_Resources"
+]
+CATEGORICAL_COLUMNS = ["Parental_Involvement", "Access_to_Resources", "Motivation_Level"]
+NUMERICAL_COLUMNS = ["Hours_Studied", "Attendance", "Previous_Scores", "Motivation_Level", "Tutoring_Sessions"]
+
+# Columns the model was fitted on: scaled inputs plus engineered features
+MODEL_COLUMNS = FEATURE_COLUMNS + ["Hours_Motivation", "Attendance_Impact"]
+COLUMN_INDEX = {col: i for i, col in enumerate(MODEL_COLUMNS)}
+
+# Histogram-based booster fitted on the raw inputs, with the categorical
+# columns handled natively (see train.py --backend hist)
+HIST_MODEL_PATH = "final_hist_gradient_boosting_model.pkl"
+# Categories per column the hist model was fitted on, written by train.py
+HIST_CATEGORIES_PATH = "final_hist_gradient_boosting_categories.json"
+
+# Trees, scaler and vocabularies in one memory-mappable file (model_bundle.py)
+BUNDLE_PATH = "final_gradient_boosting_model.bundle"
+
+RECOMMENDATIONS = np.array([
+    "Keep up the good work!",
+    "Increase study hours and consider tutoring.",
+    "Increase attendance and consider tutoring.",
+    "Schedule more tutoring sessions.",
+    "Focus on study habits.",
+], dtype=object)
+
+
+def column_arrays(instances):
+    # One NumPy array per raw input column from a list of dicts or a DataFrame
+    if hasattr(instances, "columns"):
+        return {col: instances[col].to_numpy() for col in FEATURE_COLUMNS}
+    return {
+        col: np.array(
+            [instance.get(col) for instance in instances],
+            dtype=object if col in CATEGORICAL_COLUMNS else float
+        )
+        for col in FEATURE_COLUMNS
+    }
+
+
+def native_frame(instances):
+    # Raw inputs as the hist model takes them: numbers as floats, categories as strings
+    import pandas as pd
+
+    columns = column_arrays(instances)
+    return pd.DataFrame({
+        col: columns[col].astype(object if col in CATEGORICAL_COLUMNS else float)
+        for col in FEATURE_COLUMNS
+    })
+
+
+def native_label_encoders(path):
+    # Label encoders over the categories the hist model saw in training,
+    # from the vocabulary file train.py saves next to the model
+    import json
+
+    from compiled_model import CompiledLabelEncoder
+
+    with open(path) as f:
+        categories = json.load(f)
+    return {col: CompiledLabelEncoder(np.array(sorted(categories[col]))) for col in CATEGORICAL_COLUMNS}
+
+
+def classify(X, predicted_scores, rules=DEFAULT_RULES, column_index=COLUMN_INDEX):
+    # At-risk flags and recommendation codes (indices into RECOMMENDATIONS)
+    # for a model-ready matrix (or any matrix laid out by column_index) and
+    # its predicted scores
+    _, at_risk, codes = rules.evaluate(X, predicted_scores, column_index)
+    return at_risk, codes
+
+
+def to_records(predicted_scores, at_risk, recommendations):
+    # The list-of-dicts shape returned by StudentPerformancePredictor.predict
+    return [
+        {
+            "predicted_exam_score": score,
+            "at_risk": risk,
+            "recommendation": recommendation
+        }
+        for score, risk, recommendation in zip(
+            predicted_scores.tolist(), at_risk.tolist(), recommendations.tolist()
+        )
+    ]
+
+
 class StudentPerformancePredictor:
-    def __init__(self):
-        # Load the trained model and preprocessors
-        self.model = joblib.load("final_gradient_boosting_model.pkl")
-        self.scaler = joblib.load("final_scaler.pkl")
-        self.label_encoders = joblib.load("final_label_encoders.pkl")
+    def __init__(self, engine="sklearn", model_dir="."):
+        self.model_dir = model_dir
+        self.model_version = None
+        if engine == "numpy":
+            # Flattened trees evaluated in NumPy; scikit-learn is never imported
+            from compiled_model import COMPILED_MODEL_PATH, load_compiled
+            self.model, self.scaler, self.label_encoders = load_compiled(self.artifact(COMPILED_MODEL_PATH))
+        elif engine == "bundle":
+            # Same NumPy trees, memory-mapped read-only and shared between
+            # processes that load the same file
+            from model_bundle import load_bundle
+            self.model, self.scaler, self.label_encoders, header = load_bundle(self.artifact(BUNDLE_PATH))
+            if header["feature_names"] != MODEL_COLUMNS:
+                raise ValueError(f"{self.artifact(BUNDLE_PATH)} expects features {header['feature_names']}, not {MODEL_COLUMNS}")
+            self.model_version = header["model_version"]
+        elif engine == "sklearn":
+            # Load the trained model and preprocessors
+            import joblib
+
+            self.model = joblib.load(self.artifact("final_gradient_boosting_model.pkl"))
+            self.scaler = joblib.load(self.artifact("final_scaler.pkl"))
+            self.label_encoders = joblib.load(self.artifact("final_label_encoders.pkl"))
+        elif engine == "hist":
+            # The model encodes categories itself; the scaler only places the
+            # recommendation thresholds
+            import joblib
+
+            self.model = joblib.load(self.artifact(HIST_MODEL_PATH))
+            self.scaler = joblib.load(self.artifact("final_scaler.pkl"))
+            self.label_encoders = native_label_encoders(self.artifact(HIST_CATEGORIES_PATH))
+        else:
+            raise ValueError(f"Unknown engine: {engine!r} (expected 'sklearn', 'numpy', 'bundle' or 'hist')")
+        self.engine = engine
+
+    def artifact(self, name):
+        return os.path.join(self.model_dir, name)
 
     def preprocess_input(self, data):
-        # Convert input dictionary to DataFrame
-        df = pd.DataFrame([data], columns=[
-            "Hours_Studied", "Attendance", "Previous_Scores",
-            "Motivation_Level", "Tutoring_Sessions",
-            "Parental_Involvement", "Access_to_Resources"
-        ])
-        
+        # Single-record wrapper kept for callers of the original API
+        return self.preprocess_batch([data])
+
+    def preprocess_batch(self, instances):
+        # Model-ready frame for a whole batch (list of dicts or a DataFrame)
+        import pandas as pd
+
+        return pd.DataFrame(self.feature_matrix(instances), columns=MODEL_COLUMNS)
+
+    def feature_matrix(self, instances):
+        # Columnar preprocessing on plain NumPy arrays, so a single record
+        # doesn't pay for building and mutating a DataFrame
+        return self.transform_encoded(self.encode(instances))
+
+    def encode(self, instances):
+        # Raw inputs as one float matrix in FEATURE_COLUMNS order, with the
+        # categorical columns replaced by their label codes
+        with metrics.stage("columns"):
+            columns = column_arrays(instances)
+
         # Encode categorical variables
-        for col in ["Parental_Involvement", "Access_to_Resources", "Motivation_Level"]:
-            df[col] = self.label_encoders[col].transform(df[col])
-        
-        # Scale numerical columns
-        numerical_cols = ["Hours_Studied", "Attendance", "Previous_Scores", "Motivation_Level", "Tutoring_Sessions"]
-        df[numerical_cols] = self.scaler.transform(df[numerical_cols])
-        
+        with metrics.stage("encode"):
+            for col in CATEGORICAL_COLUMNS:
+                columns[col] = self.label_encoders[col].transform(columns[col])
+
+            return np.column_stack([columns[col] for col in FEATURE_COLUMNS]).astype(float)
+
+    def transform_encoded(self, encoded):
+        # Scale numerical columns (same arithmetic as StandardScaler.transform)
+        with metrics.stage("scale"):
+            X = np.empty((encoded.shape[0], len(MODEL_COLUMNS)))
+            X[:, :len(FEATURE_COLUMNS)] = encoded
+            X[:, :len(NUMERICAL_COLUMNS)] -= self.scaler.mean_
+            X[:, :len(NUMERICAL_COLUMNS)] /= self.scaler.scale_
+
         # Feature engineering (consistent with training)
-        df["Hours_Motivation"] = df["Hours_Studied"] * (df["Motivation_Level"] + 1)
-        df["Attendance_Impact"] = df["Attendance"] * df["Previous_Scores"]
-        
-        return df
+        with metrics.stage("features"):
+            hours, attendance, previous, motivation = (
+                X[:, COLUMN_INDEX[col]]
+                for col in ["Hours_Studied", "Attendance", "Previous_Scores", "Motivation_Level"]
+            )
+            X[:, COLUMN_INDEX["Hours_Motivation"]] = hours * (motivation + 1)
+            X[:, COLUMN_INDEX["Attendance_Impact"]] = attendance * previous
 
-    def predict(self, instances, **kwargs):
-        # Process multiple instances (required for AI Platform compatibility)
-        results = []
-        for instance in instances:
-            # Preprocess the input
-            processed_data = self.preprocess_input(instance)
-            
-            # Make prediction
-            predicted_score = self.model.predict(processed_data)[0]
-            
-            # At-risk classification
-            at_risk_threshold = 60
-            at_risk = int(predicted_score < at_risk_threshold)
-
-            # Extract scaled features for recommendation logic
-            hours_studied = processed_data["Hours_Studied"].values[0]
-            attendance = processed_data["Attendance"].values[0]
-            tutoring = processed_data["Tutoring_Sessions"].values[0]
-
-            # Generate recommendation
-            if at_risk:
-                if hours_studied < -1:  # Scaled threshold (approx. < 5 hours in original scale)
-                    recommendation = "Increase study hours and consider tutoring."
-                elif attendance < -1:  # Scaled threshold (approx. < 0.6 in original scale)
-                    recommendation = "Increase attendance and consider tutoring."
-                elif tutoring < 0:  # Scaled threshold (approx. < 1 session)
-                    recommendation = "Schedule more tutoring sessions."
-                else:
-                    recommendation = "Focus on study habits."
+        return X
+
+    def predict_arrays(self, instances):
+        # Columnar batch mode: one encode/scale/predict pass for all records.
+        # Returns (scores, at_risk, recommendations) as NumPy arrays.
+        if len(instances) == 0:
+            return np.empty(0), np.empty(0, dtype=int), np.empty(0, dtype=object)
+
+        try:
+            if self.engine == "hist":
+                # No encoding step: the model takes the raw frame, and the
+                # rules only need their own few columns scaled
+                with metrics.stage("columns"):
+                    frame = self.native_inputs(instances)
+                with metrics.stage("inference"):
+                    predicted_scores = self.model.predict(frame)
+                with metrics.stage("recommend"):
+                    X, column_index = self.rule_features(frame)
+                    at_risk, codes = classify(X, predicted_scores, column_index=column_index)
             else:
-                recommendation = "Keep up the good work!"
+                predicted_scores, at_risk, codes = self.predict_features(self.feature_matrix(instances))
+        except Exception:
+            metrics.record_error()
+            raise
+        metrics.record_batch(at_risk)
+        return predicted_scores, at_risk, RECOMMENDATIONS[codes]
+
+    def native_inputs(self, instances):
+        # The hist model's raw input frame, checked as the other engines'
+        # preprocessing would: NaN/infinite numbers and unseen categories
+        # raise ValueError instead of being scored as missing values
+        from compiled_model import check_finite
 
-            # Append result
-            results.append({
-                "predicted_exam_score": float(predicted_score),
-                "at_risk": at_risk,
-                "recommendation": recommendation
-            })
-        
-        return results
+        frame = native_frame(instances)
+        check_finite(frame[[col for col in FEATURE_COLUMNS if col not in CATEGORICAL_COLUMNS]].to_numpy())
+        for col in CATEGORICAL_COLUMNS:
+            values = frame[col].to_numpy().astype(str)
+            unseen = ~np.isin(values, self.label_encoders[col].classes_)
+            if unseen.any():
+                raise ValueError(f"{col} contains previously unseen labels: {sorted(set(values[unseen]))}")
+        return frame
+
+    def rule_features(self, columns):
+        # (matrix, column index) of just the inputs the recommendation rules
+        # read, scaled as transform_encoded would; `columns` maps each raw
+        # numeric input to its values
+        names = DEFAULT_RULES.columns
+        positions = [NUMERICAL_COLUMNS.index(col) for col in names]
+        X = np.column_stack([np.asarray(columns[col], dtype=float) for col in names])
+        X -= self.scaler.mean_[positions]
+        X /= self.scaler.scale_[positions]
+        return X, {col: i for i, col in enumerate(names)}
+
+    def predict_features(self, X):
+        # Scores a model-ready matrix; returns (scores, at_risk, recommendation codes)
+        predicted_scores = self.predict_scores(X)
+        with metrics.stage("recommend"):
+            return (predicted_scores, *classify(X, predicted_scores))
+
+    def predict_encoded(self, encoded):
+        # (scores, at_risk, recommendation codes) for an encode() matrix on
+        # any engine, like predict_features for a model-ready one
+        if self.engine != "hist":
+            return self.predict_features(self.transform_encoded(encoded))
+        predicted_scores = self.score_encoded(encoded)
+        with metrics.stage("recommend"):
+            X, column_index = self.rule_features(
+                {col: encoded[:, FEATURE_COLUMNS.index(col)] for col in DEFAULT_RULES.columns}
+            )
+            return (predicted_scores, *classify(X, predicted_scores, column_index=column_index))
+
+    def score_encoded(self, encoded):
+        # Scores for an encode() matrix on any engine: the hist model gets it
+        # decoded back to raw inputs, the others scaled and featurized. The
+        # hist model would score NaN/infinite inputs as missing values, so
+        # they raise ValueError here as they do on the other engines
+        if self.engine == "hist":
+            from compiled_model import check_finite
+
+            check_finite(encoded)
+            frame = self.decode(encoded)
+            with metrics.stage("inference"):
+                return self.model.predict(frame)
+        return self.predict_scores(self.transform_encoded(encoded))
+
+    def decode(self, encoded):
+        # The raw input frame an encode() matrix came from
+        import pandas as pd
+
+        return pd.DataFrame({
+            col: self.label_encoders[col].classes_[encoded[:, i].astype(np.intp)].astype(object)
+            if col in CATEGORICAL_COLUMNS else encoded[:, i]
+            for i, col in enumerate(FEATURE_COLUMNS)
+        })
+
+    def predict_scores(self, X):
+        # Scores for a model-ready matrix (feature_matrix/transform_encoded output)
+        if self.engine == "hist":
+            raise ValueError(
+                "The hist engine scores raw inputs, not model-ready matrices; "
+                "use predict_arrays, or score_encoded for encode() output"
+            )
+        if self.engine in ("numpy", "bundle"):
+            with metrics.stage("inference"):
+                return self.model.predict(X)
+        # sklearn checks feature names, so it gets a labelled frame
+        import pandas as pd
+
+        with metrics.stage("frame"):
+            frame = pd.DataFrame(X, columns=MODEL_COLUMNS)
+        with metrics.stage("inference"):
+            return self.model.predict(frame)
+
+    def predict(self, instances, **kwargs):
+        # Process multiple instances (required for AI Platform compatibility)
+        scored = self.predict_arrays(instances)
+        with metrics.stage("records"):
+            return to_records(*scored)
 
     @classmethod
     def from_path(cls, model_dir):
-        # Required for AI Platform to instantiate the class
-        return cls()
+        # Required for AI Platform to instantiate the class. Prefers the
+        # bundle, which workers share, over the three pickles; both score
+        # the same and reject incomplete records with the same ValueError
+        engine = "bundle" if os.path.exists(os.path.join(model_dir, BUNDLE_PATH)) else "sklearn"
+        return cls(engine=engine, model_dir=model_dir)
 
 if __name__ == "__main__":
     # Test locally
@@ -90,4 +317,4 @@ if __name__ == "__main__":
         "Access_to_Resources": "Low"
     }
     result = predictor.predict([sample_input])
-    print(result)
\ No newline at end of file
+    print(result)
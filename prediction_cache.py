@@ -0,0 +1,118 @@
+"""LRU cache in front of StudentPerformancePredictor.predict.
+
+The individual-prediction form has a small discrete input space, so the same
+7-feature combinations come up again and again. Results are keyed by the
+canonicalized feature tuple, optionally expire after a TTL, and the whole
+cache is dropped whenever the model artifacts change on disk.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from model_registry import artifact_version, get_batcher
+from predict import CATEGORICAL_COLUMNS, FEATURE_COLUMNS
+
+DEFAULT_MAXSIZE = 4096
+
+
+def canonical_key(instance):
+    # 20, 20.0 and np.int64(20) must share an entry; extra keys are ignored.
+    # A missing field stays None, so scoring the miss reports it
+    values = ((col, instance.get(col)) for col in FEATURE_COLUMNS)
+    return tuple(
+        value if value is None else str(value) if col in CATEGORICAL_COLUMNS else float(value)
+        for col, value in values
+    )
+
+
+class PredictionCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set_version(self, version):
+        # Entries computed by a different model are never served
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class CachedPredictor:
+    """Drop-in for StudentPerformancePredictor.predict backed by a PredictionCache."""
+
+    def __init__(self, engine="sklearn", maxsize=DEFAULT_MAXSIZE, ttl=None):
+        self.engine = engine
+        self.cache = PredictionCache(maxsize=maxsize, ttl=ttl)
+
+    def predict(self, instances, **kwargs):
+        self.cache.set_version(artifact_version(self.engine))
+
+        keys = [canonical_key(instance) for instance in instances]
+        results = [self.cache.get(key) for key in keys]
+
+        # Score every distinct miss in one call, coalesced with whatever
+        # other sessions are submitting at the same moment
+        missing = {}
+        for instance, key, result in zip(instances, keys, results):
+            if result is None:
+                missing.setdefault(key, instance)
+        if missing:
+            scored = get_batcher(self.engine).predict(list(missing.values()))
+            fresh = dict(zip(missing, scored))
+            for key, result in fresh.items():
+                self.cache.put(key, result)
+            results = [fresh[key] if result is None else result for key, result in zip(keys, results)]
+
+        # Copies, so callers can't mutate cached entries
+        return [dict(result) for result in results]
+
+    def stats(self):
+        return self.cache.stats()
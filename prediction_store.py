@@ -0,0 +1,242 @@
+"""Persistent prediction store for incremental re-scoring.
+
+Daily rosters mostly repeat yesterday's students with unchanged features.
+The store (one SQLite file) keeps each student's latest prediction keyed by
+student ID, a hash of the 7 model features and the model version, so a
+rescoring run only calls predict for rows that are new, changed, or were
+scored by a different model; every other row reuses its stored result.
+
+Tables:
+
+    predictions   latest result per student_id, with the feature hash and
+                  model version it was computed from
+    at_risk       the students flagged at risk on each run date, keyed
+                  (and clustered) by cohort, run date and student
+    runs          per run_date counts of rows scored and reused, and time
+
+Only at-risk rows are kept per day, so a run writes the rescored rows and
+the day's at-risk list rather than the whole roster; rescoring a student
+on the same day replaces their entry. Stored predictions for
+the current model are read once per store and matched to each batch in
+memory.
+
+    python -m score roster.csv scored.csv --store predictions.sqlite
+    python prediction_store.py at-risk --cohort 2025-A --date 2025-09-01
+    python prediction_store.py runs
+"""
+import argparse
+import datetime
+import hashlib
+import os
+import sqlite3
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from predict import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, RECOMMENDATIONS
+
+STORE_PATH = "predictions.sqlite"
+ID_COLUMN = "Student_ID"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    student_id TEXT PRIMARY KEY,
+    feature_hash INTEGER NOT NULL,
+    model_version TEXT NOT NULL,
+    predicted_score REAL NOT NULL,
+    at_risk INTEGER NOT NULL,
+    recommendation INTEGER NOT NULL,
+    scored_on TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS at_risk (
+    cohort TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    predicted_score REAL NOT NULL,
+    recommendation INTEGER NOT NULL,
+    rescored INTEGER NOT NULL,
+    PRIMARY KEY (cohort, run_date, student_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS at_risk_by_date ON at_risk (run_date);
+CREATE TEMP TABLE IF NOT EXISTS chunk_ids (student_id TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS runs (
+    run_date TEXT PRIMARY KEY,
+    model_version TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    scored INTEGER NOT NULL,
+    reused INTEGER NOT NULL,
+    seconds REAL NOT NULL
+);
+"""
+
+
+def feature_hashes(df):
+    # One 64-bit hash per row of the model features. Numbers are hashed as
+    # floats and categories as strings, so 5 and 5.0 hash alike.
+    normalized = pd.DataFrame({
+        col: df[col].astype(str) if col in CATEGORICAL_COLUMNS else pd.to_numeric(df[col]).astype(float)
+        for col in FEATURE_COLUMNS
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy().view(np.int64)
+
+
+# model_fingerprint per predictor, so the artifacts are hashed once per load
+_fingerprints = weakref.WeakKeyDictionary()
+
+
+def model_fingerprint(predictor):
+    # Content hash of the artifacts the predictor loaded
+    if getattr(predictor, "model_version", None):
+        return predictor.model_version
+    if predictor not in _fingerprints:
+        from model_registry import ARTIFACT_PATHS
+
+        digest = hashlib.sha256()
+        for name in ARTIFACT_PATHS[predictor.engine]:
+            with open(os.path.join(getattr(predictor, "model_dir", "."), name), "rb") as f:
+                digest.update(f.read())
+        _fingerprints[predictor] = digest.hexdigest()[:16]
+    return _fingerprints[predictor]
+
+
+class PredictionStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.scored = 0
+        self.reused = 0
+        self._stored = None
+        self._stored_version = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def stored(self, model_version):
+        # Every prediction made by `model_version`, indexed by student_id;
+        # loaded on first use and kept in step with later writes
+        if self._stored is None or self._stored_version != model_version:
+            self._stored = pd.read_sql_query(
+                "SELECT student_id, feature_hash, predicted_score, at_risk, recommendation"
+                " FROM predictions WHERE model_version = ?",
+                self.connection, params=(model_version,), index_col="student_id",
+            )
+            self._stored_version = model_version
+        return self._stored
+
+    def score(self, predictor, df, id_column=ID_COLUMN, cohort_column=None, run_date=None):
+        # predict_arrays for `df`, calling the model only on new or changed
+        # rows, and recording the day's at-risk students. Returns (scores,
+        # at_risk, recommendations) in row order.
+        start = time.perf_counter()
+        run_date = run_date or datetime.date.today().isoformat()
+        model_version = model_fingerprint(predictor)
+        student_ids = df[id_column].astype(str).to_numpy(dtype=object)
+        hashes = feature_hashes(df)
+
+        stored = self.stored(model_version)
+        found = stored.index.get_indexer(student_ids)
+        reused = found >= 0
+        reused[reused] = stored["feature_hash"].to_numpy()[found[reused]] == hashes[reused]
+        rows = found[reused]
+        scores = np.empty(len(df))
+        at_risk = np.empty(len(df), dtype=np.int64)
+        codes = np.empty(len(df), dtype=np.int64)
+        scores[reused] = stored["predicted_score"].to_numpy()[rows]
+        at_risk[reused] = stored["at_risk"].to_numpy()[rows]
+        codes[reused] = stored["recommendation"].to_numpy()[rows]
+
+        missing = np.flatnonzero(~reused)
+        if len(missing):
+            new_scores, new_at_risk, recommendations = predictor.predict_arrays(df.iloc[missing])
+            scores[missing], at_risk[missing] = new_scores, new_at_risk
+            codes[missing] = pd.Categorical(recommendations, categories=RECOMMENDATIONS).codes
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    student_ids[missing].tolist(), hashes[missing].tolist(), [model_version] * len(missing),
+                    new_scores.tolist(), at_risk[missing].tolist(), codes[missing].tolist(), [run_date] * len(missing),
+                ),
+            )
+            # A student listed twice keeps their last row, as INSERT OR
+            # REPLACE did in the table; the cache index must stay unique
+            last = missing[~pd.Index(student_ids[missing]).duplicated(keep="last")]
+            update = pd.DataFrame({
+                "feature_hash": hashes[last], "predicted_score": scores[last],
+                "at_risk": at_risk[last], "recommendation": codes[last],
+            }, index=pd.Index(student_ids[last], name="student_id"))
+            self._stored = pd.concat([stored.drop(update.index, errors="ignore"), update])
+
+        # Replace the day's at-risk rows of every student in this chunk, so a
+        # student no longer at risk in a same-day rerun is dropped from the list
+        self.connection.execute("DELETE FROM chunk_ids")
+        self.connection.executemany("INSERT OR IGNORE INTO chunk_ids VALUES (?)", zip(student_ids.tolist()))
+        self.connection.execute(
+            "DELETE FROM at_risk WHERE run_date = ? AND student_id IN (SELECT student_id FROM chunk_ids)", (run_date,)
+        )
+        flagged = np.flatnonzero(at_risk == 1)
+        cohorts = df[cohort_column].astype(str).to_numpy(dtype=object)[flagged] if cohort_column else [""] * len(flagged)
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO at_risk VALUES (?, ?, ?, ?, ?, ?)",
+            zip(
+                list(cohorts), [run_date] * len(flagged), student_ids[flagged].tolist(),
+                scores[flagged].tolist(), codes[flagged].tolist(), (~reused[flagged]).astype(int).tolist(),
+            ),
+        )
+        self.connection.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (run_date) DO UPDATE SET"
+            " model_version = excluded.model_version, rows = rows + excluded.rows,"
+            " scored = scored + excluded.scored, reused = reused + excluded.reused,"
+            " seconds = seconds + excluded.seconds",
+            (run_date, model_version, len(df), len(missing), len(df) - len(missing), time.perf_counter() - start),
+        )
+        self.connection.commit()
+        self.scored += len(missing)
+        self.reused += len(df) - len(missing)
+        return scores, at_risk, RECOMMENDATIONS[codes]
+
+    def at_risk(self, cohort=None, run_date=None):
+        # At-risk students for one run date (default: the latest), optionally one cohort
+        run_date = run_date or self.connection.execute("SELECT MAX(run_date) FROM at_risk").fetchone()[0]
+        query = "SELECT student_id, cohort, predicted_score, recommendation FROM at_risk WHERE run_date = ?"
+        params = [run_date]
+        if cohort is not None:
+            query += " AND cohort = ?"
+            params.append(cohort)
+        frame = pd.read_sql_query(query + " ORDER BY predicted_score", self.connection, params=params)
+        frame["recommendation"] = RECOMMENDATIONS[frame["recommendation"].to_numpy(dtype=np.int64)]
+        return frame
+
+    def runs(self):
+        return pd.read_sql_query("SELECT * FROM runs ORDER BY run_date", self.connection)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the prediction store")
+    parser.add_argument("--store", default=STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    at_risk = commands.add_parser("at-risk", help="At-risk students for a run date")
+    at_risk.add_argument("--cohort")
+    at_risk.add_argument("--date", help="Run date, YYYY-MM-DD (default: the latest)")
+    commands.add_parser("runs", help="Rows scored vs reused per run date")
+    args = parser.parse_args()
+
+    with PredictionStore(args.store) as store:
+        if args.command == "at-risk":
+            print(store.at_risk(args.cohort, args.date).to_string(index=False))
+        else:
+            print(store.runs().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Declarative risk tiers and recommendation rules.
+
+A RuleSet holds two tables: the score tiers (the notebook's at_risk /
+average / high / excellent segments) and the recommendation rules, each a
+(code, column, operator, cut-off) on the scaled model matrix, tried in
+order for at-risk rows. compile() turns them into arrays once, so a batch
+is classified with one searchsorted for the tiers and one comparison per
+rule, combined by np.select. Outputs are codes (indices into
+predict.RECOMMENDATIONS and into the tier table), so summaries are plain
+bincounts.
+
+The default tables reproduce the original if/elif chain exactly.
+"""
+import operator
+
+import numpy as np
+
+AT_RISK_THRESHOLD = 60
+
+# Score tiers, lowest first: (name, lower bound). A tier runs up to the next
+# one's lower bound; the first and last are open-ended
+RISK_TIERS = [
+    ("at_risk", 0),
+    ("average", AT_RISK_THRESHOLD),
+    ("high", 80),
+    ("excellent", 90),
+]
+
+# Tier whose students get recommendations; the others get NOT_AT_RISK_CODE
+AT_RISK_TIER = "at_risk"
+
+# First matching rule wins: (recommendation code, column, operator, cut-off
+# on the scaled column)
+RECOMMENDATION_RULES = [
+    (1, "Hours_Studied", "<", -1),  # approx. < 5 hours in original scale
+    (2, "Attendance", "<", -1),  # approx. < 0.6 in original scale
+    (3, "Tutoring_Sessions", "<", 0),  # approx. < 1 session
+]
+NOT_AT_RISK_CODE = 0
+DEFAULT_CODE = 4
+
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+class RuleSet:
+    def __init__(self, tiers=RISK_TIERS, rules=RECOMMENDATION_RULES, at_risk_tier=AT_RISK_TIER,
+                 not_at_risk_code=NOT_AT_RISK_CODE, default_code=DEFAULT_CODE):
+        self.tier_names = [name for name, _ in tiers]
+        self.tier_bounds = np.array([lower for _, lower in tiers], dtype=float)
+        if (np.diff(self.tier_bounds) <= 0).any():
+            raise ValueError("Tier lower bounds must be strictly increasing")
+        self.at_risk_tier = self.tier_names.index(at_risk_tier)
+        self.rules = list(rules)
+        for _, _, op, _ in self.rules:
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown rule operator {op!r}")
+        self.not_at_risk_code = not_at_risk_code
+        self.default_code = default_code
+        self._compiled = {}
+
+    @property
+    def columns(self):
+        # Columns the rules read, in first-use order
+        return list(dict.fromkeys(col for _, col, _, _ in self.rules))
+
+    def compile(self, column_index):
+        # (columns, operators, cut-offs, codes) for a matrix laid out by
+        # column_index; cached per layout
+        key = tuple(sorted(column_index.items()))
+        if key not in self._compiled:
+            self._compiled[key] = (
+                np.array([column_index[col] for _, col, _, _ in self.rules], dtype=np.intp),
+                [OPERATORS[op] for _, _, op, _ in self.rules],
+                np.array([cutoff for _, _, _, cutoff in self.rules], dtype=float),
+                [code for code, _, _, _ in self.rules],
+            )
+        return self._compiled[key]
+
+    def tiers(self, scores):
+        # Tier index per score; scores below the first bound fall in the first tier
+        return np.maximum(np.searchsorted(self.tier_bounds, scores, side="right") - 1, 0)
+
+    def evaluate(self, X, scores, column_index):
+        # (tier codes, at-risk flags, recommendation codes) for a model-ready
+        # matrix and its predicted scores
+        columns, ops, cutoffs, codes = self.compile(column_index)
+        tiers = self.tiers(scores)
+        at_risk = (tiers == self.at_risk_tier).astype(int)
+        conditions = [at_risk == 0] + [op(X[:, col], cutoff) for col, op, cutoff in zip(columns, ops, cutoffs)]
+        recommendations = np.select(conditions, [self.not_at_risk_code] + codes, default=self.default_code)
+        return tiers, at_risk, recommendations
+
+    def tier_counts(self, tiers):
+        return np.bincount(tiers, minlength=len(self.tier_names))
+
+
+DEFAULT_RULES = RuleSet()
@@ -0,0 +1,213 @@
+"""Command-line bulk scorer.
+
+Reads student records from CSV, Parquet or Arrow IPC, scores them in
+batches and writes the UI's output columns (Predicted_Score, At_Risk,
+Recommendation) in any of the same formats. Columnar inputs are read with
+column projection, so only the 7 model features are materialized unless
+--all-columns asks for the other input columns to be carried through.
+
+    python -m score roster.parquet scored.csv
+    cat roster.csv | python -m score - - --output-format arrow > scored.arrow
+
+Use "-" for stdin/stdout; the format is taken from the file extension or
+the --input-format/--output-format flags (CSV by default). Throughput is
+reported on stderr when scoring finishes.
+
+With --store, predictions are kept in a SQLite prediction store (see
+prediction_store.py) keyed by the --id-column: rows whose features and
+model are unchanged since they were last scored reuse the stored result,
+and only new or changed rows are sent to the model.
+
+    python -m score roster.csv scored.csv --store predictions.sqlite --cohort-column Cohort
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from batch_scoring import DEFAULT_CHUNKSIZE, SCORE_DECIMALS, format_results, score_frame
+from predict import FEATURE_COLUMNS, StudentPerformancePredictor
+from prediction_store import ID_COLUMN, PredictionStore
+
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def detect_format(path, explicit):
+    if explicit:
+        return explicit
+    for extension, fmt in FORMATS.items():
+        if path.lower().endswith(extension):
+            return fmt
+    return "csv"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        sys.exit("Parquet and Arrow formats require pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def read_batches(path, fmt, columns, chunksize):
+    # Yields DataFrames of at most `chunksize` rows; `columns` limits what is read
+    import pandas as pd
+
+    source = sys.stdin.buffer if path == "-" else path
+    if fmt == "csv":
+        yield from pd.read_csv(source, usecols=columns, chunksize=chunksize)
+        return
+
+    pa = _require_pyarrow()
+    if path == "-":
+        # Parquet and the Arrow file format both need random access
+        source = pa.BufferReader(sys.stdin.buffer.read())
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    import pyarrow.ipc as ipc
+    try:
+        reader = ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        # Not the random-access file format; read it as an IPC stream
+        if hasattr(source, "seek"):
+            source.seek(0)
+        batches = ipc.open_stream(source)
+    for batch in batches:
+        if columns is not None:
+            batch = batch.select(columns)
+        for start in range(0, batch.num_rows, chunksize):
+            yield batch.slice(start, chunksize).to_pandas()
+
+
+# Result categoricals written as dictionary<int8, string> over their whole
+# vocabulary (format_results gives them fixed categories), so every chunk
+# carries the same dictionary
+FIXED_DICTIONARIES = ["At_Risk", "Recommendation"]
+
+
+def output_schema(pa, schema):
+    # One schema for every chunk of format_results output: the compact dtypes
+    # depend on each chunk's values, so numbers get fixed 64-bit widths and
+    # the other categoricals, whose categories vary, plain strings
+    fields = []
+    for field in schema:
+        kind = field.type
+        if field.name in FIXED_DICTIONARIES:
+            kind = pa.dictionary(pa.int8(), pa.string())
+        elif pa.types.is_dictionary(kind) or pa.types.is_large_string(kind):
+            kind = pa.string()
+        elif pa.types.is_integer(kind):
+            kind = pa.int64()
+        elif pa.types.is_floating(kind):
+            kind = pa.float64()
+        fields.append(pa.field(field.name, kind))
+    return pa.schema(fields)
+
+
+class BatchWriter:
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        self.sink = sys.stdout.buffer if path == "-" else path
+        self._writer = None
+        self._file = None
+        self._schema = None
+
+    def write(self, df):
+        if self.fmt == "csv":
+            if self._file is None:
+                self._file = self.sink if self.sink is sys.stdout.buffer else open(self.sink, "wb")
+                df.to_csv(self._file, index=False)
+            else:
+                df.to_csv(self._file, index=False, header=False)
+            return
+
+        pa = _require_pyarrow()
+        if "Predicted_Score" in df.columns:
+            # Widening alone would give 65.16999816894531 for 65.17
+            df = df.assign(Predicted_Score=np.round(df["Predicted_Score"].to_numpy(np.float64), SCORE_DECIMALS))
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._schema = output_schema(pa, table.schema)
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.sink, self._schema)
+            elif self.sink is sys.stdout.buffer:
+                # stdout can't seek, so Arrow goes out as an IPC stream
+                self._writer = pa.ipc.new_stream(self.sink, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.sink, self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None and self._file is not sys.stdout.buffer:
+            self._file.close()
+        if self.sink is sys.stdout.buffer:
+            self.sink.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m score", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("input", help='Input file, or "-" for stdin')
+    parser.add_argument("output", help='Output file, or "-" for stdout')
+    parser.add_argument("--input-format", choices=["csv", "parquet", "arrow"])
+    parser.add_argument("--output-format", choices=["csv", "parquet", "arrow"])
+    parser.add_argument("--all-columns", action="store_true",
+                        help="Carry every input column through instead of only the 7 model features")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows scored per batch")
+    parser.add_argument("--engine", choices=["sklearn", "numpy", "bundle", "hist"], default="sklearn")
+    parser.add_argument("--store", help="SQLite prediction store; only new or changed rows are rescored")
+    parser.add_argument("--id-column", default=ID_COLUMN, help=f"Student ID column for --store (default {ID_COLUMN})")
+    parser.add_argument("--cohort-column", help="Column recorded as the cohort in --store")
+    parser.add_argument("--run-date", help="Date recorded in --store, YYYY-MM-DD (default: today)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    predictor = StudentPerformancePredictor(engine=args.engine)
+    columns = None if args.all_columns else FEATURE_COLUMNS
+    if args.store and columns is not None:
+        columns = columns + [col for col in (args.id_column, args.cohort_column) if col]
+    store = PredictionStore(args.store) if args.store else None
+    writer = BatchWriter(args.output, detect_format(args.output, args.output_format))
+
+    rows = 0
+    try:
+        for batch in read_batches(args.input, detect_format(args.input, args.input_format), columns, args.chunksize):
+            if store is None:
+                writer.write(score_frame(predictor, batch))
+            else:
+                scored = store.score(predictor, batch, args.id_column, args.cohort_column, args.run_date)
+                writer.write(format_results(batch, *scored))
+            rows += len(batch)
+        writer.close()
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); silence the final flush
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows:,} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)", file=sys.stderr)
+    if store is not None:
+        print(f"Rescored {store.scored:,} new or changed rows, reused {store.reused:,} from {args.store}", file=sys.stderr)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
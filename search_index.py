@@ -0,0 +1,176 @@
+"""Search index over scored batch results.
+
+Each column is dictionary-encoded once: a vocabulary of its distinct values
+(as the lowercase strings the search matches against) plus an integer code
+per row. A query term is evaluated against the vocabulary only, and the
+per-value result is broadcast to rows with one gather over the codes, so a
+search never touches the rows as strings.
+
+Query syntax (terms are whitespace-separated and all must match):
+
+    tutoring          substring in any column
+    incr*             prefix of any column's value
+    at_risk:yes       substring within one column (also at_risk:ye*)
+    score<60          numeric comparison: < <= > >= = !=
+    "study habits"    quotes keep spaces inside a term
+
+Column names are case-insensitive, may be abbreviated to any unique prefix,
+and `score` / `risk` stand for Predicted_Score / At_Risk. A term whose
+part before the operator names no column (10:30, e=mc2) is plain text.
+"""
+import re
+import shlex
+
+import numpy as np
+import pandas as pd
+
+COLUMN_ALIASES = {"score": "Predicted_Score", "risk": "At_Risk"}
+
+SCOPED_TERM = re.compile(r"^(?P<column>[A-Za-z_]\w*)\s*(?P<op><=|>=|!=|=|<|>|:)(?P<value>.*)$")
+
+COMPARISONS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "=": np.equal,
+    "!=": np.not_equal,
+}
+
+
+class SearchIndex:
+    def __init__(self):
+        self.columns = None
+        self.row_count = 0
+        self._lookup = {}
+        self._values = {}
+        self._chunk_codes = {}
+        self._codes = None
+        self._vocab_cache = {}
+
+    @classmethod
+    def from_csv(cls, path, chunksize=50_000):
+        index = cls()
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            index.update(chunk)
+        return index
+
+    def update(self, chunk):
+        # Adds a chunk of rows; values are keyed by their str() form, which is
+        # what a search matches
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            for col in self.columns:
+                self._lookup[col], self._values[col], self._chunk_codes[col] = {}, [], []
+        for col in self.columns:
+            codes, uniques = pd.factorize(chunk[col], use_na_sentinel=False)
+            lookup, values = self._lookup[col], self._values[col]
+            remap = np.empty(len(uniques), dtype=np.int32)
+            for position, (value, text) in enumerate(zip(uniques, uniques.astype(str))):
+                code = lookup.get(text)
+                if code is None:
+                    code = lookup[text] = len(values)
+                    values.append(value)
+                remap[position] = code
+            self._chunk_codes[col].append(remap[codes])
+        self.row_count += len(chunk)
+        self._codes = None
+        self._vocab_cache = {}
+
+    def __len__(self):
+        return self.row_count
+
+    def codes(self, col):
+        if self._codes is None:
+            # Stored in the smallest integer type for each vocabulary
+            self._codes = {
+                col: (np.concatenate(parts) if parts else np.empty(0, dtype=np.int32))
+                .astype(np.min_scalar_type(max(len(self._values[col]) - 1, 0)))
+                for col, parts in self._chunk_codes.items()
+            }
+            self._chunk_codes = {col: [codes] for col, codes in self._codes.items()}
+        return self._codes[col]
+
+    def vocabulary(self, col):
+        # (lowercase strings, numeric values) per distinct value of `col`
+        if col not in self._vocab_cache:
+            text = pd.Index(list(self._lookup[col]), dtype=object).str.lower()
+            numbers = pd.to_numeric(pd.Series(self._values[col], dtype=object), errors="coerce").to_numpy(dtype=float)
+            self._vocab_cache[col] = (text, numbers)
+        return self._vocab_cache[col]
+
+    def resolve_column(self, name):
+        # Column `name` refers to, or None if it matches no column
+        key = name.lower()
+        names = {col.lower(): col for col in self.columns or []}
+        if key in names:
+            return names[key]
+        if key in COLUMN_ALIASES and COLUMN_ALIASES[key] in (self.columns or []):
+            return COLUMN_ALIASES[key]
+        candidates = [col for col in self.columns or [] if col.lower().startswith(key)]
+        if len(candidates) == 1:
+            return candidates[0]
+        if candidates:
+            raise ValueError(f"Column {name!r} is ambiguous: {', '.join(candidates)}")
+        return None
+
+    def search(self, query):
+        # Boolean mask over rows matching every term of `query`
+        mask = np.ones(self.row_count, dtype=bool)
+        for term in split_terms(query):
+            mask &= self.match_term(term)
+        return mask
+
+    def match_term(self, term):
+        scoped = SCOPED_TERM.match(term)
+        col = None if scoped is None else self.resolve_column(scoped["column"])
+        if col is None:
+            return self._match_any(term)
+        op, value = scoped["op"], scoped["value"].strip()
+        if op == ":":
+            return self._match_text(col, value)[self.codes(col)]
+        return self._compare(col, op, value)[self.codes(col)]
+
+    def _match_any(self, term):
+        mask = np.zeros(self.row_count, dtype=bool)
+        for col in self.columns or []:
+            matched = self._match_text(col, term)
+            if matched.any():
+                mask |= matched[self.codes(col)]
+        return mask
+
+    def _match_text(self, col, value):
+        text, _ = self.vocabulary(col)
+        value = value.lower()
+        if value.endswith("*"):
+            return np.asarray(text.str.startswith(value[:-1]), dtype=bool)
+        return np.asarray(text.str.contains(value, regex=False), dtype=bool)
+
+    def _compare(self, col, op, value):
+        text, numbers = self.vocabulary(col)
+        try:
+            number = float(value)
+        except ValueError:
+            if op not in ("=", "!="):
+                raise ValueError(f"{col}{op}{value}: comparison needs a number")
+            equal = np.asarray(text == value.lower(), dtype=bool)
+            return equal if op == "=" else ~equal
+        with np.errstate(invalid="ignore"):
+            return COMPARISONS[op](numbers, number)
+
+    def take(self, positions):
+        # DataFrame of the rows at `positions`, rebuilt from the vocabularies
+        data = {}
+        for col in self.columns or []:
+            values = np.empty(len(self._values[col]), dtype=object)
+            values[:] = self._values[col]
+            data[col] = values[self.codes(col)[positions]]
+        return pd.DataFrame(data).infer_objects()
+
+
+def split_terms(query):
+    try:
+        return shlex.split(query)
+    except ValueError:
+        # Unbalanced quote: fall back to plain whitespace splitting
+        return query.replace('"', " ").replace("'", " ").split()
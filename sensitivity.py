@@ -0,0 +1,77 @@
+"""Sensitivity (individual conditional expectation) curves for one student.
+
+For each numeric form input, the predicted score as that input sweeps its
+whole slider range while the other inputs stay fixed. The sweep points of
+all four inputs are stacked into one batch and scored with a single
+predict_arrays call; on the lookup engine every point is on the table's
+grid, so the batch is answered by indexing alone. Curves are cached per
+canonical input tuple (and dropped when the model changes), so repeating a
+submission is free.
+"""
+import numpy as np
+
+from model_registry import artifact_version, get_predictor
+from prediction_cache import PredictionCache, canonical_key
+
+# Slider ranges of the Individual Prediction form: (start, stop, step)
+SWEEPS = {
+    "Hours_Studied": (0, 40, 1),
+    "Attendance": (0.0, 1.0, 0.01),
+    "Previous_Scores": (0, 100, 1),
+    "Tutoring_Sessions": (0, 10, 1),
+}
+
+_cache = PredictionCache(maxsize=512)
+
+
+def sweep_values(start, stop, step):
+    # Rounded like lookup_table.grid_values, so points land on its grid
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + np.arange(count) * step, 10)
+
+
+def sweep_batch(instance, sweeps=SWEEPS):
+    # One row per sweep point: a copy of `instance` with one input replaced.
+    # Returns (columns, values): the batch as column arrays plus the swept
+    # values per input, in batch order.
+    values = {col: sweep_values(*spec) for col, spec in sweeps.items()}
+    total = sum(len(points) for points in values.values())
+    batch = {col: np.full(total, instance[col], dtype=object) for col in instance}
+    start = 0
+    for col, points in values.items():
+        column = batch[col].astype(float)
+        column[start:start + len(points)] = points
+        batch[col] = column
+        start += len(points)
+    return batch, values
+
+
+def curves(predictor, instance, sweeps=SWEEPS):
+    # {input: (swept values, predicted scores)} from one predict_arrays call
+    import pandas as pd
+
+    batch, values = sweep_batch(instance, sweeps)
+    scores = predictor.predict_arrays(pd.DataFrame(batch))[0]
+    result, start = {}, 0
+    for col, points in values.items():
+        result[col] = (points, scores[start:start + len(points)])
+        start += len(points)
+    return result
+
+
+def cached_curves(instance, engine="sklearn"):
+    _cache.set_version(artifact_version(engine))
+    key = (engine, canonical_key(instance))
+    result = _cache.get(key)
+    if result is None:
+        result = curves(get_predictor(engine), instance)
+        _cache.put(key, result)
+    return result
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def clear_cache():
+    _cache.clear()
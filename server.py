@@ -0,0 +1,198 @@
+"""Headless HTTP inference server.
+
+Serves the same contract as StudentPerformancePredictor.predict over JSON:
+
+    POST /predict   {"instances": [{...}, ...]}  ->  {"predictions": [{...}, ...]}
+    GET  /healthz   ->  {"status": "ok", ...}
+    GET  /metrics   ->  per-stage timings and counters (Prometheus text format)
+
+The server is a small HTTP/1.1 implementation on asyncio streams with
+keep-alive. The model is loaded once at startup and predictions run in a
+thread pool so the event loop never blocks on scoring. With --micro-batch,
+concurrent requests are coalesced into shared predict calls instead.
+
+    python server.py --port 8080 --workers 4
+    python server.py --micro-batch --max-batch-size 64 --max-wait-ms 5
+    python server.py --metrics   # collect the timings /metrics reports
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import metrics
+from batching import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS, MicroBatcher
+from model_registry import get_predictor
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class InferenceServer:
+    def __init__(self, engine="sklearn", workers=None, batch_options=None):
+        self.engine = engine
+        self.predictor = get_predictor(engine)
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+        self.batcher = None
+        if batch_options is not None:
+            self.batcher = MicroBatcher(self.predictor.predict, **batch_options)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                keep_alive, body = True, None
+                try:
+                    method, path, version, headers = parse_head(head)
+                    keep_alive = wants_keep_alive(version, headers)
+                    body = await read_body(reader, headers)
+                    status, payload = await self.route(method, path, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": error.message}
+                except Exception as error:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(error)}
+                if body is None:
+                    # The request body was never consumed, so the stream
+                    # can't be reused for the next request
+                    keep_alive = False
+
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path == "/healthz":
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+            payload = {"status": "ok", "engine": self.engine}
+            if self.batcher is not None:
+                payload["batching"] = self.batcher.stats()
+            return HTTPStatus.OK, payload
+        if path == "/metrics":
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+            return HTTPStatus.OK, metrics.exposition()
+        if path == "/predict":
+            if method != "POST":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+            return HTTPStatus.OK, {"predictions": await self.predict(body)}
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    async def predict(self, body):
+        try:
+            instances = json.loads(body)["instances"]
+        except (ValueError, KeyError, TypeError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'Body must be JSON of the form {"instances": [...]}')
+        if not isinstance(instances, list):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, '"instances" must be a list')
+
+        try:
+            if self.batcher is not None:
+                return await asyncio.wrap_future(self.batcher.submit(instances))
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.predictor.predict, instances)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            # Bad input values (unseen categories, missing columns, ...)
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(error))
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Serving {self.engine} predictions on http://{host}:{port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def parse_head(head):
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, path, version = lines[0].split(" ")
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method, path, version, headers
+
+
+def wants_keep_alive(version, headers):
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+async def read_body(reader, headers):
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Chunked request bodies are not supported")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    return await reader.readexactly(length) if length else b""
+
+
+def encode_response(status, payload, keep_alive):
+    # str payloads are sent as-is (the metrics text), anything else as JSON
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+    else:
+        body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve student performance predictions over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Prediction threads (default: CPU count)")
+    parser.add_argument("--engine", choices=["sklearn", "numpy", "bundle", "hist"], default="sklearn")
+    parser.add_argument("--micro-batch", action="store_true", help="Coalesce concurrent requests into shared batches")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument("--metrics", action="store_true", help="Collect per-stage timings for GET /metrics")
+    args = parser.parse_args()
+
+    if args.metrics:
+        metrics.enable()
+
+    batch_options = None
+    if args.micro_batch:
+        batch_options = {"max_batch_size": args.max_batch_size, "max_wait_ms": args.max_wait_ms}
+    server = InferenceServer(engine=args.engine, workers=args.workers, batch_options=batch_options)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
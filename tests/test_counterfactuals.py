@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from counterfactuals import search
+from predict import FEATURE_COLUMNS, StudentPerformancePredictor
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return StudentPerformancePredictor(engine="numpy")
+
+
+def check_plans(predictor, df, result):
+    # Applying each found plan reproduces its score and keeps attendance in range
+    plans = result[result["Found"] & (result["At_Risk"] == 1)]
+    shifted = df.loc[plans.index].copy()
+    for col in ["Hours_Studied", "Attendance", "Tutoring_Sessions"]:
+        shifted[col] = shifted[col] + plans[f"{col}_Change"]
+    np.testing.assert_allclose(predictor.predict_arrays(shifted)[0], plans["Counterfactual_Score"], atol=1e-9)
+    assert (plans["Counterfactual_Score"] >= 60).all()
+    return plans
+
+
+def test_attendance_changes_on_the_csv_percentage_scale(predictor):
+    df = pd.read_csv("student_performance.csv")[FEATURE_COLUMNS]
+    plans = check_plans(predictor, df, search(predictor, df))
+    changed = plans["Attendance_Change"] > 0
+    assert changed.any()
+    # Steps of 5 percentage points, within the 30-point budget and 100%
+    np.testing.assert_allclose(plans.loc[changed, "Attendance_Change"] % 5, 0, atol=1e-9)
+    assert (plans["Attendance_Change"] <= 30).all()
+    assert (df.loc[plans.index, "Attendance"] + plans["Attendance_Change"] <= 100 + 1e-9).all()
+
+
+def test_attendance_changes_on_the_form_rate_scale(predictor):
+    df = pd.read_csv("student_performance.csv")[FEATURE_COLUMNS]
+    df["Attendance"] = df["Attendance"] / 100
+    plans = check_plans(predictor, df, search(predictor, df))
+    assert (plans["Attendance_Change"] <= 0.3 + 1e-9).all()
+    assert (df.loc[plans.index, "Attendance"] + plans["Attendance_Change"] <= 1 + 1e-9).all()
@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from predict import StudentPerformancePredictor
+
+RECORD = {
+    "Hours_Studied": 12,
+    "Attendance": 0.85,
+    "Previous_Scores": 70,
+    "Motivation_Level": "Medium",
+    "Tutoring_Sessions": 1,
+    "Parental_Involvement": "Low",
+    "Access_to_Resources": "Medium",
+}
+
+ENGINES = ["sklearn", "numpy", "bundle"]
+# Engines with their own model; they are checked for input handling only
+ALL_ENGINES = ENGINES + ["hist"]
+
+
+@pytest.mark.parametrize("engine", ALL_ENGINES)
+def test_complete_record_is_scored(engine):
+    result = StudentPerformancePredictor(engine=engine).predict([RECORD])
+    assert np.isfinite(result[0]["predicted_exam_score"])
+
+
+@pytest.mark.parametrize("engine", ALL_ENGINES)
+@pytest.mark.parametrize("column", ["Attendance", "Hours_Studied"])
+def test_missing_numeric_field_is_rejected(engine, column):
+    record = {col: value for col, value in RECORD.items() if col != column}
+    with pytest.raises(ValueError, match="NaN"):
+        StudentPerformancePredictor(engine=engine).predict([record])
+
+
+@pytest.mark.parametrize("engine", ALL_ENGINES)
+def test_infinite_value_is_rejected(engine):
+    with pytest.raises(ValueError):
+        StudentPerformancePredictor(engine=engine).predict([dict(RECORD, Previous_Scores=np.inf)])
+
+
+def test_engines_agree_on_complete_records():
+    records = [dict(RECORD, Hours_Studied=hours) for hours in range(0, 40, 5)]
+    scores = [
+        [row["predicted_exam_score"] for row in StudentPerformancePredictor(engine=engine).predict(records)]
+        for engine in ENGINES
+    ]
+    for other in scores[1:]:
+        np.testing.assert_allclose(other, scores[0], rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("engine", ALL_ENGINES)
+def test_unseen_category_is_rejected(engine):
+    with pytest.raises(ValueError, match="unseen labels"):
+        StudentPerformancePredictor(engine=engine).predict([dict(RECORD, Motivation_Level="Very High")])
+
+
+@pytest.mark.parametrize("engine", ALL_ENGINES)
+def test_score_encoded_matches_predict_arrays(engine):
+    predictor = StudentPerformancePredictor(engine=engine)
+    records = [dict(RECORD, Hours_Studied=hours, Motivation_Level=level)
+               for hours in (2, 15, 30) for level in ("High", "Low", "Medium")]
+    np.testing.assert_array_equal(predictor.score_encoded(predictor.encode(records)), predictor.predict_arrays(records)[0])
+
+
+def test_hist_rejects_model_ready_matrices():
+    predictor = StudentPerformancePredictor(engine="hist")
+    with pytest.raises(ValueError, match="predict_arrays"):
+        predictor.predict_scores(predictor.feature_matrix([RECORD]))
+
+
+def test_from_path_prefers_the_bundle_and_validates_like_sklearn(tmp_path):
+    predictor = StudentPerformancePredictor.from_path(".")
+    assert predictor.engine == "bundle"
+    incomplete = {col: value for col, value in RECORD.items() if col != "Attendance"}
+    with pytest.raises(ValueError):
+        predictor.predict([incomplete])
+
+    for name in ("final_gradient_boosting_model.pkl", "final_scaler.pkl", "final_label_encoders.pkl"):
+        (tmp_path / name).symlink_to(os.path.abspath(name))
+    fallback = StudentPerformancePredictor.from_path(str(tmp_path))
+    assert fallback.engine == "sklearn"
+    with pytest.raises(ValueError):
+        fallback.predict([incomplete])
+    np.testing.assert_allclose(
+        predictor.predict_arrays([RECORD])[0], fallback.predict_arrays([RECORD])[0], rtol=0, atol=1e-9
+    )
+
+
+def test_numpy_engines_import_neither_pandas_nor_joblib():
+    code = (
+        "import sys\n"
+        "from predict import StudentPerformancePredictor\n"
+        f"for engine in ('numpy', 'bundle'): StudentPerformancePredictor(engine=engine).predict([{RECORD!r}])\n"
+        "print(sorted({'pandas', 'joblib', 'sklearn'} & set(sys.modules)))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
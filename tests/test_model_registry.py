@@ -0,0 +1,48 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import lookup_table
+import model_registry
+
+GRID = {
+    "Hours_Studied": (0, 40, 10),
+    "Attendance": (0.0, 1.0, 0.5),
+    "Previous_Scores": (0, 100, 50),
+    "Tutoring_Sessions": (0, 10, 5),
+}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # A copy of the sklearn artifacts with a small lookup table next to them
+    for name in model_registry.ARTIFACT_PATHS["sklearn"]:
+        shutil.copy(name, tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+    lookup_table.build(GRID)
+    model_registry._lookup_current.clear()
+    return tmp_path
+
+
+def test_default_engine_uses_a_current_table(workdir):
+    assert model_registry.default_engine() == "lookup"
+
+
+def test_default_engine_falls_back_when_the_model_changes(workdir):
+    with open(lookup_table.METADATA_PATH) as f:
+        metadata = json.load(f)
+    metadata["model_sha256"] = "0" * 64
+    with open(lookup_table.METADATA_PATH, "w") as f:
+        json.dump(metadata, f)
+    # A new mtime, as replacing the model or the table gives
+    os.utime(lookup_table.METADATA_PATH, ns=(1, 1))
+
+    with pytest.warns(UserWarning, match="different model"):
+        engine = model_registry.default_engine()
+    assert engine == "sklearn"
+    assert model_registry.get_predictor(engine).predict([{
+        "Hours_Studied": 10, "Attendance": 0.5, "Previous_Scores": 50, "Motivation_Level": "Low",
+        "Tutoring_Sessions": 0, "Parental_Involvement": "Low", "Access_to_Resources": "Low",
+    }])
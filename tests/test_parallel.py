@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from compiled_model import COMPILED_MODEL_PATH
+from parallel import predict_parallel
+from predict import StudentPerformancePredictor
+
+
+@pytest.mark.parametrize("engine", ["sklearn", "numpy", "hist"])
+def test_parallel_matches_single_process(engine):
+    df = pd.read_csv("student_performance.csv").head(500)
+    expected = StudentPerformancePredictor(engine=engine).predict_arrays(df)
+    result = predict_parallel(df, workers=2, engine=engine, shard_size=128)
+    for got, want in zip(result, expected):
+        np.testing.assert_array_equal(got, want)
+
+
+@pytest.mark.parametrize("engine", ["sklearn", "numpy", "hist"])
+@pytest.mark.parametrize("value", [np.nan, np.inf])
+def test_parallel_rejects_non_finite(engine, value):
+    df = pd.read_csv("student_performance.csv").head(300)
+    df["Hours_Studied"] = df["Hours_Studied"].astype(float)
+    df.loc[200, "Hours_Studied"] = value
+    with pytest.raises(ValueError):
+        predict_parallel(df, workers=2, engine=engine, shard_size=128)
+
+
+def test_parallel_workers_load_the_given_predictor(tmp_path, monkeypatch):
+    # Workers must use the predictor's engine and model_dir, not the engine
+    # argument and the working directory's artifacts
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    (model_dir / COMPILED_MODEL_PATH).symlink_to(os.path.abspath(COMPILED_MODEL_PATH))
+    df = pd.read_csv("student_performance.csv").head(300)
+    predictor = StudentPerformancePredictor(engine="numpy", model_dir=str(model_dir))
+    expected = predictor.predict_arrays(df)
+    monkeypatch.chdir(tmp_path)
+    result = predict_parallel(df, workers=2, shard_size=128, predictor=predictor)
+    for got, want in zip(result, expected):
+        np.testing.assert_array_equal(got, want)
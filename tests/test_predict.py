@@ -0,0 +1,48 @@
+import pandas as pd
+
+from predict import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, NUMERICAL_COLUMNS, StudentPerformancePredictor
+
+
+def per_row(predictor, instances):
+    # The original predict(): a one-row frame, encoded, scaled and scored
+    # per record, with the if/elif recommendation chain
+    results = []
+    for instance in instances:
+        df = pd.DataFrame([instance], columns=FEATURE_COLUMNS)
+        for col in CATEGORICAL_COLUMNS:
+            df[col] = predictor.label_encoders[col].transform(df[col])
+        df[NUMERICAL_COLUMNS] = predictor.scaler.transform(df[NUMERICAL_COLUMNS])
+        df["Hours_Motivation"] = df["Hours_Studied"] * (df["Motivation_Level"] + 1)
+        df["Attendance_Impact"] = df["Attendance"] * df["Previous_Scores"]
+
+        predicted_score = predictor.model.predict(df)[0]
+        at_risk = int(predicted_score < 60)
+        hours_studied = df["Hours_Studied"].values[0]
+        attendance = df["Attendance"].values[0]
+        tutoring = df["Tutoring_Sessions"].values[0]
+        if at_risk:
+            if hours_studied < -1:
+                recommendation = "Increase study hours and consider tutoring."
+            elif attendance < -1:
+                recommendation = "Increase attendance and consider tutoring."
+            elif tutoring < 0:
+                recommendation = "Schedule more tutoring sessions."
+            else:
+                recommendation = "Focus on study habits."
+        else:
+            recommendation = "Keep up the good work!"
+        results.append({
+            "predicted_exam_score": float(predicted_score),
+            "at_risk": at_risk,
+            "recommendation": recommendation,
+        })
+    return results
+
+
+def test_batch_predict_matches_per_row_path():
+    predictor = StudentPerformancePredictor()
+    instances = pd.read_csv("student_performance.csv")[FEATURE_COLUMNS].to_dict("records")
+    expected = per_row(predictor, instances)
+    result = predictor.predict(instances)
+    assert result == expected
+    assert {row["at_risk"] for row in expected} == {0, 1}
@@ -0,0 +1,16 @@
+import pytest
+
+from prediction_cache import CachedPredictor, canonical_key
+from test_engines import RECORD
+
+
+def test_equal_values_share_a_key():
+    assert canonical_key(RECORD) == canonical_key({**RECORD, "Hours_Studied": 12.0, "Student": "x"})
+
+
+@pytest.mark.parametrize("engine", ["sklearn", "numpy"])
+def test_missing_field_raises_like_the_model(engine):
+    incomplete = {col: value for col, value in RECORD.items() if col != "Attendance"}
+    with pytest.raises(ValueError):
+        CachedPredictor(engine=engine).predict([incomplete])
+    assert CachedPredictor(engine=engine).predict([RECORD])[0]["predicted_exam_score"] > 0
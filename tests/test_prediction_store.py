@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from predict import StudentPerformancePredictor
+from prediction_store import PredictionStore, model_fingerprint
+
+
+def roster(ids, hours):
+    # One base student with only the hours varied, so equal hours mean equal features
+    df = pd.read_csv("student_performance.csv").iloc[[0] * len(ids)].reset_index(drop=True)
+    df["Student_ID"] = ids
+    df["Hours_Studied"] = hours
+    return df
+
+
+def test_duplicate_id_within_a_chunk_keeps_the_last_row(tmp_path):
+    predictor = StudentPerformancePredictor(engine="numpy")
+    with PredictionStore(str(tmp_path / "store.sqlite")) as store:
+        first = roster(["a", "b", "a"], [5, 10, 30])
+        scores, _, _ = store.score(predictor, first, run_date="2024-01-01")
+        np.testing.assert_array_equal(scores, predictor.predict_arrays(first)[0])
+
+        # The next chunk must still match against the stored predictions
+        second = roster(["a", "c"], [30, 12])
+        scores, _, _ = store.score(predictor, second, run_date="2024-01-01")
+        np.testing.assert_array_equal(scores, predictor.predict_arrays(second)[0])
+        assert store.reused == 1
+        assert not store.stored(model_fingerprint(predictor)).index.has_duplicates
+
+
+def test_same_day_rerun_drops_students_no_longer_at_risk(tmp_path):
+    predictor = StudentPerformancePredictor(engine="numpy")
+    students = pd.read_csv("student_performance.csv")
+    flags = predictor.predict_arrays(students)[1]
+    at_risk_row, safe_row = np.flatnonzero(flags == 1)[0], np.flatnonzero(flags == 0)[0]
+    with PredictionStore(str(tmp_path / "store.sqlite")) as store:
+        first = students.iloc[[at_risk_row, at_risk_row]].assign(Student_ID=["a", "b"])
+        store.score(predictor, first, run_date="2024-01-01")
+        assert store.at_risk(run_date="2024-01-01")["student_id"].tolist() == ["a", "b"]
+
+        second = students.iloc[[safe_row]].assign(Student_ID=["a"])
+        store.score(predictor, second, run_date="2024-01-01")
+        assert store.at_risk(run_date="2024-01-01")["student_id"].tolist() == ["b"]
@@ -0,0 +1,58 @@
+import numpy as np
+
+from predict import AT_RISK_THRESHOLD, COLUMN_INDEX, MODEL_COLUMNS
+from rules import DEFAULT_RULES
+
+HOURS, ATTENDANCE, TUTORING = (COLUMN_INDEX[col] for col in ["Hours_Studied", "Attendance", "Tutoring_Sessions"])
+
+
+def per_row(X, scores):
+    # The original recommendation logic, one row at a time
+    codes = []
+    for row, score in zip(X.tolist(), scores.tolist()):
+        if score >= AT_RISK_THRESHOLD:
+            codes.append(0)
+        elif row[HOURS] < -1:
+            codes.append(1)
+        elif row[ATTENDANCE] < -1:
+            codes.append(2)
+        elif row[TUTORING] < 0:
+            codes.append(3)
+        else:
+            codes.append(4)
+    return np.array(codes)
+
+
+def test_rules_match_per_row_on_random_rows():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(10_000, len(MODEL_COLUMNS)))
+    scores = rng.normal(AT_RISK_THRESHOLD, 5, len(X))
+    _, at_risk, codes = DEFAULT_RULES.evaluate(X, scores, COLUMN_INDEX)
+    expected = per_row(X, scores)
+    assert (codes == expected).all()
+    assert (at_risk == (scores < AT_RISK_THRESHOLD)).all()
+    assert set(expected) == {0, 1, 2, 3, 4}
+
+
+def test_rules_match_per_row_at_the_cut_points():
+    # (score, hours, attendance, tutoring) on and just either side of every
+    # threshold; the cut-offs are strict, so a value on one falls through
+    cases = [
+        (AT_RISK_THRESHOLD, -5, -5, -5),
+        (np.nextafter(AT_RISK_THRESHOLD, 0), -5, -5, -5),
+        (50, -1, -5, -5),
+        (50, np.nextafter(-1, -2), 0, 0),
+        (50, 0, -1, -5),
+        (50, 0, np.nextafter(-1, -2), 0),
+        (50, 0, 0, 0),
+        (50, 0, 0, np.nextafter(0, -1)),
+        (50, -1, -1, 0),
+    ]
+    X = np.zeros((len(cases), len(MODEL_COLUMNS)))
+    scores = np.array([case[0] for case in cases], dtype=float)
+    X[:, [HOURS, ATTENDANCE, TUTORING]] = [case[1:] for case in cases]
+    _, at_risk, codes = DEFAULT_RULES.evaluate(X, scores, COLUMN_INDEX)
+    expected = per_row(X, scores)
+    assert (codes == expected).all()
+    assert codes.tolist() == [0, 1, 2, 1, 3, 2, 4, 3, 4]
+    assert at_risk.tolist() == [0] + [1] * 8
@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+import score
+from predict import RECOMMENDATIONS
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_chunks_share_one_fixed_schema(tmp_path, suffix):
+    output = str(tmp_path / f"scored{suffix}")
+    score.main(["student_performance.csv", output, "--all-columns", "--chunksize", "1000", "--engine", "numpy"])
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(output)
+    else:
+        table = pa.ipc.open_file(output).read_all()
+
+    assert table.schema.field("Recommendation").type == pa.dictionary(pa.int8(), pa.string())
+    assert table.schema.field("Hours_Studied").type == pa.int64()
+    assert table.schema.field("Predicted_Score").type == pa.float64()
+    assert table.schema.field("Gender").type == pa.string()
+    for chunk in table.column("Recommendation").chunks:
+        assert chunk.dictionary.to_pylist() == RECOMMENDATIONS.tolist()
+
+    result = table.to_pandas()
+    score.main(["student_performance.csv", str(tmp_path / "scored.csv"), "--all-columns", "--engine", "numpy"])
+    expected = pd.read_csv(str(tmp_path / "scored.csv"))
+    pd.testing.assert_frame_equal(result.astype(object), expected.astype(object))
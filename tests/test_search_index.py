@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from search_index import SearchIndex
+
+RESULTS = pd.DataFrame({
+    "Student": ["a", "b", "c"],
+    "Note": ["met at 10:30", "ratio x=y", "none"],
+    "Predicted_Score": [55.0, 72.5, 91.0],
+    "At_Risk": ["Yes", "No", "No"],
+})
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.update(RESULTS)
+    return index
+
+
+def test_scoped_terms(index):
+    assert index.search("risk:yes").tolist() == [True, False, False]
+    assert index.search("score>=72.5").tolist() == [False, True, True]
+    assert index.search("note:ratio score<80").tolist() == [False, True, False]
+
+
+def test_unknown_scope_falls_back_to_substring(index):
+    assert index.search("10:30").tolist() == [True, False, False]
+    assert index.search("ratio x=y").tolist() == [False, True, False]
+    assert not index.search("nothing:here").any()
+
+
+def test_ambiguous_column_still_raises():
+    index = SearchIndex()
+    index.update(pd.DataFrame({"Pass": ["y"], "Points": [1]}))
+    with pytest.raises(ValueError, match="ambiguous"):
+        index.search("p:y")
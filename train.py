@@ -0,0 +1,336 @@
+"""Training pipeline for the exam score model (from main.ipynb).
+
+Reproduces the notebook's steps: boost the high performers' exam scores,
+append synthetic students, label-encode and scale the inputs, add the
+engineered features and tune a GradientBoostingRegressor. It then writes
+the three artifacts predict.py loads. Unlike the notebook, the data steps
+are vectorized, all randomness comes from one seed, the hyperparameter
+search uses successive halving on every core, and the prepared data is
+cached on disk between runs.
+
+`--backend hist` trains a HistGradientBoostingRegressor instead, on the raw
+inputs with the categorical columns handled natively, and writes only its
+model file and its category vocabularies (predict.py's "hist" engine); it
+needs no label encoders and predicts on every core.
+
+    python train.py                        # writes the artifacts here
+    python train.py --search grid          # exhaustive GridSearchCV, for comparison
+    python train.py --backend hist         # histogram-based backend
+    python train.py --output-dir models --report train_report.json
+
+When the artifacts are written to the working directory, the compiled
+NumPy model, the model bundle (and the lookup table, if one was built) are
+refreshed too.
+"""
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from predict import (
+    CATEGORICAL_COLUMNS, FEATURE_COLUMNS, HIST_CATEGORIES_PATH, HIST_MODEL_PATH, MODEL_COLUMNS, NUMERICAL_COLUMNS,
+)
+
+DATA_PATH = "student_performance.csv"
+TARGET = "Exam_Score"
+CACHE_DIR = ".train_cache"
+SEED = 42
+
+ARTIFACTS = {
+    "model": "final_gradient_boosting_model.pkl",
+    "scaler": "final_scaler.pkl",
+    "label_encoders": "final_label_encoders.pkl",
+}
+
+PARAM_GRID = {
+    "n_estimators": [100, 150],
+    "learning_rate": [0.05, 0.1],
+    "max_depth": [3],
+    "min_samples_split": [10],
+    "subsample": [0.8],
+}
+
+HIST_PARAM_GRID = {
+    "max_iter": [150, 300],
+    "learning_rate": [0.05, 0.1],
+    "max_leaf_nodes": [8, 15, 31],
+    "min_samples_leaf": [20],
+}
+
+# Samplers per synthetic group, as in the notebook: ("int", low, high) is
+# half-open like randint, ("uniform", low, high), ("choice", options).
+# Attendance thresholds are on the notebook's 0-1 scale although the CSV
+# records 0-100; kept so retrained models match the shipped one.
+SYNTHETIC_GROUPS = {
+    "high": (100, {
+        "Hours_Studied": ("int", 10, 25), "Attendance": ("uniform", 0.8, 1.0),
+        "Previous_Scores": ("int", 75, 90), "Motivation_Level": ("choice", ["Medium", "High"]),
+        "Tutoring_Sessions": ("int", 1, 4), "Parental_Involvement": ("choice", ["Medium", "High"]),
+        "Access_to_Resources": ("choice", ["Medium", "High"]), TARGET: ("int", 80, 90),
+    }),
+    "excellent": (50, {
+        "Hours_Studied": ("int", 15, 30), "Attendance": ("uniform", 0.85, 1.0),
+        "Previous_Scores": ("int", 80, 95), "Motivation_Level": ("choice", ["High"]),
+        "Tutoring_Sessions": ("int", 2, 5), "Parental_Involvement": ("choice", ["High"]),
+        "Access_to_Resources": ("choice", ["High"]), TARGET: ("int", 90, 100),
+    }),
+    "medium": (100, {
+        "Hours_Studied": ("int", 10, 20), "Attendance": ("uniform", 0.75, 0.95),
+        "Previous_Scores": ("int", 60, 80), "Motivation_Level": ("choice", ["Medium", "High"]),
+        "Tutoring_Sessions": ("int", 0, 3), "Parental_Involvement": ("choice", ["Medium", "High"]),
+        "Access_to_Resources": ("choice", ["Medium", "High"]), TARGET: ("int", 65, 80),
+    }),
+    "at_risk": (100, {
+        "Hours_Studied": ("int", 0, 10), "Attendance": ("uniform", 0.5, 0.8),
+        "Previous_Scores": ("int", 40, 60), "Motivation_Level": ("choice", ["Low", "Medium"]),
+        "Tutoring_Sessions": ("int", 0, 2), "Parental_Involvement": ("choice", ["Low", "Medium"]),
+        "Access_to_Resources": ("choice", ["Low", "Medium"]), TARGET: ("int", 40, 60),
+    }),
+}
+
+SEGMENTS = {"at_risk": (0, 60), "average": (60, 80), "high": (80, 90), "excellent": (90, 100)}
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self):
+        total = sum(self.stages.values())
+        lines = ["\n=== TIMING ==="]
+        for name, seconds in self.stages.items():
+            lines.append(f"{name:<12} {seconds:8.2f}s {seconds / total:6.1%}")
+        lines.append(f"{'total':<12} {total:8.2f}s")
+        return "\n".join(lines)
+
+
+def high_performer_mask(data):
+    return (
+        (data["Hours_Studied"] >= 25) & (data["Attendance"] >= 0.95)
+        & (data["Previous_Scores"] >= 85) & (data["Motivation_Level"] == "High")
+        & (data["Tutoring_Sessions"] >= 2) & (data["Parental_Involvement"] == "High")
+        & (data["Access_to_Resources"] == "High")
+    )
+
+
+def sample_column(rng, spec, size):
+    kind, *args = spec
+    if kind == "int":
+        return rng.integers(args[0], args[1], size=size)
+    if kind == "uniform":
+        return rng.uniform(args[0], args[1], size=size)
+    return rng.choice(np.array(args[0], dtype=object), size=size)
+
+
+def synthetic_students(rng):
+    return pd.concat([
+        pd.DataFrame({col: sample_column(rng, spec, size) for col, spec in columns.items()})
+        for size, columns in SYNTHETIC_GROUPS.values()
+    ], ignore_index=True)
+
+
+def enhance(data, rng):
+    # Lift under-scored high performers into 80-99, then add the synthetic groups
+    data = data[FEATURE_COLUMNS + [TARGET]].copy()
+    boost = high_performer_mask(data) & (data[TARGET] < 80)
+    data.loc[boost, TARGET] = rng.integers(80, 100, size=int(boost.sum()))
+    return pd.concat([data, synthetic_students(rng)], ignore_index=True)
+
+
+def prepare(path, seed, source_version):
+    # Enhanced, encoded, scaled and split data plus the fitted preprocessors;
+    # raw_train / raw_test are the same rows before encoding and scaling.
+    # source_version (the CSV's mtime and size) only keys the disk cache.
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    rng = np.random.default_rng(seed)
+    data = enhance(pd.read_csv(path), rng)
+    raw = data[FEATURE_COLUMNS].copy()
+
+    label_encoders = {}
+    for col in CATEGORICAL_COLUMNS:
+        label_encoders[col] = LabelEncoder()
+        data[col] = label_encoders[col].fit_transform(data[col])
+
+    scaler = StandardScaler()
+    data[NUMERICAL_COLUMNS] = scaler.fit_transform(data[NUMERICAL_COLUMNS])
+
+    # Same engineered features as StudentPerformancePredictor.transform_encoded
+    data["Hours_Motivation"] = data["Hours_Studied"] * (data["Motivation_Level"] + 1)
+    data["Attendance_Impact"] = data["Attendance"] * data["Previous_Scores"]
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        data[MODEL_COLUMNS], data[TARGET], test_size=0.2, random_state=seed
+    )
+    raw_train, raw_test = raw.loc[X_train.index], raw.loc[X_test.index]
+    return X_train, X_test, y_train, y_test, raw_train, raw_test, scaler, label_encoders
+
+
+def estimator_for(backend, seed):
+    if backend == "hist":
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        # Categories are encoded inside the model, from the raw strings
+        estimator = HistGradientBoostingRegressor(categorical_features=CATEGORICAL_COLUMNS, random_state=seed)
+        return estimator, HIST_PARAM_GRID
+    from sklearn.ensemble import GradientBoostingRegressor
+    return GradientBoostingRegressor(random_state=seed, loss="squared_error"), PARAM_GRID
+
+
+def search(X_train, y_train, method, seed, jobs, backend="gradient_boosting"):
+    estimator, grid = estimator_for(backend, seed)
+    if method == "grid":
+        from sklearn.model_selection import GridSearchCV
+        searcher = GridSearchCV(estimator, grid, cv=5, scoring="r2", n_jobs=jobs)
+    else:
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+        # Candidates start on a fraction of the rows; only the best half
+        # moves on to each larger round
+        searcher = HalvingGridSearchCV(
+            estimator, grid, cv=5, scoring="r2", factor=2, random_state=seed, n_jobs=jobs
+        )
+    searcher.fit(X_train, y_train)
+    return searcher
+
+
+def evaluate(model, X_test, y_test, threshold=60):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    y_true = y_test.to_numpy()
+    y_pred = model.predict(X_test)
+    overall = {
+        "r2": r2_score(y_true, y_pred),
+        "mse": mean_squared_error(y_true, y_pred),
+        "mae": mean_absolute_error(y_true, y_pred),
+    }
+    segments = {}
+    for name, (lower, upper) in SEGMENTS.items():
+        mask = (y_true >= lower) & (y_true < upper)
+        if mask.any():
+            segments[name] = {
+                "r2": r2_score(y_true[mask], y_pred[mask]) if mask.sum() > 1 else float("nan"),
+                "mse": mean_squared_error(y_true[mask], y_pred[mask]),
+                "mae": mean_absolute_error(y_true[mask], y_pred[mask]),
+                "count": int(mask.sum()),
+            }
+    flagged = y_pred < threshold
+    overall["at_risk_count"] = int(flagged.sum())
+    overall["at_risk_precision"] = float((y_true[flagged] < threshold).mean()) if flagged.any() else None
+
+    print("\n=== MODEL EVALUATION ===")
+    print(f"Overall R²: {overall['r2']:.3f}, MSE: {overall['mse']:.2f}, MAE: {overall['mae']:.2f}")
+    print("\nSegment Performance:")
+    for name, scores in segments.items():
+        print(f"{name}: R²={scores['r2']:.3f}, MSE={scores['mse']:.2f}, MAE={scores['mae']:.2f}, Samples={scores['count']}")
+    print(f"\nAt-Risk Students: {flagged.sum()}/{len(y_true)} ({flagged.mean():.1%})")
+    if overall["at_risk_precision"] is not None:
+        print(f"At-Risk Precision: {overall['at_risk_precision']:.1%}")
+    return overall, segments
+
+
+def refresh_derived(X_check):
+    # Keep the other engines' artifacts in step with the new model, checking
+    # the re-read compiled model against the pickle on X_check first
+    from compiled_model import export_model, load_compiled
+    from model_bundle import write_bundle
+
+    model = joblib.load(ARTIFACTS["model"])
+    scaler = joblib.load(ARTIFACTS["scaler"])
+    label_encoders = joblib.load(ARTIFACTS["label_encoders"])
+    export_model(model, scaler, label_encoders)
+    compiled, _, _ = load_compiled()
+    error = np.abs(compiled.predict(X_check) - model.predict(X_check)).max()
+    if error > 1e-9:
+        raise RuntimeError(f"Compiled model differs from {ARTIFACTS['model']} by up to {error:.3g}")
+    write_bundle(model, scaler, label_encoders)
+
+    import lookup_table
+    if os.path.exists(lookup_table.METADATA_PATH):
+        with open(lookup_table.METADATA_PATH) as f:
+            previous = json.load(f)
+        grid = {col: tuple(previous["grid"][col]) for col in lookup_table.GRID_COLUMNS}
+        lookup_table.build(grid, dtype=previous["dtype"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the exam score model and write its artifacts")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--search", choices=["halving", "grid"], default="halving")
+    parser.add_argument("--backend", choices=["gradient_boosting", "hist"], default="gradient_boosting")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel fits (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute the prepared data instead of using the disk cache")
+    parser.add_argument("--report", help="Also write timings, metrics and the chosen parameters as JSON")
+    args = parser.parse_args()
+
+    timer = StageTimer()
+    with timer("prepare"):
+        stat = os.stat(args.data)
+        prepared = prepare
+        if not args.no_cache:
+            prepared = joblib.Memory(CACHE_DIR, verbose=0).cache(prepare)
+        X_train, X_test, y_train, y_test, raw_train, raw_test, scaler, label_encoders = prepared(
+            args.data, args.seed, (stat.st_mtime_ns, stat.st_size)
+        )
+    if args.backend == "hist":
+        X_train, X_test = raw_train, raw_test
+    print(f"Enhanced Dataset Shape: {X_train.shape}, Training Samples: {len(y_train)}, Testing Samples: {len(y_test)}")
+
+    with timer("search"):
+        searcher = search(X_train, y_train, args.search, args.seed, args.jobs, args.backend)
+    print(f"Best parameters: {searcher.best_params_} (CV R² {searcher.best_score_:.3f})")
+
+    with timer("evaluate"):
+        overall, segments = evaluate(searcher.best_estimator_, X_test, y_test)
+
+    with timer("save"):
+        os.makedirs(args.output_dir, exist_ok=True)
+        if args.backend == "hist":
+            # The scaler predict.py already loads is kept; it only places the
+            # recommendation thresholds. The categories the model was fitted
+            # on are saved beside it, as the model keeps them privately.
+            joblib.dump(searcher.best_estimator_, os.path.join(args.output_dir, HIST_MODEL_PATH))
+            categories = {col: sorted(raw_train[col].dropna().astype(str).unique()) for col in CATEGORICAL_COLUMNS}
+            with open(os.path.join(args.output_dir, HIST_CATEGORIES_PATH), "w") as f:
+                json.dump(categories, f, indent=2)
+        else:
+            for name, artifact in [("model", searcher.best_estimator_), ("scaler", scaler), ("label_encoders", label_encoders)]:
+                joblib.dump(artifact, os.path.join(args.output_dir, ARTIFACTS[name]))
+    print("\nFinal model and preprocessors saved.")
+
+    if args.backend == "gradient_boosting" and os.path.abspath(args.output_dir) == os.getcwd():
+        with timer("derived"):
+            refresh_derived(X_test)
+
+    print(timer.report())
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({
+                "search": args.search,
+                "backend": args.backend,
+                "seed": args.seed,
+                "best_params": searcher.best_params_,
+                "cv_r2": searcher.best_score_,
+                "metrics": overall,
+                "segments": segments,
+                "timings": timer.stages,
+            }, f, indent=2, default=float)
+
+
+if __name__ == "__main__":
+    main()
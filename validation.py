@@ -0,0 +1,150 @@
+"""Up-front validation of batch inputs, with a reason for every rejected row.
+
+A Schema describes the 7 model inputs: numeric columns with their allowed
+range, categorical columns with the vocabulary the label encoders were
+fitted on. check() runs each rule as one vectorized test over the whole
+chunk (missing column, missing value, not a number, out of range, unseen
+category) and builds reason strings only for the rows that fail, so a
+clean file costs a handful of array comparisons per column.
+
+split() separates a chunk into rows that can be scored, with numeric
+inputs parsed to numbers, and rejected rows with a Rejection_Reason
+column:
+
+    schema = Schema.from_predictor(predictor)
+    valid, rejected, counts = schema.split(chunk)
+
+Attendance is accepted on both the form's 0-1 rate and the CSV's 0-100
+percentage, since the shipped model was trained on both; the range only
+rules out values that are neither.
+"""
+import numpy as np
+import pandas as pd
+
+from predict import CATEGORICAL_COLUMNS, FEATURE_COLUMNS
+
+# Allowed (lower, upper) bounds of the numeric inputs, inclusive; None is unbounded
+RANGES = {
+    "Hours_Studied": (0, 168),
+    "Attendance": (0, 100),
+    "Previous_Scores": (0, 100),
+    "Tutoring_Sessions": (0, None),
+}
+
+REASON_COLUMN = "Rejection_Reason"
+
+
+def limits(lower, upper):
+    if upper is None:
+        return f"at least {lower}"
+    if lower is None:
+        return f"at most {upper}"
+    return f"{lower} to {upper}"
+
+
+class Schema:
+    def __init__(self, vocabularies, ranges=RANGES):
+        self.vocabularies = {col: np.asarray(values).astype(str) for col, values in vocabularies.items()}
+        self.ranges = ranges
+        self.columns = [col for col in FEATURE_COLUMNS if col in ranges or col in self.vocabularies]
+
+    @classmethod
+    def from_predictor(cls, predictor, ranges=RANGES):
+        # Vocabularies of the predictor's label encoders (final_label_encoders.pkl
+        # for the sklearn engine, the same classes for the others)
+        return cls({col: predictor.label_encoders[col].classes_ for col in CATEGORICAL_COLUMNS}, ranges)
+
+    def check(self, df):
+        # (valid mask, reasons, counts): a boolean array over the rows of df,
+        # a Series of "; "-joined reasons indexed by the rejected rows'
+        # positions, and the number of rows failing each kind of check
+        return self._check(df)[:3]
+
+    def _check(self, df):
+        # check() plus the parsed values of numeric inputs that arrived as text
+        failures, parsed = [], {}
+        for col in self.columns:
+            if col not in df.columns:
+                failures.append((np.arange(len(df)), f"{col}: column missing", f"{col}: column missing"))
+                continue
+            values = df[col]
+            missing = values.isna().to_numpy()
+            if missing.any():
+                failures.append((np.flatnonzero(missing), f"{col}: missing value", f"{col}: missing value"))
+
+            if col in self.vocabularies:
+                unseen = ~(missing | values.isin(self.vocabularies[col]).to_numpy())
+                if unseen.any():
+                    rows = np.flatnonzero(unseen)
+                    expected = ", ".join(self.vocabularies[col])
+                    failures.append((rows, f"{col}: unseen category", f"{col}: unseen category '"
+                                     + values.iloc[rows].astype(str).to_numpy(dtype=object) + f"' (expected {expected})"))
+                continue
+
+            numbers = self.numeric(values)
+            if not pd.api.types.is_numeric_dtype(values.dtype):
+                parsed[col] = numbers
+            not_number = np.isnan(numbers) & ~missing
+            if not_number.any():
+                rows = np.flatnonzero(not_number)
+                failures.append((rows, f"{col}: not a number",
+                                 f"{col}: not a number '" + values.iloc[rows].astype(str).to_numpy(dtype=object) + "'"))
+            lower, upper = self.ranges[col]
+            with np.errstate(invalid="ignore"):
+                outside = np.isinf(numbers)
+                if lower is not None:
+                    outside |= numbers < lower
+                if upper is not None:
+                    outside |= numbers > upper
+            if outside.any():
+                rows = np.flatnonzero(outside)
+                failures.append((rows, f"{col}: out of range", f"{col}: "
+                                 + np.array([f"{x:g}" for x in numbers[rows]], dtype=object)
+                                 + f" (must be {limits(lower, upper)})"))
+
+        valid = np.ones(len(df), dtype=bool)
+        if not failures:
+            return valid, pd.Series([], dtype=object), {}, parsed
+        counts = {}
+        for rows, kind, _ in failures:
+            valid[rows] = False
+            counts[kind] = counts.get(kind, 0) + len(rows)
+
+        # One message per failing (row, check): a string shared by the rows,
+        # or an array when it quotes each row's value. Sorted by row (stably,
+        # so a row's reasons keep the column order); only rows failing more
+        # than one check need a join.
+        rows = np.concatenate([rows for rows, _, _ in failures])
+        messages = np.concatenate([
+            np.full(len(rows), message, dtype=object) if isinstance(message, str) else message
+            for rows, _, message in failures
+        ])
+        order = np.argsort(rows, kind="stable")
+        rows, messages = rows[order], messages[order]
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        sizes = np.diff(np.r_[starts, len(rows)])
+        joined = messages[starts]
+        for i in np.flatnonzero(sizes > 1):
+            joined[i] = "; ".join(messages[starts[i]:starts[i] + sizes[i]])
+        return valid, pd.Series(joined, index=rows[starts], dtype=object), counts, parsed
+
+    @staticmethod
+    def numeric(values):
+        # Float array of a numeric input; unparseable entries become NaN
+        if pd.api.types.is_numeric_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+            return values.to_numpy(dtype=float, na_value=np.nan)
+        return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+    def split(self, df):
+        # (valid rows, rejected rows + Rejection_Reason, counts per check),
+        # the frames keeping df's index. Numeric inputs read as text (because
+        # other rows held non-numbers) are parsed in the valid rows.
+        valid, reasons, counts, parsed = self._check(df)
+        if valid.all() and not parsed:
+            return df, df.iloc[:0].assign(**{REASON_COLUMN: pd.Series([], dtype=object)}), counts
+        # Whole numbers go back to integers, as read_csv would have read them
+        accepted = df[valid].assign(**{
+            col: pd.to_numeric(numbers[valid], downcast="integer") for col, numbers in parsed.items()
+        })
+        rejected = df.iloc[reasons.index.to_numpy()].assign(**{REASON_COLUMN: reasons.to_numpy()})
+        return accepted, rejected, counts